@@ -0,0 +1,61 @@
+# benchmarks/bench_directory.py
+#
+# Measures employee directory load time and audience selector resolution, cold (first call)
+# and warm (memoized), on a synthetic organisation.
+#
+#   python benchmarks/bench_directory.py --employees 100000
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from employee_pulse_agent.agents import EmployeeDirectory
+
+SELECTORS = [
+    "department=Engineering AND location=Pune",
+    "department IN (Sales, Marketing) AND NOT location=Berlin",
+    "reports_to=employee1@example.com",
+    "tenure>=5 AND location=Pune",
+    "",
+]
+DEPARTMENTS = ["Engineering", "Sales", "Marketing", "Finance", "HR", "Support"]
+LOCATIONS = ["Pune", "Berlin", "Austin", "Singapore", "London"]
+
+
+def synthetic_employees(count):
+    for i in range(count):
+        yield {
+            "email": f"Employee{i}@Example.com ", # Deliberately un-normalized
+            "name": f"Employee {i}",
+            "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+            "location": LOCATIONS[(i // 3) % len(LOCATIONS)],
+            "manager": f"employee{i // 8}@example.com" if i else "",
+            "tenure_years": str(i % 12),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Employee directory selector benchmark")
+    parser.add_argument("--employees", type=int, default=100_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    directory = EmployeeDirectory(synthetic_employees(args.employees))
+    print(f"load {len(directory)} employees: {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+    print(f"{'selector':<58} {'matches':>8} {'cold ms':>8} {'warm ms':>8}", file=sys.stderr)
+    for selector in SELECTORS:
+        start = time.perf_counter()
+        matches = directory.count(selector)
+        cold = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        directory.count(selector)
+        warm = (time.perf_counter() - start) * 1000
+        print(f"{selector or '(everyone)':<58} {matches:>8} {cold:>8.2f} {warm:>8.3f}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
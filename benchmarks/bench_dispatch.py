@@ -0,0 +1,123 @@
+# benchmarks/bench_dispatch.py
+#
+# Measures survey invitation throughput through CommunicationAgent against a local
+# stand-in SMTP server (no mail leaves the machine).
+#
+#   python benchmarks/bench_dispatch.py                 # 1k, 10k and 100k recipients
+#   python benchmarks/bench_dispatch.py --sizes 1000 --workers 1 4 8
+#   python benchmarks/bench_dispatch.py --sizes 10000 --domains 4 --domain-rate 1000   # throttled
+
+import argparse
+import multiprocessing
+import os
+import socketserver
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from employee_pulse_agent.agents import CommunicationAgent, DeliveryLedger, DomainThrottle, SMTPTransport
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """
+    Speaks just enough SMTP to accept and discard messages.
+    """
+    def _reply(self, line):
+        self.wfile.write(line + b"\r\n")
+
+    def handle(self):
+        self._reply(b"220 sink ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in (b"EHLO", b"HELO"):
+                self._reply(b"250 sink")
+            elif command == b"DATA":
+                self._reply(b"354 go ahead")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with self.server.message_count.get_lock():
+                    self.server.message_count.value += 1
+                if self.server.latency:
+                    time.sleep(self.server.latency) # Simulated relay processing time
+                self._reply(b"250 queued")
+            elif command == b"QUIT":
+                self._reply(b"221 bye")
+                return
+            else: # MAIL, RCPT, RSET, NOOP
+                self._reply(b"250 ok")
+
+
+class _SinkServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _serve(port_queue, message_count, latency):
+    server = _SinkServer(("127.0.0.1", 0), _SinkHandler)
+    server.message_count = message_count
+    server.latency = latency
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class SMTPSink:
+    """
+    Runs the sink in its own process so it doesn't compete with the sender for the GIL.
+    """
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def __enter__(self):
+        ports = multiprocessing.Queue()
+        self.message_count = multiprocessing.Value("q", 0)
+        self._process = multiprocessing.Process(target=_serve, args=(ports, self.message_count, self.latency), daemon=True)
+        self._process.start()
+        self.port = ports.get(timeout=10)
+        return self
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.join()
+
+
+def run(size, workers, batch_size, port, domains=1, rate=None, domain_rate=None):
+    transport = SMTPTransport("127.0.0.1", port, pool_size=workers)
+    throttle = DomainThrottle(rate=rate, domain_rate=domain_rate) if rate or domain_rate else None
+    agent = CommunicationAgent(transport=transport, max_workers=workers, batch_size=batch_size, throttle=throttle)
+    emails = [f"employee{i}@example{i % domains}.com" for i in range(size)]
+    survey = {"survey_id": "bench", "title": "Benchmark Pulse"}
+    start = time.perf_counter()
+    ok = agent.send_survey_invitations(emails, survey, ledger=DeliveryLedger())
+    elapsed = time.perf_counter() - start
+    agent.shutdown()
+    return ok, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Survey invitation throughput benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--relay-latency-ms", type=float, default=0.0,
+                        help="Per-message delay added by the stand-in server, to mimic a real relay")
+    parser.add_argument("--domains", type=int, default=1, help="Spread recipients over this many domains")
+    parser.add_argument("--rate", type=float, default=None, help="Overall send limit (messages/second)")
+    parser.add_argument("--domain-rate", type=float, default=None, help="Per-domain send limit (messages/second)")
+    args = parser.parse_args()
+
+    print(f"{'recipients':>10} {'workers':>7} {'seconds':>9} {'emails/s':>10}", file=sys.stderr)
+    with SMTPSink(latency=args.relay_latency_ms / 1000) as sink:
+        port = sink.port
+        for size in args.sizes:
+            for workers in args.workers:
+                ok, elapsed = run(size, workers, args.batch_size, port, args.domains, args.rate, args.domain_rate)
+                status = "" if ok else "  (some sends failed)"
+                print(f"{size:>10} {workers:>7} {elapsed:>9.2f} {size / elapsed:>10.0f}{status}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
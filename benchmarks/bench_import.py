@@ -0,0 +1,65 @@
+# benchmarks/bench_import.py
+#
+# Tracks cold-start cost. Each target is imported in a fresh interpreter with -X importtime
+# and the cumulative time reported for the module itself is taken (median of --runs).
+# The last row times building root_agent, which is when google.adk gets imported.
+#
+#   python benchmarks/bench_import.py --runs 7
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+TARGETS = [
+    ("import employee_pulse_agent", "employee_pulse_agent", "import employee_pulse_agent"),
+    ("import employee_pulse_agent.agents", "employee_pulse_agent.agents", "import employee_pulse_agent.agents"),
+    ("import employee_pulse_agent.agent", "employee_pulse_agent.agent", "import employee_pulse_agent.agent"),
+]
+
+ROOT_AGENT_CODE = (
+    "import time; t = time.perf_counter(); import employee_pulse_agent.agent as a; a.get_root_agent(); "
+    "print(int((time.perf_counter() - t) * 1e6))"
+)
+
+
+def importtime_us(module, code):
+    """Runs code in a fresh interpreter and returns the cumulative import time of module, in microseconds."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <indented module name>"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1])
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+
+def root_agent_us():
+    env = dict(os.environ, PULSE_QUIET="1")
+    result = subprocess.run([sys.executable, "-c", ROOT_AGENT_CODE], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return int(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'target':<40} {'median ms':>10}")
+    for label, module, code in TARGETS:
+        samples = [importtime_us(module, code) for _ in range(args.runs)]
+        print(f"{label:<40} {statistics.median(samples) / 1000:>10.1f}")
+    try:
+        samples = [root_agent_us() for _ in range(args.runs)]
+        print(f"{'build root_agent (imports google.adk)':<40} {statistics.median(samples) / 1000:>10.1f}")
+    except subprocess.CalledProcessError as exc:
+        print(f"{'build root_agent (imports google.adk)':<40} {'n/a':>10}  ({exc.stderr.strip().splitlines()[-1]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_inbound.py
+#
+# Measures bulk inbound mail classification (bounces, out-of-office replies, unsubscribes,
+# ordinary replies) on a synthetic mbox file, across different process pool sizes.
+#
+#   python benchmarks/bench_inbound.py --messages 200000 --workers 1 4 8
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from employee_pulse_agent.agents import InboundProcessor, SuppressionList
+
+_BOUNCE = (
+    "From: MAILER-DAEMON@relay.example.com\nTo: hr@example.com\nSubject: Undelivered Mail Returned to Sender\n"
+    "Content-Type: multipart/report; report-type=delivery-status; boundary=\"b\"\n\n"
+    "--b\nContent-Type: text/plain\n\nThis is the mail system.\n\n--b\nContent-Type: message/delivery-status\n\n"
+    "Reporting-MTA: dns; relay.example.com\n\nFinal-Recipient: rfc822; {email}\nAction: failed\nStatus: 5.1.1\n\n--b--\n"
+)
+_OUT_OF_OFFICE = "From: {email}\nTo: hr@example.com\nSubject: Out of Office: Q3 Pulse\nAuto-Submitted: auto-replied\n\nI am away until Monday.\n"
+_UNSUBSCRIBE = "From: {email}\nTo: hr@example.com\nSubject: Re: Q3 Pulse\n\nPlease unsubscribe me.\n"
+_REPLY = "From: {email}\nTo: hr@example.com\nSubject: Re: Q3 Pulse\n\nThanks, done!\n" + "Some quoted text.\n" * 20
+TEMPLATES = [_BOUNCE, _OUT_OF_OFFICE, _UNSUBSCRIBE, _REPLY, _REPLY, _REPLY]
+
+
+def write_mbox(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write("From sender@example.com Mon Jan  1 00:00:00 2024\n")
+            f.write(TEMPLATES[i % len(TEMPLATES)].format(email=f"employee{i}@example.com"))
+            f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inbound mail ingestion benchmark")
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mbox = os.path.join(tmp, "inbound.mbox")
+        write_mbox(mbox, args.messages)
+        size_mb = os.path.getsize(mbox) / 1e6
+        print(f"{args.messages} messages, {size_mb:.0f} MB mbox", file=sys.stderr)
+        print(f"{'workers':>7} {'seconds':>8} {'msgs/s':>9} {'suppressed':>10}", file=sys.stderr)
+        for workers in args.workers:
+            suppression = SuppressionList()
+            start = time.perf_counter()
+            result = InboundProcessor(suppression, workers=workers, chunk_size=args.chunk_size).ingest(mbox)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>7} {elapsed:>8.2f} {result['messages'] / elapsed:>9.0f} {len(suppression):>10}", file=sys.stderr)
+
+        start = time.perf_counter()
+        hits = sum(f"employee{i}@example.com" in suppression for i in range(args.messages))
+        lookup_ns = (time.perf_counter() - start) / args.messages * 1e9
+        print(f"suppression lookup: {lookup_ns:.0f} ns per recipient ({hits} suppressed)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/bench_logging.py
+#
+# Compares the cost of sending invitations with the old print-per-line tracing against the
+# queue-backed logging at DEBUG (full per-email output), INFO (default) and quiet mode.
+# Output goes to a temporary file, as it would to a container log.
+#
+#   python benchmarks/bench_logging.py --recipients 20000
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from employee_pulse_agent.agents import CommunicationAgent, configure_logging, shutdown_logging
+
+
+class PrintTransport:
+    """The simulated send as it was before logging: five print calls per email."""
+    def send_batch(self, messages):
+        results = []
+        for recipient, subject, body in messages:
+            print("[CommunicationAgent] SIMULATING EMAIL SEND:")
+            print(f"  To: {recipient}")
+            print(f"  Subject: {subject}")
+            print(f"  Body:\n{body}\n")
+            print(f"[CommunicationAgent] Email to {recipient} sent successfully (simulated).")
+            results.append(True)
+        return results
+
+    def close(self):
+        pass
+
+
+def run(recipients, out, transport=None, **logging_options):
+    configure_logging(stream=out, **logging_options)
+    agent = CommunicationAgent(transport=transport, max_workers=1)
+    emails = [f"employee{i}@example.com" for i in range(recipients)]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        agent.send_survey_invitations(emails, {"survey_id": "bench", "title": "Benchmark Pulse"})
+    elapsed = time.perf_counter() - start
+    shutdown_logging() # Drain the queue so the next run starts clean
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging overhead benchmark")
+    parser.add_argument("--recipients", type=int, default=20_000)
+    args = parser.parse_args()
+
+    modes = [
+        ("print (before)", {"transport": PrintTransport(), "level": "INFO"}),
+        ("logging DEBUG", {"level": "DEBUG"}),
+        ("logging INFO", {"level": "INFO"}),
+        ("logging quiet", {"quiet": True}),
+    ]
+    print(f"{'mode':<16} {'seconds':>8} {'us/recipient':>13}")
+    # Line-buffered, like a terminal or a container running with PYTHONUNBUFFERED=1.
+    with tempfile.TemporaryFile("w", buffering=1) as out:
+        for label, options in modes:
+            elapsed = run(args.recipients, out, **options)
+            print(f"{label:<16} {elapsed:>8.3f} {elapsed / args.recipients * 1e6:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/bench_message_bus.py
+#
+# Measures message throughput through the message bus: an in-process agent against process-pool
+# agents, across batch sizes, for a trivial handler (hand-off cost) and a CPU-bound one (where
+# worker processes can use more than one core).
+#
+#   python benchmarks/bench_message_bus.py --messages 20000 --batch-sizes 1,16,64,256 --processes 1,2,4
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ.setdefault("PULSE_QUIET", "1")
+
+from employee_pulse_agent.agents import BaseAgent, MessageBus, configure_logging
+
+
+class BenchAgent(BaseAgent):
+    """Module-level so worker processes can build it."""
+    def __init__(self, name="BenchAgent"):
+        super().__init__(name)
+
+    def echo(self, value):
+        return value
+
+    def work(self, value, rounds):
+        total = value
+        for i in range(rounds):
+            total = (total * 31 + i) % 1_000_003
+        return total
+
+
+async def drive(bus, route, messages, message_type, rounds, senders):
+    """Sends messages from several concurrent senders and returns the elapsed seconds."""
+    payload = {"value": 1, "rounds": rounds} if message_type == "work" else {"value": 1}
+    per_sender = messages // senders
+    start = time.perf_counter()
+    results = await asyncio.gather(*(bus.send_many(route, [(message_type, payload)] * per_sender)
+                                     for _ in range(senders)))
+    elapsed = time.perf_counter() - start
+    failed = sum(isinstance(result, Exception) for batch in results for result in batch)
+    if failed:
+        raise SystemExit(f"{failed} messages failed")
+    return elapsed
+
+
+def run(mode, processes, batch_size, message_type, args):
+    bus = MessageBus(batch_size=batch_size, max_pending=args.max_pending)
+    if mode == "local":
+        bus.register(BenchAgent(), "bench")
+    else:
+        bus.register_process_pool("bench", BenchAgent, processes=processes, max_in_flight=args.max_in_flight)
+
+    async def main():
+        await bus.send("bench", "echo", {"value": 0}) # Binds the bus and waits for workers to come up
+        return await drive(bus, "bench", args.messages, message_type, args.rounds, args.senders)
+
+    try:
+        elapsed = asyncio.run(main())
+        stats = bus.stats()["bench"]
+    finally:
+        bus.close()
+    return elapsed, stats["mean_batch"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Message bus throughput benchmark")
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--batch-sizes", default="1,16,64,256")
+    parser.add_argument("--processes", default="1,2", help="worker process counts to try for the process pool")
+    parser.add_argument("--rounds", type=int, default=2000, help="loop iterations per CPU-bound message")
+    parser.add_argument("--cpu-messages", type=int, default=2000, help="messages for the CPU-bound runs")
+    parser.add_argument("--senders", type=int, default=8)
+    parser.add_argument("--max-pending", type=int, default=1024)
+    parser.add_argument("--max-in-flight", type=int, default=2)
+    args = parser.parse_args()
+    configure_logging()
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    process_counts = [int(count) for count in args.processes.split(",")]
+    configurations = [("local", 0)] + [("process", count) for count in process_counts]
+
+    print(f"{'handler':<7} {'mode':<8} {'procs':>5} {'batch':>6} {'messages':>9} {'seconds':>8} {'per sec':>10} {'mean batch':>10}")
+    for message_type, batches in (("echo", batch_sizes), ("work", [max(batch_sizes)])):
+        messages = args.messages if message_type == "echo" else args.cpu_messages
+        for mode, processes in configurations:
+            for batch_size in batches:
+                run_args = argparse.Namespace(**{**vars(args), "messages": messages})
+                elapsed, mean_batch = run(mode, processes, batch_size, message_type, run_args)
+                print(f"{message_type:<7} {mode:<8} {processes or '-':>5} {batch_size:>6} {messages:>9} {elapsed:>8.3f} "
+                      f"{messages / elapsed:>10.0f} {mean_batch if mean_batch is not None else '-':>10}")
+
+
+if __name__ == "__main__":
+    main()
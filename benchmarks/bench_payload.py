@@ -0,0 +1,63 @@
+# benchmarks/bench_payload.py
+#
+# Compares the serialized size of survey tool results: the full survey records the tools
+# used to return versus the compact, paginated summaries.
+#
+#   python benchmarks/bench_payload.py --surveys 500 --audience 2000
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from employee_pulse_agent.agents import (
+    ApprovalAgent, CommunicationAgent, OrchestratingAgent, PulseQuestionnaireAgent, configure_logging
+)
+
+
+def build(surveys, audience):
+    orchestrator = OrchestratingAgent(PulseQuestionnaireAgent(), ApprovalAgent(), CommunicationAgent(max_workers=1))
+    emails = [f"employee{i}@example.com" for i in range(audience)]
+    for i in range(surveys):
+        orchestrator.initiate_pulse_survey({
+            "survey_id": f"survey_{i}",
+            "title": f"Pulse {i}",
+            "topic": "engagement" if i % 2 else "wellness",
+            "num_questions": 2,
+            "target_audience_emails": emails,
+            "approver_contact": "hr_manager@example.com",
+        })
+    return orchestrator
+
+
+def size(payload):
+    return len(json.dumps(payload, default=str).encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool payload size benchmark")
+    parser.add_argument("--surveys", type=int, default=500)
+    parser.add_argument("--audience", type=int, default=2000)
+    args = parser.parse_args()
+
+    configure_logging(quiet=True)
+    orchestrator = build(args.surveys, args.audience)
+    full_status = orchestrator.survey_store.get("survey_0")
+    rows = [
+        ("get_survey_status: full record", size(full_status)),
+        ("get_survey_status: summary", size(orchestrator.get_survey_status("survey_0"))),
+        ("get_survey_status: 2 fields", size(orchestrator.get_survey_status("survey_0", fields=["status", "response_rate"]))),
+        ("list_all_surveys: all full records", size(orchestrator.active_surveys)),
+        ("list_all_surveys: first page (20)", size(orchestrator.list_active_surveys(limit=20))),
+        ("list_all_surveys: page of ids+status", size(orchestrator.list_active_surveys(limit=20, fields=["survey_id", "status"]))),
+    ]
+    print(f"{args.surveys} surveys, {args.audience} recipients each")
+    print(f"{'payload':<40} {'bytes':>12}")
+    for label, n in rows:
+        print(f"{label:<40} {n:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_persistence.py
+#
+# Measures survey status transitions per second through SurveyStore for each persistence
+# backend, and how long a SQLite warm start takes when most surveys are already finished.
+#
+#   python benchmarks/bench_persistence.py --surveys 20000
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from employee_pulse_agent.agents import InMemoryBackend, SQLiteBackend, SurveyStore
+
+TRANSITIONS = ("approved_ready_to_send", "sent")
+
+
+def make_survey(i):
+    return {
+        "survey_id": f"survey_{i}",
+        "title": f"Pulse {i}",
+        "topic": "wellness",
+        "num_questions": 2,
+        "target_audience_emails": [f"employee{j}@example.com" for j in range(20)],
+        "approver_contact": f"manager{i % 50}@example.com",
+        "questions": [{"id": "wel1", "text": "How would you rate your current work-life balance?"}],
+        "status": "pending_approval",
+        "approval_request_id": f"approval_{i:03d}",
+        "approval_status": "pending",
+    }
+
+
+def run(backend, surveys):
+    store = SurveyStore(backend=backend)
+    start = time.perf_counter()
+    for i in range(surveys):
+        store.put(make_survey(i))
+    for status in TRANSITIONS:
+        for i in range(surveys):
+            store.update(f"survey_{i}", status=status)
+    backend.flush()
+    elapsed = time.perf_counter() - start
+    return surveys * (1 + len(TRANSITIONS)) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Persistence backend benchmark")
+    parser.add_argument("--surveys", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [
+            ("in-memory", lambda: InMemoryBackend()),
+            ("sqlite, batched commits", lambda: SQLiteBackend(os.path.join(tmp, "batched.db"))),
+            ("sqlite, commit per write", lambda: SQLiteBackend(os.path.join(tmp, "unbatched.db"), batch_size=1)),
+        ]
+        print(f"{'backend':<26} {'transitions/s':>13}")
+        for label, factory in backends:
+            backend = factory()
+            rate = run(backend, args.surveys)
+            backend.close()
+            print(f"{label:<26} {rate:>13.0f}")
+
+        # Warm start: every survey in batched.db is 'sent'; reopen a few so there is something to load.
+        path = os.path.join(tmp, "batched.db")
+        backend = SQLiteBackend(path)
+        store = SurveyStore(backend=backend)
+        for i in range(0, args.surveys, 20):
+            store.get(f"survey_{i}")
+            store.update(f"survey_{i}", status="pending_approval")
+        backend.close()
+        start = time.perf_counter()
+        backend = SQLiteBackend(path)
+        store = SurveyStore(backend=backend)
+        elapsed = time.perf_counter() - start
+        backend.close()
+        print(f"\nwarm start: {len(store)} open of {args.surveys} surveys loaded in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+# benchmarks/bench_pipeline.py
+#
+# End-to-end benchmark of the survey pipeline: OrchestratingAgent.initiate_pulse_survey ->
+# handle_approval_response -> CommunicationAgent.send_survey_invitations (via the dispatch queue)
+# -> record_survey_responses -> results, with synthetic audiences and in-process fake transports.
+# google.adk is replaced by a stub, so the root agent is built without the real framework and
+# no model is ever called.
+#
+# Two scenarios:
+#   audience  one survey per size in --recipients, to see how a stage scales with audience size
+#   fleet     --surveys surveys of --fleet-audience recipients each, to see per-survey overhead
+#
+# Each stage reports wall time, throughput, latency percentiles and (unless --no-memory) peak
+# Python memory, measured by re-running the scenario under tracemalloc so timings aren't skewed.
+# Results are written as JSON; --compare checks them against an earlier run.
+#
+#   python benchmarks/bench_pipeline.py --output pipeline.json
+#   python benchmarks/bench_pipeline.py --recipients 100 10000 1000000 --surveys 1 1000 100000
+#   python benchmarks/bench_pipeline.py --output new.json --compare pipeline.json --tolerance 0.15
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ.setdefault("PULSE_QUIET", "1")
+
+from employee_pulse_agent.agents import (
+    METRICS,
+    ApprovalAgent,
+    CommunicationAgent,
+    DispatchQueue,
+    OrchestratingAgent,
+    PulseQuestionnaireAgent,
+    configure_logging
+)
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+MIN_COMPARE_SECONDS = 0.01
+
+
+class StubLlmAgent:
+    """Stands in for google.adk.agents.LlmAgent: keeps its arguments and does nothing else."""
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def install_adk_stub():
+    """Registers stub google.adk modules, so agent.py's root agent builds without the real framework."""
+    google = sys.modules.get("google") or types.ModuleType("google")
+    adk = types.ModuleType("google.adk")
+    agents = types.ModuleType("google.adk.agents")
+    agents.LlmAgent = StubLlmAgent
+    adk.agents = agents
+    google.adk = adk
+    sys.modules.update({"google": google, "google.adk": adk, "google.adk.agents": agents})
+
+
+class FakeTransport:
+    """
+    In-process transport: accepts every message (or fails a deterministic fraction of
+    recipients) after an optional simulated per-batch latency, and records each batch's duration.
+    """
+    def __init__(self, latency=0.0, failure_rate=0.0):
+        self.latency = latency
+        self.failure_every = int(1 / failure_rate) if failure_rate else 0
+        self.batch_seconds = []
+        self.sent = 0
+        self.first_sent_at = None
+        self._lock = threading.Lock()
+
+    def send_batch(self, messages):
+        start = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_every:
+            results = [hash(message[0]) % self.failure_every != 0 for message in messages]
+        else:
+            results = [True] * len(messages)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.batch_seconds.append(elapsed)
+            self.sent += sum(results)
+            if self.first_sent_at is None:
+                self.first_sent_at = time.perf_counter()
+        return results
+
+    def send(self, recipient_email, subject, body):
+        return self.send_batch([(recipient_email, subject, body)])[0]
+
+    def close(self):
+        pass
+
+
+def percentiles(samples):
+    """Nearest-rank p50/p90/p99, max and mean of a list of seconds, in milliseconds."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    pick = lambda p: ordered[min(last, int(p * len(ordered)))] * 1000
+    return {"p50": round(pick(0.50), 4), "p90": round(pick(0.90), 4), "p99": round(pick(0.99), 4),
+            "max": round(ordered[-1] * 1000, 4), "mean": round(sum(ordered) / len(ordered) * 1000, 4)}
+
+
+class Stages:
+    """Collects (stage, items, seconds, latency samples) rows for one scenario run."""
+    def __init__(self, memory):
+        self.memory = memory
+        self.rows = []
+
+    def measure(self, stage, unit, func):
+        """Runs func() -> (items, latency samples or None) and records the stage."""
+        if self.memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        items, samples = func()
+        seconds = time.perf_counter() - start
+        row = {"stage": stage, "unit": unit, "count": items, "seconds": round(seconds, 6),
+               "throughput": round(items / seconds, 2) if seconds else None, "latency_ms": percentiles(samples)}
+        if self.memory:
+            row["peak_memory_mb"] = round((tracemalloc.get_traced_memory()[1] - base) / 1e6, 3)
+        self.rows.append(row)
+        return row
+
+
+def build_orchestrator(args, transport, max_finished=1000):
+    communication = CommunicationAgent(transport=transport, max_workers=args.workers, batch_size=args.batch_size,
+                                       max_retries=1 if args.failure_rate else 0, retry_backoff=0)
+    return OrchestratingAgent(PulseQuestionnaireAgent(), ApprovalAgent(), communication,
+                              dispatch_queue=DispatchQueue(max_concurrent=args.dispatch_concurrency, max_finished=max_finished))
+
+
+def survey_params(survey_id, audience):
+    return {"survey_id": survey_id, "title": f"Pulse {survey_id}", "topic": "wellness", "num_questions": 2,
+            "target_audience_emails": audience, "approver_contact": "hr_manager@example.com"}
+
+
+def synthetic_audience(size, offset=0):
+    return [f"employee{offset + i}@example.com" for i in range(size)]
+
+
+def timed_each(items, func):
+    """Calls func(item) for each item; returns (count, per-call seconds)."""
+    samples = []
+    clock = time.perf_counter
+    for item in items:
+        start = clock()
+        func(item)
+        samples.append(clock() - start)
+    return len(samples), samples
+
+
+def run_audience(args, recipients, stages):
+    """One survey with a large audience, through every stage of the pipeline."""
+    transport = FakeTransport(args.latency, args.failure_rate)
+    orchestrator = build_orchestrator(args, transport)
+    audience = synthetic_audience(recipients)
+    survey_id = f"audience-{recipients}"
+    state = {}
+
+    def initiate():
+        state["approval"] = orchestrator.initiate_pulse_survey(survey_params(survey_id, audience))["approval_request_id"]
+        return 1, None
+    stages.measure("initiate", "surveys", initiate)
+
+    def approve_and_send():
+        start = time.perf_counter()
+        orchestrator.handle_approval_response(state["approval"], "approved", wait=True)
+        state["time_to_first_send"] = (transport.first_sent_at or time.perf_counter()) - start
+        return transport.sent, transport.batch_seconds
+    row = stages.measure("approve_and_send", "recipients", approve_and_send)
+    row["time_to_first_send_ms"] = round(state["time_to_first_send"] * 1000, 3)
+
+    questions = [q["id"] for q in orchestrator.survey_store.get(survey_id)["questions"]]
+    respondents = audience[:max(1, int(recipients * args.response_rate))]
+    chunks = [respondents[i:i + 1000] for i in range(0, len(respondents), 1000)]
+
+    def record_responses():
+        count, samples = timed_each(chunks, lambda chunk: orchestrator.record_survey_responses(
+            survey_id, [(email, {qid: (i + n) % 10 + 1 for n, qid in enumerate(questions)}, None) for i, email in enumerate(chunk)]))
+        return len(respondents), samples
+    stages.measure("record_responses", "responses", record_responses)
+
+    def results():
+        # Through the orchestrator, as get_survey_results_tool calls it, so a broken path fails here
+        result = orchestrator.get_survey_results(survey_id)
+        if result.get("status") != "ok":
+            raise RuntimeError(f"get_survey_results failed: {result}")
+    stages.measure("results", "calls", lambda: timed_each(range(20), lambda _: results()))
+    stages.measure("status", "calls", lambda: timed_each(range(200), lambda _: orchestrator.get_survey_status(survey_id)))
+    orchestrator.dispatch_queue.shutdown()
+
+
+def run_fleet(args, surveys, stages):
+    """Many small surveys: per-survey overhead of initiation, approval and dispatch."""
+    transport = FakeTransport(args.latency, args.failure_rate)
+    orchestrator = build_orchestrator(args, transport, max_finished=surveys) # dispatch_drain reads every job back
+    audience = synthetic_audience(args.fleet_audience)
+    ids = [f"fleet-{surveys}-{i}" for i in range(surveys)]
+    approvals = []
+
+    def initiate():
+        return timed_each(ids, lambda survey_id: approvals.append(
+            orchestrator.initiate_pulse_survey(survey_params(survey_id, audience))["approval_request_id"]))
+    stages.measure("initiate", "surveys", initiate)
+
+    def approve():
+        return timed_each(approvals, lambda approval: orchestrator.handle_approval_response(approval, "approved"))
+    stages.measure("approve", "surveys", approve)
+
+    def dispatch():
+        orchestrator.dispatch_queue.wait_all()
+        jobs = [orchestrator.dispatch_queue.get(survey_id) for survey_id in ids]
+        return len(jobs), [job.finished_at - job.queued_at for job in jobs] # Queue wait plus sending
+    stages.measure("dispatch_drain", "surveys", dispatch)
+
+    stages.measure("list_page", "calls", lambda: timed_each(range(50), lambda _: orchestrator.list_active_surveys(status="sent", limit=50)))
+    orchestrator.dispatch_queue.shutdown()
+
+
+def build_root_agent(stages):
+    """Builds agent.py's root agent against the stubbed ADK: tool wiring and service start-up cost."""
+    def build():
+        import employee_pulse_agent.agent as agent_module
+        agent_module.get_root_agent()
+        return 1, None
+    stages.measure("build_root_agent", "agents", build)
+
+
+def run_scenario(name, size_key, size, func, args):
+    """Runs a scenario for timing, then again under tracemalloc for memory, and merges the rows."""
+    timing = Stages(memory=False)
+    func(size, timing)
+    if not args.no_memory:
+        memory = Stages(memory=True)
+        tracemalloc.start()
+        try:
+            func(size, memory)
+        finally:
+            tracemalloc.stop()
+        for row, memory_row in zip(timing.rows, memory.rows):
+            row["peak_memory_mb"] = memory_row["peak_memory_mb"]
+    for row in timing.rows:
+        row.update(scenario=name, **{size_key: size})
+    return timing.rows
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def row_key(row):
+    return (row["scenario"], row.get("recipients"), row.get("surveys"), row["stage"])
+
+
+def compare(rows, baseline_path, tolerance):
+    """Prints throughput changes against a baseline file; returns the rows that regressed beyond tolerance."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {row_key(row): row for row in json.load(f)["results"]}
+    regressions = []
+    print(f"\n{'scenario':<9} {'size':>8} {'stage':<18} {'before/s':>12} {'after/s':>12} {'change':>8}", file=sys.stderr)
+    for row in rows:
+        before = baseline.get(row_key(row))
+        if not before or not before.get("throughput") or not row.get("throughput"):
+            continue
+        if before["seconds"] < MIN_COMPARE_SECONDS: # Too short to time reliably
+            continue
+        change = row["throughput"] / before["throughput"] - 1
+        flag = " REGRESSION" if change < -tolerance else ""
+        size = row.get("recipients") or row.get("surveys") or ""
+        print(f"{row['scenario']:<9} {size:>8} {row['stage']:<18} {before['throughput']:>12.1f} {row['throughput']:>12.1f} {change:>+7.1%}{flag}", file=sys.stderr)
+        if flag:
+            regressions.append(row)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end survey pipeline benchmark")
+    parser.add_argument("--recipients", type=int, nargs="*", default=[100, 10_000, 100_000], help="audience sizes for the audience scenario")
+    parser.add_argument("--surveys", type=int, nargs="*", default=[1, 100, 1000], help="survey counts for the fleet scenario")
+    parser.add_argument("--fleet-audience", type=int, default=20, help="recipients per survey in the fleet scenario")
+    parser.add_argument("--workers", type=int, default=4, help="CommunicationAgent send workers")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--dispatch-concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per transport batch")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of recipients the fake transport rejects")
+    parser.add_argument("--response-rate", type=float, default=0.3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--no-metrics", action="store_true", help="run with agent metrics collection off (on by default, as in the service)")
+    parser.add_argument("--output", help="write results as JSON to this file (default: stdout)")
+    parser.add_argument("--compare", help="earlier results file to compare throughput against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="throughput drop reported as a regression")
+    args = parser.parse_args()
+
+    configure_logging(quiet=True)
+    install_adk_stub()
+
+    rows = []
+    setup = Stages(memory=False)
+    build_root_agent(setup)
+    rows.extend(dict(row, scenario="startup") for row in setup.rows)
+    METRICS.enabled = not args.no_metrics # Building the services turned it on from PULSE_METRICS
+    for recipients in args.recipients:
+        rows.extend(run_scenario("audience", "recipients", recipients, lambda size, stages: run_audience(args, size, stages), args))
+    for surveys in args.surveys:
+        rows.extend(run_scenario("fleet", "surveys", surveys, lambda size, stages: run_fleet(args, size, stages), args))
+
+    print(f"{'scenario':<9} {'size':>8} {'stage':<18} {'count':>8} {'seconds':>9} {'per sec':>11} {'p50 ms':>9} {'p99 ms':>9} {'peak MB':>8}", file=sys.stderr)
+    for row in rows:
+        latency = row["latency_ms"] or {}
+        size = row.get("recipients") or row.get("surveys") or ""
+        peak = row.get("peak_memory_mb")
+        print(f"{row['scenario']:<9} {size:>8} {row['stage']:<18} {row['count']:>8} {row['seconds']:>9.3f} "
+              f"{row['throughput'] or 0:>11.1f} {latency.get('p50', ''):>9} {latency.get('p99', ''):>9} "
+              f"{'' if peak is None else peak:>8}", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": rows,
+    }
+    regressions = compare(rows, args.compare, args.tolerance) if args.compare else []
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
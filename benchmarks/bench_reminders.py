@@ -0,0 +1,55 @@
+# benchmarks/bench_reminders.py
+#
+# Measures the reminder scheduler with a simulated clock: scheduling and rescheduling reminders
+# for many open surveys, then firing them all as time advances.
+#
+#   python benchmarks/bench_reminders.py --surveys 100000
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from employee_pulse_agent.agents import ReminderScheduler, SimulatedClock
+
+DAY = 86400
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reminder scheduler benchmark")
+    parser.add_argument("--surveys", type=int, default=100_000)
+    parser.add_argument("--reschedule", type=float, default=0.2, help="fraction of reminders moved after scheduling")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    clock = SimulatedClock()
+    scheduler = ReminderScheduler(clock)
+    fired = []
+    callback = fired.append
+
+    start = time.perf_counter()
+    for i in range(args.surveys):
+        scheduler.schedule(f"survey{i}", rng.uniform(0, 14 * DAY), lambda i=i: callback(i))
+    scheduled = time.perf_counter() - start
+
+    moved = int(args.surveys * args.reschedule)
+    start = time.perf_counter()
+    for i in rng.sample(range(args.surveys), moved):
+        scheduler.schedule(f"survey{i}", rng.uniform(0, 14 * DAY), lambda i=i: callback(i))
+    rescheduled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(14):
+        scheduler.advance(DAY)
+    advanced = time.perf_counter() - start
+
+    print(f"schedule   {args.surveys:>9} reminders {scheduled:>7.2f}s {args.surveys / scheduled:>10.0f}/s", file=sys.stderr)
+    print(f"reschedule {moved:>9} reminders {rescheduled:>7.2f}s {moved / max(rescheduled, 1e-9):>10.0f}/s", file=sys.stderr)
+    print(f"fire       {len(fired):>9} reminders {advanced:>7.2f}s {len(fired) / advanced:>10.0f}/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
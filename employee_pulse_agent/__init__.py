@@ -1,28 +1,38 @@
 # employee_pulse_agent/__init__.py
 
+import importlib
+import logging
 import os
-from dotenv import load_dotenv
 
-# --- Load Environment Variables ---
-# ADK's logs show it loads the .env from the app root (employee_pulse_agent/.env).
-# This explicit load can be a fallback or ensure it's loaded if this __init__ is processed first.
-dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
-if os.path.exists(dotenv_path):
-    load_dotenv(dotenv_path)
-    print(f"Loaded .env file from: {dotenv_path} in __init__.py")
-else:
-    print(f".env file not found at {dotenv_path} in __init__.py. Relying on ADK's .env loading or environment variables.")
-
-# Make the 'agent.py' module's contents, particularly 'root_agent', available
-# when the 'employee_pulse_agent' package is imported.
-# The ADK framework will look for `employee_pulse_agent.agent.root_agent`.
-from . import agent  # This imports employee_pulse_agent/agent.py
+logger = logging.getLogger("employee_pulse_agent")
 
-print(f"employee_pulse_agent package initialized. 'agent' module (and its 'root_agent') should be available.")
+_env_loaded = False
 
-# You can add a check here for debugging if needed:
-# if hasattr(agent, 'root_agent'):
-#     print(f"Successfully imported 'agent.root_agent': {agent.root_agent.name}")
-# else:
-#     print("ERROR: 'agent.root_agent' not found after import in __init__.py")
+# --- Load Environment Variables ---
+def load_environment():
+    """
+    Loads employee_pulse_agent/.env into the environment, once per process.
+    ADK's logs show it loads the .env from the app root (employee_pulse_agent/.env) itself;
+    this is a fallback for when the package is used without the ADK CLI.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
+    if os.path.exists(dotenv_path):
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path)
+        logger.debug("Loaded .env file from: %s", dotenv_path)
+    else:
+        logger.debug(".env file not found at %s. Relying on ADK's .env loading or environment variables.", dotenv_path)
 
+# Importing the package is side-effect free: 'agent' (agent.py) and its 'root_agent' are
+# only imported/built when first accessed. The ADK framework looks for
+# `employee_pulse_agent.agent.root_agent`, which resolves through here.
+def __getattr__(name):
+    if name == "agent":
+        return importlib.import_module(".agent", __name__)
+    if name == "root_agent":
+        return importlib.import_module(".agent", __name__).get_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
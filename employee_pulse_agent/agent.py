@@ -1,49 +1,257 @@
 # employee_pulse_agent/agent.py
 
+import functools
 import os
-from dotenv import load_dotenv
-from google.adk.agents import LlmAgent
+import threading
+
+from . import load_environment
 
 # Import your custom agent classes and orchestrator
 from .agents import (
     PulseQuestionnaireAgent,
     ApprovalAgent,
     CommunicationAgent,
-    OrchestratingAgent
+    DispatchQueue,
+    DomainThrottle,
+    EmployeeDirectory,
+    IdempotencyCache,
+    MessageBus,
+    METRICS,
+    MetricsExporter,
+    OrchestratingAgent,
+    SMTPTransport,
+    QuestionBank,
+    ReminderScheduler,
+    SuppressionList,
+    backend_from_env,
+    configure_logging,
+    configure_metrics,
+    get_logger
 )
+from .agents.invitation_template import link_secret, set_link_secret
+from .agents.metrics import start_profiler, stop_profiler
+from .agents.orchestrator_agent import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
-# --- Load Environment Variables ---
-dotenv_path = os.path.join(os.path.dirname(__file__), '.env')
-if os.path.exists(dotenv_path):
-    load_dotenv(dotenv_path)
-    print(f"Loaded .env file from: {dotenv_path} in agent.py")
-else:
-    print(f".env file not found at {dotenv_path} in agent.py. Relying on ADK's .env loading or environment variables.")
-
-# --- Initialize Backend Services (Your Custom Agents) ---
-print("Initializing backend services for Employee Pulse Agent...")
-questionnaire_service = PulseQuestionnaireAgent()
-approval_service = ApprovalAgent()
-communication_service = CommunicationAgent()
-
-# The OrchestratingAgent now acts as a central service layer
-pulse_orchestrator_service = OrchestratingAgent(
-    questionnaire_agent=questionnaire_service,
-    approval_agent=approval_service,
-    communication_agent=communication_service,
-    name="PulseSurveyServiceOrchestrator"
-)
-print(f"'{pulse_orchestrator_service.name}' initialized.")
+logger = get_logger("agent")
+
+# --- Backend Services (Your Custom Agents) ---
+# Nothing is built at import time. The services are created on first use by get_services(),
+# and root_agent (which needs google.adk) only when it is first accessed.
+# The old module-level names (pulse_orchestrator_service, root_agent, ...) still work via __getattr__ below.
+
+_services = None
+_root_agent = None
+_idempotency_cache = None
+_metrics_exporter = None
+_build_lock = threading.RLock()
+
+def get_services():
+    """Builds the backend service agents on first call and returns them as a dict, keyed by their old module-level names."""
+    global _services
+    if _services is None:
+        with _build_lock:
+            if _services is None:
+                _services = _build_services()
+    return _services
+
+def get_orchestrator():
+    """Returns the shared OrchestratingAgent, building the services if needed."""
+    return get_services()["pulse_orchestrator_service"]
+
+def _build_services():
+    load_environment()
+    # PULSE_LOG_LEVEL sets the level (default INFO); PULSE_QUIET=1 keeps only warnings and errors.
+    configure_logging()
+    # Agent methods and tools record call counts and latencies unless PULSE_METRICS=0 (see get_metrics_tool).
+    configure_metrics()
+    logger.info("Initializing backend services for Employee Pulse Agent...")
+    # Surveys and approvals are kept in SQLite when PULSE_STATE_DB is set; otherwise in memory only.
+    state_backend = backend_from_env()
+    # PULSE_QUESTION_BANK may point at a .json/.jsonl/.csv question library; otherwise the built-in questions are used.
+    question_bank_path = os.getenv("PULSE_QUESTION_BANK")
+    questionnaire_service = PulseQuestionnaireAgent(
+        question_bank=QuestionBank.from_file(question_bank_path) if question_bank_path else None
+    )
+    approval_service = ApprovalAgent(backend=state_backend)
+    communication_service = build_communication_agent()
+
+    # PULSE_SEND_PROCESSES > 0 sends invitations and reminders from that many CommunicationAgent worker
+    # processes, reached over a message bus, so sending runs on other cores while this process stays responsive.
+    # Recipients are still chosen here (against this process's suppression list) and handed over
+    # PULSE_BUS_CHUNK_SIZE at a time.
+    send_processes = int(os.getenv("PULSE_SEND_PROCESSES", "0"))
+    message_bus = None
+    if send_processes > 0:
+        message_bus = MessageBus(batch_size=int(os.getenv("PULSE_BUS_BATCH_SIZE", "64"))).start()
+        message_bus.register_process_pool(communication_service.name, _communication_worker_factory(send_processes),
+                                          processes=send_processes)
+
+    # PULSE_DIRECTORY may point at an employee directory (.csv, or SQLite with an 'employees' table)
+    # so audiences can be chosen with selectors instead of email lists.
+    directory_path = os.getenv("PULSE_DIRECTORY")
+    employee_directory = EmployeeDirectory.from_file(directory_path) if directory_path else None
+
+    # The OrchestratingAgent now acts as a central service layer
+    pulse_orchestrator_service = OrchestratingAgent(
+        questionnaire_agent=questionnaire_service,
+        approval_agent=approval_service,
+        communication_agent=communication_service,
+        name="PulseSurveyServiceOrchestrator",
+        backend=state_backend,
+        # Approved surveys are sent in the background; PULSE_DISPATCH_CONCURRENCY surveys at a time.
+        dispatch_queue=DispatchQueue(max_concurrent=int(os.getenv("PULSE_DISPATCH_CONCURRENCY", "4"))),
+        directory=employee_directory,
+        # Non-respondents are reminded PULSE_REMINDER_DAYS after the invitations (default: 3 and 7 days; empty disables).
+        reminder_scheduler=ReminderScheduler(),
+        reminder_offsets=[float(days) * 86400 for days in os.getenv("PULSE_REMINDER_DAYS", "3,7").split(",") if days.strip()],
+        message_bus=message_bus,
+        bus_chunk_size=int(os.getenv("PULSE_BUS_CHUNK_SIZE", "1000")),
+        bus_chunks_in_flight=max(1, send_processes) * 2
+    )
+    pulse_orchestrator_service.resume_dispatches()
+    pulse_orchestrator_service.resume_reminders()
+    logger.info("'%s' initialized.", pulse_orchestrator_service.name)
+    services = {
+        "state_backend": state_backend,
+        "questionnaire_service": questionnaire_service,
+        "approval_service": approval_service,
+        "communication_service": communication_service,
+        "employee_directory": employee_directory,
+        "pulse_orchestrator_service": pulse_orchestrator_service,
+        "message_bus": message_bus,
+    }
+    _register_service_metrics(services)
+    return services
+
+def build_communication_agent(rate_share=1.0):
+    """
+    Builds a CommunicationAgent configured from the environment.
+    rate_share is this agent's share of the configured send rates (1/N for each of N send processes).
+    """
+    # Real SMTP delivery is used when SMTP_HOST is set; otherwise emails are simulated.
+    # PULSE_SEND_RATE / PULSE_DOMAIN_RATE / PULSE_DOMAIN_RATES cap messages per second (see DomainThrottle.from_env).
+    return CommunicationAgent(
+        transport=SMTPTransport.from_env(),
+        max_workers=int(os.getenv("PULSE_SEND_WORKERS", "4")),
+        batch_size=int(os.getenv("PULSE_SEND_BATCH_SIZE", "100")),
+        throttle=DomainThrottle.from_env(share=rate_share),
+        max_retries=int(os.getenv("PULSE_SEND_RETRIES", "2")),
+        retry_backoff=float(os.getenv("PULSE_RETRY_BACKOFF", "1.0")),
+        # Hard-bounced and unsubscribed addresses are kept in PULSE_SUPPRESSION_FILE (in memory only if unset).
+        suppression=SuppressionList(os.getenv("PULSE_SUPPRESSION_FILE") or None)
+    )
+
+def _register_service_metrics(services):
+    """
+    Adds the services' queue depths and counters to the metrics, read only when metrics are collected.
+    PULSE_METRICS_FILE has them written out in Prometheus text format every PULSE_METRICS_INTERVAL
+    seconds (default 15); PULSE_METRICS_PORT serves them at http://127.0.0.1:<port>/metrics.
+    """
+    global _metrics_exporter
+    orchestrator = services["pulse_orchestrator_service"]
+    communication = services["communication_service"]
+    METRICS.register("pulse_dispatch_jobs", "gauge", "Survey dispatch jobs by state (queued = waiting, sending = in flight).",
+                     orchestrator.dispatch_queue.state_counts, label="state")
+    METRICS.register("pulse_surveys", "gauge", "Surveys held in memory, by status.",
+                     orchestrator.survey_store.status_counts, label="status")
+    METRICS.register("pulse_reminders_scheduled", "gauge", "Surveys with a reminder waiting to fire.",
+                     lambda: len(orchestrator.reminder_scheduler) if orchestrator.reminder_scheduler is not None else None)
+    METRICS.register("pulse_suppressed_addresses", "gauge", "Addresses on the suppression list.",
+                     lambda: len(communication.suppression))
+    if services["message_bus"] is not None:
+        METRICS.register("pulse_bus_queued", "gauge", "Messages waiting on the message bus, by receiving agent.",
+                         services["message_bus"].queue_depths, label="agent")
+    METRICS.register("pulse_idempotency", "gauge", "Tool idempotency cache counters and size.",
+                     lambda: {key: value for key, value in get_idempotency_stats().items() if isinstance(value, (int, float))},
+                     label="stat")
+
+    path, port = os.getenv("PULSE_METRICS_FILE"), os.getenv("PULSE_METRICS_PORT")
+    if (path or port) and _metrics_exporter is None:
+        _metrics_exporter = MetricsExporter(
+            path=path or None,
+            interval=float(os.getenv("PULSE_METRICS_INTERVAL", "15")),
+            port=int(port) if port else None
+        ).start()
+
+def _communication_worker_factory(processes):
+    """
+    Returns the picklable factory the PULSE_SEND_PROCESSES worker processes build their agent with.
+    It carries this process's link secret: without PULSE_LINK_SECRET each worker would otherwise
+    pick its own random key, and the links it sends would not match the tokens checked here.
+    """
+    return functools.partial(_communication_worker, processes=processes, secret=link_secret())
+
+def _communication_worker(processes=1, secret=None):
+    """
+    Entry point of a PULSE_SEND_PROCESSES worker process: a fresh process has to set itself up.
+    Each of the processes workers sends at 1/processes of the configured rates.
+    """
+    load_environment()
+    configure_logging()
+    if secret is not None:
+        set_link_secret(secret)
+    return build_communication_agent(rate_share=1 / processes)
+
+def get_idempotency_cache():
+    """
+    Returns the cache that keeps state-changing tools from running twice for a repeated call.
+    PULSE_IDEMPOTENCY_TTL sets how long results are kept (seconds, default 600) and
+    PULSE_IDEMPOTENCY_SIZE how many (default 1024).
+    """
+    global _idempotency_cache
+    if _idempotency_cache is None:
+        with _build_lock:
+            if _idempotency_cache is None:
+                load_environment()
+                _idempotency_cache = IdempotencyCache(
+                    max_entries=int(os.getenv("PULSE_IDEMPOTENCY_SIZE", "1024")),
+                    ttl=float(os.getenv("PULSE_IDEMPOTENCY_TTL", "600"))
+                )
+    return _idempotency_cache
+
+def get_idempotency_stats():
+    """Hit/miss counts of the tool idempotency cache."""
+    return get_idempotency_cache().stats()
+
+def idempotent_tool(func):
+    """
+    Routes a state-changing tool through the idempotency cache (see IdempotencyCache.call):
+    a duplicate call, by idempotency_key or by identical arguments, gets the first call's result.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return get_idempotency_cache().call(func, args, kwargs)
+    return wrapper
+
+def instrumented_tool(func):
+    """Records the tool's call count and latency as pulse_tool{tool=<name>} (see get_metrics_tool)."""
+    return METRICS.timed("pulse_tool", tool=func.__name__)(func)
+
+def __getattr__(name):
+    if name == "root_agent":
+        return get_root_agent()
+    if name in ("state_backend", "questionnaire_service", "approval_service", "communication_service", "employee_directory",
+                "pulse_orchestrator_service", "message_bus"):
+        return get_services()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --- Tool Definitions for LlmAgent ---
 # These functions will wrap calls to your pulse_orchestrator_service methods.
 
-def initiate_survey_tool(survey_id: str, title: str, topic: str, num_questions: int, target_audience_emails: list[str], approver_contact: str) -> dict:
+@instrumented_tool
+@idempotent_tool
+def initiate_survey_tool(survey_id: str, title: str, topic: str, num_questions: int, target_audience_emails: list[str], approver_contact: str, target_audience_csv: str = "", target_audience_selector: str = "", idempotency_key: str = "") -> dict:
     """
     Initiates a new employee pulse survey.
     Requires survey_id, title, topic, num_questions, a list of target_audience_emails, and an approver_contact email.
+    For large audiences, pass an empty target_audience_emails list and either a target_audience_selector
+    resolved against the employee directory (e.g. "department=Engineering AND location=Pune") or a
+    target_audience_csv file path.
+    A survey_id that already exists is never re-created; its current state is returned instead.
+    idempotency_key optionally identifies this request: repeating a call with the same key (or with
+    identical arguments) returns the first call's result instead of doing the work again.
     """
-    print(f"[Tool: initiate_survey_tool] Called with id: {survey_id}, title: {title}")
+    logger.info("[Tool: initiate_survey_tool] Called with id: %s, title: %s", survey_id, title)
     params = {
         "survey_id": survey_id,
         "title": title,
@@ -52,25 +260,164 @@ def initiate_survey_tool(survey_id: str, title: str, topic: str, num_questions:
         "target_audience_emails": target_audience_emails,
         "approver_contact": approver_contact
     }
-    return pulse_orchestrator_service.initiate_pulse_survey(params)
+    if target_audience_csv:
+        params["target_audience_csv"] = target_audience_csv
+    if target_audience_selector:
+        params["target_audience_selector"] = target_audience_selector
+    return get_orchestrator().initiate_pulse_survey(params)
+
+@instrumented_tool
+@idempotent_tool
+def initiate_surveys_batch_tool(surveys: list[dict], topic: str = "", num_questions: int = 0, approver_contact: str = "", target_audience_selector: str = "", idempotency_key: str = "") -> dict:
+    """
+    Initiates many pulse surveys in one call (e.g. one per team for a quarterly rollout).
+    Each item of surveys is an object with survey_id and title, plus any of topic, num_questions,
+    approver_contact, target_audience_selector, target_audience_csv or target_audience_emails.
+    topic, num_questions, approver_contact and target_audience_selector given here apply to every
+    item that doesn't set its own. Returns a result per item, in order, and counts by status.
+    idempotency_key optionally identifies this request: repeating a call with the same key (or with
+    identical arguments) returns the first call's result instead of doing the work again.
+    """
+    logger.info("[Tool: initiate_surveys_batch_tool] Called with %d surveys", len(surveys))
+    defaults = {"topic": topic, "num_questions": num_questions, "approver_contact": approver_contact,
+                "target_audience_selector": target_audience_selector}
+    defaults = {key: value for key, value in defaults.items() if value}
+    defaults.setdefault("target_audience_emails", [])
+    return get_orchestrator().initiate_pulse_surveys(surveys, defaults=defaults)
 
-def handle_survey_approval_tool(approval_request_id: str, approval_decision: str) -> dict:
+@instrumented_tool
+def preview_audience_tool(selector: str) -> dict:
+    """
+    Resolves an audience selector against the employee directory and returns the number of
+    matching employees with a few sample addresses, without creating a survey.
+    Selectors compare directory fields with = or != (department, location, manager, ...),
+    'reports_to' (a manager's whole reporting chain) and 'tenure' (years, also <, <=, >, >=),
+    combined with AND, OR, NOT and parentheses; 'field IN (a, b)' matches any of several values.
+    """
+    logger.info("[Tool: preview_audience_tool] Called with selector: %s", selector)
+    return get_orchestrator().preview_audience(selector)
+
+@instrumented_tool
+@idempotent_tool
+def handle_survey_approval_tool(approval_request_id: str, approval_decision: str, idempotency_key: str = "") -> dict:
     """
     Handles the approval decision for a pending survey.
     Requires approval_request_id and approval_decision ('approved' or 'rejected').
+    An approved survey is queued and its invitations are sent in the background: the result
+    status is 'queued', and get_survey_status_tool shows the sending progress.
+    A request that was already decided is left as it is; its survey's current state is returned.
+    idempotency_key optionally identifies this request: repeating a call with the same key (or with
+    identical arguments) returns the first call's result instead of doing the work again.
+    """
+    logger.info("[Tool: handle_survey_approval_tool] Called with request_id: %s, decision: %s", approval_request_id, approval_decision)
+    return get_orchestrator().handle_approval_response(approval_request_id, approval_decision)
+
+@instrumented_tool
+@idempotent_tool
+def handle_survey_approvals_batch_tool(approval_request_ids: list[str], approval_decision: str, idempotency_key: str = "") -> dict:
+    """
+    Applies the same approval decision ('approved' or 'rejected') to many pending surveys at once.
+    Approved surveys are queued and sent in the background. Returns a result per approval
+    request, in order, and counts by status.
+    idempotency_key optionally identifies this request: repeating a call with the same key (or with
+    identical arguments) returns the first call's result instead of doing the work again.
+    """
+    logger.info("[Tool: handle_survey_approvals_batch_tool] Called with %d requests, decision: %s", len(approval_request_ids), approval_decision)
+    return get_orchestrator().handle_approval_responses([(request_id, approval_decision) for request_id in approval_request_ids])
+
+@instrumented_tool
+def retry_failed_invitations_tool(survey_id: str) -> dict:
+    """
+    Re-sends invitations for a survey in 'send_failed' status, only to the recipients whose
+    delivery failed. Recipients who already received the invitation are not emailed again.
+    """
+    logger.info("[Tool: retry_failed_invitations_tool] Called for survey_id: %s", survey_id)
+    return get_orchestrator().retry_failed_invitations(survey_id)
+
+@instrumented_tool
+def ingest_inbound_mail_tool(path: str) -> dict:
+    """
+    Processes inbound mail in bulk from an mbox file, a Maildir or a directory of message files.
+    Bounces, out-of-office replies and unsubscribes are counted; hard bounces and unsubscribes
+    are added to the suppression list so future invitations skip those addresses.
+    """
+    logger.info("[Tool: ingest_inbound_mail_tool] Called with path: %s", path)
+    try:
+        return get_services()["communication_service"].ingest_inbound_mail(path)
+    except OSError as e:
+        return {"status": "error", "message": str(e)}
+
+@instrumented_tool
+def get_survey_status_tool(survey_id: str, fields: str = "") -> dict:
+    """
+    Gets a compact summary of a specific survey by its ID: status, approval, audience size,
+    number of questions, dispatch progress (sent/failed/total while sending), respondents and response rate.
+    fields optionally lists the keys to return, comma-separated; besides the summary keys,
+    'questions' (full question list) and 'live_results' (current scores) can be requested.
+    """
+    logger.info("[Tool: get_survey_status_tool] Called for survey_id: %s", survey_id)
+    return get_orchestrator().get_survey_status(survey_id, fields=_split_fields(fields))
+
+@instrumented_tool
+def get_survey_results_tool(survey_id: str, group_by: str = "question") -> dict:
+    """
+    Gets aggregated response results for a sent survey: per-group response count, mean score,
+    score distribution, percentiles and eNPS.
+    group_by is 'question' (default), 'topic', 'segment' or 'overall'.
+    """
+    logger.info("[Tool: get_survey_results_tool] Called for survey_id: %s, group_by: %s", survey_id, group_by)
+    try:
+        return get_orchestrator().get_survey_results(survey_id, group_by=group_by)
+    except ValueError as e:
+        return {"status": "error", "message": str(e), "survey_id": survey_id}
+
+@instrumented_tool
+def list_all_surveys_tool(status: str = "", approver_contact: str = "", cursor: str = "", limit: int = DEFAULT_PAGE_SIZE, fields: str = "") -> dict:
+    """
+    Lists active surveys as compact summaries, a page at a time (oldest first).
+    Optionally filter by status (e.g. 'pending_approval', 'sent') and/or approver_contact.
+    If the result has a next_cursor, call again with cursor=next_cursor for the next page.
+    fields optionally lists the summary keys to return, comma-separated.
+    """
+    logger.info("[Tool: list_all_surveys_tool] Called with status: %s, approver: %s, cursor: %s", status or 'any', approver_contact or 'any', cursor or 'start')
+    return get_orchestrator().list_active_surveys(
+        status=status or None,
+        approver=approver_contact or None,
+        cursor=cursor or None,
+        limit=limit,
+        fields=_split_fields(fields)
+    )
+
+@instrumented_tool
+def get_metrics_tool(format: str = "summary") -> dict:
+    """
+    Reports where time goes in the survey service: calls, errors and latency percentiles for each
+    tool and agent method, survey dispatch jobs queued and in flight, surveys by status, reminders
+    scheduled, suppression list size and idempotency cache hits, plus the sampling profiler's
+    busiest functions while it is on.
+    format is 'summary' (default) or 'prometheus' for the Prometheus text exposition format.
     """
-    print(f"[Tool: handle_survey_approval_tool] Called with request_id: {approval_request_id}, decision: {approval_decision}")
-    return pulse_orchestrator_service.handle_approval_response(approval_request_id, approval_decision)
+    logger.info("[Tool: get_metrics_tool] Called with format: %s", format)
+    get_services() # Registers the service metrics
+    if format == "prometheus":
+        return {"status": "ok", "format": "prometheus", "text": METRICS.render_prometheus()}
+    return dict(METRICS.snapshot(), status="ok")
 
-def get_survey_status_tool(survey_id: str) -> dict:
-    """Gets the current status and details of a specific survey by its ID."""
-    print(f"[Tool: get_survey_status_tool] Called for survey_id: {survey_id}")
-    return pulse_orchestrator_service.get_survey_status(survey_id)
+@instrumented_tool
+def set_profiling_tool(enabled: bool, interval_ms: int = 10) -> dict:
+    """
+    Turns the sampling profiler on or off. While on, every interval_ms it notes which function each
+    busy thread is running; get_metrics_tool then lists the busiest functions. Turning it off
+    returns the final profile. Leave it off normally: it costs a little CPU while running.
+    """
+    logger.info("[Tool: set_profiling_tool] Called with enabled: %s", enabled)
+    if enabled:
+        start_profiler(max(interval_ms, 1) / 1000)
+        return {"status": "ok", "profiling": True, "interval_ms": max(interval_ms, 1)}
+    return {"status": "ok", "profiling": False, "profile": stop_profiler()}
 
-def list_all_surveys_tool() -> dict:
-    """Lists all currently active surveys and their statuses."""
-    print(f"[Tool: list_all_surveys_tool] Called.")
-    return pulse_orchestrator_service.list_active_surveys()
+def _split_fields(fields):
+    return [f.strip() for f in fields.split(",") if f.strip()] if fields else None
 
 
 # --- MCP Descriptions for Tools (Primarily for documentation or external use if needed) ---
@@ -93,7 +440,10 @@ initiate_survey_tool_mcp = {
                 "items": {"type": "string"},
                 "description": "A list of email addresses for the target audience."
             },
-            "approver_contact": {"type": "string", "description": "Email address of the person who needs to approve the survey."}
+            "approver_contact": {"type": "string", "description": "Email address of the person who needs to approve the survey."},
+            "target_audience_csv": {"type": "string", "description": "Optional path to a CSV file with an 'email' column; recipients are streamed from it at send time."},
+            "target_audience_selector": {"type": "string", "description": "Optional employee directory selector, e.g. 'department=Engineering AND location=Pune'; resolved at send time."},
+            "idempotency_key": {"type": "string", "description": "Optional unique key for this request; a repeated call with the same key returns the first result."}
         },
         "required": ["survey_id", "title", "topic", "num_questions", "target_audience_emails", "approver_contact"]
     },
@@ -109,6 +459,47 @@ initiate_survey_tool_mcp = {
     }
 }
 
+initiate_surveys_batch_tool_mcp = {
+    "name": "initiate_surveys_batch_tool",
+    "description": "Initiates many pulse surveys in one call; shared settings apply to items that don't set their own.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "surveys": {
+                "type": "array",
+                "items": {"type": "object"},
+                "description": "One object per survey: survey_id and title, plus optional topic, num_questions, approver_contact, target_audience_selector, target_audience_csv, target_audience_emails."
+            },
+            "topic": {"type": "string", "description": "Default topic."},
+            "num_questions": {"type": "integer", "description": "Default number of questions."},
+            "approver_contact": {"type": "string", "description": "Default approver email."},
+            "target_audience_selector": {"type": "string", "description": "Default employee directory selector."},
+            "idempotency_key": {"type": "string", "description": "Optional unique key for this request; a repeated call with the same key returns the first result."}
+        },
+        "required": ["surveys"]
+    },
+    "returns": {
+        "type": "object",
+        "description": "{'results': [per-survey result like initiate_survey_tool's], 'counts': {status: n}}."
+    }
+}
+
+preview_audience_tool_mcp = {
+    "name": "preview_audience_tool",
+    "description": "Resolves an employee directory selector and returns the audience size and a few sample addresses.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "selector": {"type": "string", "description": "e.g. 'department=Engineering AND location=Pune', 'reports_to=cto@example.com', 'tenure>=2'."}
+        },
+        "required": ["selector"]
+    },
+    "returns": {
+        "type": "object",
+        "description": "{'status': 'ok', 'audience_size': int, 'sample': [email, ...]}, or an error message."
+    }
+}
+
 handle_survey_approval_tool_mcp = {
     "name": "handle_survey_approval_tool",
     "description": "Handles the approval decision for a pending survey. Requires approval_request_id and approval_decision ('approved' or 'rejected').",
@@ -116,14 +507,15 @@ handle_survey_approval_tool_mcp = {
         "type": "object",
         "properties": {
             "approval_request_id": {"type": "string", "description": "The ID of the approval request."},
-            "approval_decision": {"type": "string", "enum": ["approved", "rejected"], "description": "The decision for the approval."}
+            "approval_decision": {"type": "string", "enum": ["approved", "rejected"], "description": "The decision for the approval."},
+            "idempotency_key": {"type": "string", "description": "Optional unique key for this request; a repeated call with the same key returns the first result."}
         },
         "required": ["approval_request_id", "approval_decision"]
     },
     "returns": {
         "type": "object",
         "properties": {
-            "status": {"type": "string", "description": "Final status after handling approval ('sent', 'rejected', 'send_failed', 'error')."},
+            "status": {"type": "string", "description": "Status after handling approval ('queued' for approved surveys, 'rejected', 'error')."},
             "survey_id": {"type": "string", "description": "The ID of the survey affected."},
             "message": {"type": "string", "description": "Error message, if any."}
         },
@@ -131,51 +523,196 @@ handle_survey_approval_tool_mcp = {
     }
 }
 
+handle_survey_approvals_batch_tool_mcp = {
+    "name": "handle_survey_approvals_batch_tool",
+    "description": "Applies one approval decision to many approval requests at once.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "approval_request_ids": {"type": "array", "items": {"type": "string"}, "description": "The approval request IDs to decide."},
+            "approval_decision": {"type": "string", "enum": ["approved", "rejected"], "description": "The decision for all of them."},
+            "idempotency_key": {"type": "string", "description": "Optional unique key for this request; a repeated call with the same key returns the first result."}
+        },
+        "required": ["approval_request_ids", "approval_decision"]
+    },
+    "returns": {
+        "type": "object",
+        "description": "{'results': [per-request result like handle_survey_approval_tool's], 'counts': {status: n}}."
+    }
+}
+
+retry_failed_invitations_tool_mcp = {
+    "name": "retry_failed_invitations_tool",
+    "description": "Re-sends invitations for a 'send_failed' survey to the recipients whose delivery failed, and no one else.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "survey_id": {"type": "string", "description": "The ID of the survey whose failed invitations should be retried."}
+        },
+        "required": ["survey_id"]
+    },
+    "returns": {
+        "type": "object",
+        "properties": {
+            "status": {"type": "string", "description": "'queued' when the retry was scheduled, or 'error'."},
+            "survey_id": {"type": "string", "description": "The ID of the survey."},
+            "retried": {"type": "integer", "description": "Number of failed recipients being retried."},
+            "message": {"type": "string", "description": "Error message, if any."}
+        },
+        "required": ["status", "survey_id"]
+    }
+}
+
+ingest_inbound_mail_tool_mcp = {
+    "name": "ingest_inbound_mail_tool",
+    "description": "Classifies inbound mail (mbox file, Maildir or spool directory) and suppresses hard-bounced and unsubscribed addresses.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "path": {"type": "string", "description": "Path to an mbox file, a Maildir, or a directory of message files."}
+        },
+        "required": ["path"]
+    },
+    "returns": {
+        "type": "object",
+        "description": "{'messages': int, 'categories': {category: count}, 'newly_suppressed': int}, or an error message."
+    }
+}
+
 get_survey_status_tool_mcp = {
     "name": "get_survey_status_tool",
-    "description": "Gets the current status and details of a specific survey by its ID.",
+    "description": "Gets a compact summary (status, approval, audience size, dispatch progress, respondents, response rate) of a specific survey by its ID.",
     "parameters": {
         "type": "object",
-        "properties": {"survey_id": {"type": "string", "description": "The unique identifier of the survey to query."}},
+        "properties": {
+            "survey_id": {"type": "string", "description": "The unique identifier of the survey to query."},
+            "fields": {"type": "string", "description": "Optional comma-separated keys to return, e.g. 'status,response_rate' or 'questions'."}
+        },
+        "required": ["survey_id"]
+    },
+    "returns": {
+        "type": "object",
+        "description": "Contains the survey summary if found, or an error message."
+    }
+}
+
+get_survey_results_tool_mcp = {
+    "name": "get_survey_results_tool",
+    "description": "Gets aggregated response results (count, mean, distribution, percentiles, eNPS) for a sent survey.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "survey_id": {"type": "string", "description": "The unique identifier of the survey."},
+            "group_by": {"type": "string", "enum": ["question", "topic", "segment", "overall"], "description": "How to group the results."}
+        },
         "required": ["survey_id"]
     },
     "returns": {
         "type": "object",
-        "description": "Contains survey details if found, or an error message."
+        "description": "Contains 'respondents' and a 'results' object keyed by group, or an error message."
     }
 }
 
 list_all_surveys_tool_mcp = {
     "name": "list_all_surveys_tool",
-    "description": "Lists all currently active surveys and their statuses.",
-    "parameters": {"type": "object", "properties": {}},
+    "description": "Lists active surveys as compact summaries, one page at a time, optionally filtered by status and/or approver.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "status": {"type": "string", "description": "Only list surveys with this status (e.g. 'pending_approval', 'sent')."},
+            "approver_contact": {"type": "string", "description": "Only list surveys awaiting or approved by this approver."},
+            "cursor": {"type": "string", "description": "The next_cursor value from the previous page."},
+            "limit": {"type": "integer", "description": f"Page size (default {DEFAULT_PAGE_SIZE}, at most {MAX_PAGE_SIZE})."},
+            "fields": {"type": "string", "description": "Optional comma-separated summary keys to return."}
+        }
+    },
     "returns": {
         "type": "object",
-        "description": "A dictionary where keys are survey_ids and values are survey detail objects. Returns empty object if no surveys."
+        "description": "{'surveys': [summary, ...], 'next_cursor': string or null, 'total': number of matching surveys}."
+    }
+}
+
+get_metrics_tool_mcp = {
+    "name": "get_metrics_tool",
+    "description": "Reports call counts, errors and latency percentiles per tool and agent method, dispatch queue depth and other service metrics.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "format": {"type": "string", "enum": ["summary", "prometheus"], "description": "'summary' (default) or Prometheus text."}
+        }
+    },
+    "returns": {
+        "type": "object",
+        "description": "'timings' by tool and agent method plus gauges such as 'pulse_dispatch_jobs', or 'text' in Prometheus format."
+    }
+}
+
+set_profiling_tool_mcp = {
+    "name": "set_profiling_tool",
+    "description": "Starts or stops the sampling profiler; stopping returns the busiest functions.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "enabled": {"type": "boolean", "description": "True to start profiling, False to stop."},
+            "interval_ms": {"type": "integer", "description": "Sampling interval in milliseconds (default 10)."}
+        },
+        "required": ["enabled"]
+    },
+    "returns": {
+        "type": "object",
+        "description": "Contains 'profiling' and, when stopping, the 'profile' report."
     }
 }
 
 # --- Define the Root LlmAgent ---
-root_agent = LlmAgent(
-    name="employee_pulse_survey_llm_agent",
-    model=os.getenv("ADK_MODEL", "gemini-1.5-flash"),
-    description="An agent that manages employee pulse surveys, including initiation, approvals, and status tracking.",
-    instruction=(
-        "You are an AI assistant managing employee pulse surveys. "
-        "Use the available tools to initiate surveys, handle approvals, and check survey statuses. "
-        "When initiating a survey, ensure you have all required parameters: survey_id, title, topic, num_questions, target_audience_emails (as a list), and approver_contact. "
-        "For approvals, you need an approval_request_id and a decision ('approved' or 'rejected')."
-        "The target_audience_emails parameter should be a list of strings."
-    ),
-    tools=[ # Provide the actual function objects
-        initiate_survey_tool,
-        handle_survey_approval_tool,
-        get_survey_status_tool,
-        list_all_surveys_tool
-    ]
-    # DO NOT pass tool_descriptions as a constructor argument.
-    # The ADK infers schemas from the Python functions (docstrings, type hints).
-)
+def get_root_agent():
+    """Returns the root LlmAgent, importing google.adk and building it on first call."""
+    global _root_agent
+    if _root_agent is None:
+        with _build_lock:
+            if _root_agent is None:
+                _root_agent = _build_root_agent()
+    return _root_agent
+
+def _build_root_agent():
+    from google.adk.agents import LlmAgent
+
+    load_environment()
+    get_services() # The server is about to take tool calls, so have the backend ready too
+    return LlmAgent(
+        name="employee_pulse_survey_llm_agent",
+        model=os.getenv("ADK_MODEL", "gemini-1.5-flash"),
+        description="An agent that manages employee pulse surveys, including initiation, approvals, and status tracking.",
+        instruction=(
+            "You are an AI assistant managing employee pulse surveys. "
+            "Use the available tools to initiate surveys, handle approvals, check survey statuses and report survey results. "
+            "When initiating a survey, ensure you have all required parameters: survey_id, title, topic, num_questions, target_audience_emails (as a list), and approver_contact. "
+            "For approvals, you need an approval_request_id and a decision ('approved' or 'rejected'). "
+            "When several surveys are to be initiated or decided at once, use initiate_surveys_batch_tool or "
+            "handle_survey_approvals_batch_tool in a single call instead of one call per survey. "
+            "The target_audience_emails parameter should be a list of strings. "
+            "If the audience is given as a CSV file path, pass it as target_audience_csv with an empty target_audience_emails list. "
+            "If the audience is described by department, location, manager or tenure, don't list emails: pass a "
+            "target_audience_selector (check it first with preview_audience_tool) with an empty target_audience_emails list. "
+            "When asked about performance or where time is going, use get_metrics_tool."
+        ),
+        tools=[ # Provide the actual function objects
+            initiate_survey_tool,
+            initiate_surveys_batch_tool,
+            preview_audience_tool,
+            handle_survey_approval_tool,
+            handle_survey_approvals_batch_tool,
+            retry_failed_invitations_tool,
+            ingest_inbound_mail_tool,
+            get_survey_status_tool,
+            get_survey_results_tool,
+            list_all_surveys_tool,
+            get_metrics_tool,
+            set_profiling_tool
+        ]
+        # DO NOT pass tool_descriptions as a constructor argument.
+        # The ADK infers schemas from the Python functions (docstrings, type hints).
+    )
 
 # If you need to access the generated schemas by ADK (for inspection or other purposes),
 # LlmAgent might expose them through an attribute after initialization, e.g., root_agent.tools_mcp_generated
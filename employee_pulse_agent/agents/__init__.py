@@ -7,12 +7,68 @@ from .base_agent import BaseAgent
 from .questionnaire_agent import PulseQuestionnaireAgent
 from .approval_agent import ApprovalAgent
 from .communication_agent import CommunicationAgent
+from .dispatch_queue import DispatchQueue, DispatchJob
+from .delivery import DeliveryLedger, TokenBucket, DomainThrottle
+from .inbound import InboundProcessor, SuppressionList, classify_message
+from .idempotency import IdempotencyCache
+from .message_bus import MessageBus, MessageError
+from .reminders import ReminderScheduler, SimulatedClock
 from .orchestrator_agent import OrchestratingAgent
+from .response_agent import ResponseAgent
+from .mail_transport import SimulatedTransport, SMTPTransport
+from .invitation_template import InvitationTemplate
+from .audience import iter_recipients, iter_recipients_from_csv
+from .directory import EmployeeDirectory, SelectorError
+from .survey_store import SurveyStore, SequentialIdAllocator
+from .persistence import InMemoryBackend, SQLiteBackend, backend_from_env
+from .logging_config import configure_logging, get_logger, shutdown_logging
+from .metrics import METRICS, MetricsRegistry, MetricsExporter, SamplingProfiler, configure_metrics
+from .question_bank import QuestionBank
+from .response_store import SurveyResponses
+from .streaming_stats import RunningStats, SurveyAggregate
 
 __all__ = [
     "BaseAgent",
     "PulseQuestionnaireAgent",
     "ApprovalAgent",
     "CommunicationAgent",
-    "OrchestratingAgent"
+    "DispatchQueue",
+    "DispatchJob",
+    "DeliveryLedger",
+    "TokenBucket",
+    "DomainThrottle",
+    "InboundProcessor",
+    "SuppressionList",
+    "classify_message",
+    "IdempotencyCache",
+    "MessageBus",
+    "MessageError",
+    "ReminderScheduler",
+    "SimulatedClock",
+    "OrchestratingAgent",
+    "ResponseAgent",
+    "SimulatedTransport",
+    "SMTPTransport",
+    "InvitationTemplate",
+    "iter_recipients",
+    "iter_recipients_from_csv",
+    "EmployeeDirectory",
+    "SelectorError",
+    "SurveyStore",
+    "SequentialIdAllocator",
+    "InMemoryBackend",
+    "SQLiteBackend",
+    "backend_from_env",
+    "configure_logging",
+    "get_logger",
+    "shutdown_logging",
+    "METRICS",
+    "MetricsRegistry",
+    "MetricsExporter",
+    "SamplingProfiler",
+    "configure_metrics",
+    "QuestionBank",
+    "SurveyResponses",
+    "RunningStats",
+    "SurveyAggregate"
 ]
@@ -1,46 +1,106 @@
 # employee_pulse_survey_project/agents/approval_agent.py
 
 from .base_agent import BaseAgent
+from .persistence import InMemoryBackend
+from .survey_store import SequentialIdAllocator
 
 class ApprovalAgent(BaseAgent):
     """
     Manages the approval process for surveys.
     """
-    def __init__(self, name="ApprovalAgent"):
+    def __init__(self, name="ApprovalAgent", backend=None):
         super().__init__(name)
-        self.approval_requests = {} # Stores approval_request_id: details
+        self.backend = backend if backend is not None else InMemoryBackend()
+        # Only pending requests are loaded at startup; decided ones are fetched on demand.
+        self.approval_requests = self.backend.load_pending_approvals() # Stores approval_request_id: details
+        self._request_ids = SequentialIdAllocator("approval_") # Never reuses an ID
+        last_id = self.backend.last_approval_id()
+        if last_id:
+            self._request_ids.advance_past(last_id)
 
-    def request_approval(self, survey_details, approver_contact):
-        """
-        Simulates requesting approval.
-        """
-        request_id = f"approval_{len(self.approval_requests) + 1:03d}" # Padded ID
-        self.approval_requests[request_id] = {
+    def _lookup(self, request_id):
+        request = self.approval_requests.get(request_id)
+        if request is None:
+            request = self.backend.load_approval(request_id)
+            if request is not None:
+                self.approval_requests[request_id] = request
+        return request
+
+    def _new_request(self, survey_details, approver_contact):
+        """Creates and stores one pending approval request and returns its ID."""
+        request_id = self._request_ids.next_id() # Padded ID, e.g. approval_001
+        request = {
             "survey_title": survey_details.get("title", "N/A"),
             "approver": approver_contact,
             "status": "pending", # In a real scenario, this would be updated externally
             "survey_details": survey_details # Store details for context
         }
-        print(f"[{self.name}] Approval requested for survey '{survey_details.get('title', 'N/A')}' from '{approver_contact}'. Request ID: {request_id}")
-        print(f"[{self.name}] To simulate approval, call orchestrator.handle_approval_response('{request_id}', 'approved') or 'rejected'")
+        self.backend.save_approval(request_id, request) # Buffered by the backend, so a batch is written together
+        self.approval_requests[request_id] = request
+        return request_id
+
+    def request_approval(self, survey_details, approver_contact):
+        """
+        Simulates requesting approval.
+        """
+        request_id = self._new_request(survey_details, approver_contact)
+        self.logger.info("Approval requested for survey '%s' from '%s'. Request ID: %s", survey_details.get('title', 'N/A'), approver_contact, request_id)
+        self.logger.debug("To simulate approval, call orchestrator.handle_approval_response('%s', 'approved') or 'rejected'", request_id)
         return request_id, "pending"
 
+    def request_approvals(self, requests):
+        """
+        Requests approval for many surveys at once. requests is a list of
+        (survey_details, approver_contact) pairs; returns a (request_id, 'pending') pair for each, in order.
+        """
+        results = [(self._new_request(survey_details, approver_contact), "pending") for survey_details, approver_contact in requests]
+        self.logger.info("Approval requested for %d surveys.", len(results))
+        return results
+
     def get_approval_status(self, request_id):
         """
         Checks the status of an approval request.
         """
-        status = self.approval_requests.get(request_id, {}).get("status", "not_found")
-        print(f"[{self.name}] Status for request ID '{request_id}': {status}")
+        status = (self._lookup(request_id) or {}).get("status", "not_found")
+        self.logger.info("Status for request ID '%s': %s", request_id, status)
         return status
 
+    def _undecided(self, request_id):
+        """Returns the approval request if it is still waiting for a decision, else None (logging why)."""
+        request = self._lookup(request_id)
+        if request is None:
+            self.logger.warning("Approval request ID '%s' not found.", request_id)
+        elif request.get("status") != "pending":
+            self.logger.warning("Approval request ID '%s' was already decided ('%s'); not recording it again.", request_id, request.get("status"))
+            return None
+        return request
+
     def record_approval_response(self, request_id, status):
         """
-        Records the response from an approver.
+        Records the response from an approver. A request that has already been decided keeps
+        its decision; False is returned for it, as for an unknown request.
         """
-        if request_id in self.approval_requests:
-            self.approval_requests[request_id]["status"] = status
-            print(f"[{self.name}] Approval status for '{request_id}' ('{self.approval_requests[request_id]['survey_title']}') updated to '{status}'.")
-            return True
-        else:
-            print(f"[{self.name}] Approval request ID '{request_id}' not found.")
+        request = self._undecided(request_id)
+        if request is None:
             return False
+        self.backend.save_approval(request_id, {**request, "status": status})
+        request["status"] = status
+        self.logger.info("Approval status for '%s' ('%s') updated to '%s'.", request_id, request['survey_title'], status)
+        return True
+
+    def record_approval_responses(self, responses):
+        """
+        Records many approver responses at once. responses is a list of (request_id, status)
+        pairs; returns True or False for each, as record_approval_response does.
+        """
+        recorded = []
+        for request_id, status in responses:
+            request = self._undecided(request_id)
+            if request is None:
+                recorded.append(False)
+                continue
+            self.backend.save_approval(request_id, {**request, "status": status})
+            request["status"] = status
+            recorded.append(True)
+        self.logger.info("Recorded %d of %d approval responses.", sum(recorded), len(recorded))
+        return recorded
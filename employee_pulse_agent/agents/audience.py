@@ -0,0 +1,32 @@
+# employee_pulse_survey_project/agents/audience.py
+
+import csv
+
+
+def iter_recipients(audience):
+    """
+    Yields (email, name) pairs from any iterable of recipients.
+    Each item may be an email string, an (email, name) tuple, or a dict with 'email' and optional 'name'.
+    Nothing is buffered, so generators and file-backed streams stay lazy.
+    """
+    for recipient in audience:
+        if isinstance(recipient, str):
+            email, name = recipient, None
+        elif isinstance(recipient, dict):
+            email, name = recipient.get("email"), recipient.get("name")
+        else:
+            email, name = recipient[0], (recipient[1] if len(recipient) > 1 else None)
+        if email:
+            yield email.strip(), name
+
+
+def iter_recipients_from_csv(path, email_column="email", name_column="name"):
+    """
+    Streams (email, name) pairs from a CSV file with a header row, one row at a time.
+    Rows without an email are skipped.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            email = (row.get(email_column) or "").strip()
+            if email:
+                yield email, (row.get(name_column) or "").strip() or None
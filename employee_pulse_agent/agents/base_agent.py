@@ -1,20 +1,36 @@
 # employee_pulse_survey_project/agents/base_agent.py
 
+from .logging_config import get_logger
+from .metrics import instrument_class
+
 class BaseAgent:
     """
     A base class for all agents, providing a common structure.
     """
     def __init__(self, name):
         self.name = name
-        print(f"[{self.name}] Initialized.")
+        self.logger = get_logger(name)
+        self.logger.info("Initialized.")
+
+    def __init_subclass__(cls, **kwargs):
+        # Every agent's public methods report call counts and latencies (see metrics.instrument_class)
+        super().__init_subclass__(**kwargs)
+        instrument_class(cls)
 
     def process_message(self, sender_name, message_type, payload):
         """
-        A generic way for agents to receive messages.
-        Specific agents will override or extend this.
+        A generic way for agents to receive messages (see MessageBus).
+        A message_type naming one of the agent's public methods calls it with the payload dict
+        as keyword arguments and returns its result. Specific agents can override or extend this.
         Note: sender is now sender_name (string) for simplicity in this structure.
         """
-        print(f"[{self.name}] Received message from [{sender_name}]: Type='{message_type}', Payload='{payload}'")
+        if not message_type.startswith("_") and message_type != "process_message":
+            handler = getattr(self, message_type, None)
+            if callable(handler):
+                return handler(**(payload or {}))
+        self.logger.info("Received message from [%s]: Type='%s', Payload='%s'", sender_name, message_type, payload)
         # Default behavior is to acknowledge, specific agents will handle differently
         return {"status": "acknowledged", "original_payload": payload}
 
+
+instrument_class(BaseAgent)
@@ -1,53 +1,295 @@
 # employee_pulse_survey_project/agents/communication_agent.py
 
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from .audience import iter_recipients
 from .base_agent import BaseAgent
+from .delivery import FAILED, SENT, SUPPRESSED, DeliveryLedger
+from .inbound import SUPPRESSING_CATEGORIES, InboundProcessor, SuppressionList, classify_email_data
+from .invitation_template import InvitationTemplate
+from .mail_transport import SimulatedTransport
 
 class CommunicationAgent(BaseAgent):
     """
     Handles sending emails and other communications.
+    Delivery goes through a pluggable transport (simulated by default, or SMTPTransport),
+    with recipients split into batches that are spread across a worker pool.
+    An optional DomainThrottle keeps sends within the relay's rate limits, and addresses on the
+    optional SuppressionList (hard bounces, unsubscribes) are skipped.
     """
-    def __init__(self, name="CommunicationAgent"):
+    def __init__(self, name="CommunicationAgent", transport=None, max_workers=4, batch_size=100,
+                 throttle=None, max_retries=2, retry_backoff=1.0, suppression=None):
         super().__init__(name)
+        self.transport = transport if transport is not None else SimulatedTransport(logger=self.logger)
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.throttle = throttle
+        self.max_retries = max_retries # Retry passes over failed recipients in one send_survey_invitations call
+        self.retry_backoff = retry_backoff # Seconds before the first retry pass; doubles each pass
+        self.suppression = suppression if suppression is not None else SuppressionList()
+        self._executor = None # Created on first use and reused across surveys
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{self.name}-send")
+            return self._executor
 
     def send_email(self, recipient_email, subject, body):
         """
-        Simulates sending an email.
-        Replace with actual email sending logic (e.g., smtplib, Gmail API).
-        """
-        print(f"[{self.name}] SIMULATING EMAIL SEND:")
-        print(f"  To: {recipient_email}")
-        print(f"  Subject: {subject}")
-        print(f"  Body:\n{body}\n")
-        print(f"[{self.name}] Email to {recipient_email} sent successfully (simulated).")
-        return True
-
-    def send_survey_invitations(self, employee_emails, survey_details):
-        """
-        Sends survey invitation emails to a list of employees.
-        """
-        print(f"[{self.name}] Preparing to send survey invitations for '{survey_details.get('title', 'Survey')}'")
-        survey_link = f"http://survey.example.com/s/{survey_details.get('survey_id', 'default_survey')}"
-        subject = f"Invitation: Please participate in the {survey_details.get('title', 'Employee Survey')}"
-        
-        success_count = 0
-        for email in employee_emails:
-            body = (f"Dear Employee,\n\nPlease take a few moments to complete our pulse survey: {survey_details.get('title', '')}.\n"
-                    f"Your feedback is valuable.\n\n"
-                    f"Access the survey here: {survey_link}\n\n"
-                    f"Thank you,\nHR Department")
-            if self.send_email(email, subject, body):
-                success_count +=1
-        
-        print(f"[{self.name}] {success_count}/{len(employee_emails)} survey invitations sent for '{survey_details.get('title', 'Survey')}'.")
-        return success_count == len(employee_emails)
+        Sends a single email through the configured transport.
+        """
+        return self.transport.send(recipient_email, subject, body)
+
+    def _dispatch_batches(self, batches, report, ledger=None, retrying=False):
+        """
+        Sends each (positions, messages) batch through the transport and returns the failed
+        messages as (position, message) pairs.
+        With more than one worker, batches are handed to the pool with a bounded number
+        in flight, so a huge audience never gets materialised as queued work all at once.
+        report's 'sent' and 'failed' counts are kept current as batches complete, and 'total'
+        never falls behind the number of recipients read so far. On a retry pass, recipients
+        are already counted in 'total' and 'failed', so a success moves one from failed to sent.
+        Each recipient's outcome is also marked in the ledger, if one is given.
+        """
+        failures = []
+        total_count = 0
+
+        def record(positions, messages, results):
+            sent = 0
+            for position, message, ok in zip(positions, messages, results):
+                if ok:
+                    sent += 1
+                else:
+                    failures.append((position, message))
+                if ledger is not None:
+                    ledger.mark(position, SENT if ok else FAILED)
+            report["sent"] += sent
+            report["failed"] += -sent if retrying else len(messages) - sent
+
+        if self.max_workers <= 1:
+            for positions, messages in batches:
+                if not retrying:
+                    total_count += len(messages)
+                    report["total"] = max(report["total"], total_count)
+                record(positions, messages, self._send_batch_safely(messages))
+            return failures
+
+        executor = self._get_executor()
+        max_in_flight = self.max_workers * 2
+        in_flight = deque() # (future, positions, messages)
+        for positions, messages in batches:
+            if not retrying:
+                total_count += len(messages)
+                report["total"] = max(report["total"], total_count)
+            in_flight.append((executor.submit(self._send_batch_safely, messages), positions, messages))
+            if len(in_flight) >= max_in_flight:
+                future, done_positions, done_messages = in_flight.popleft()
+                record(done_positions, done_messages, future.result())
+        while in_flight:
+            future, done_positions, done_messages = in_flight.popleft()
+            record(done_positions, done_messages, future.result())
+        return failures
+
+    def _send_batch_safely(self, messages):
+        """Sends one batch, after waiting for the throttle. Returns one boolean per message."""
+        try:
+            if self.throttle is not None:
+                self.throttle.wait_for([message[0] for message in messages])
+            results = self.transport.send_batch(messages)
+            if len(results) != len(messages):
+                raise ValueError(f"transport returned {len(results)} results for {len(messages)} messages")
+            return results
+        except Exception as exc:
+            self.logger.warning("Batch of %d emails failed: %s", len(messages), exc)
+            return [False] * len(messages)
+
+    def _iter_batches(self, items):
+        """Groups (position, message) pairs into (positions, messages) batches of batch_size."""
+        items = iter(items)
+        while True:
+            chunk = list(islice(items, self.batch_size))
+            if not chunk:
+                return
+            positions, messages = zip(*chunk)
+            yield positions, messages
+
+    def send_survey_invitations(self, employee_emails, survey_details, report=None, ledger=None, only_failed=False):
+        """
+        Sends survey invitation emails to employees.
+        employee_emails can be any iterable of recipients (see audience.iter_recipients),
+        including a generator streaming rows from a file; it is consumed exactly once.
+        If a report dict is passed, its 'sent', 'failed' and 'total' counts are updated while
+        the invitations go out (see _dispatch_batches), so another thread can watch progress.
+        If a DeliveryLedger is passed, every recipient's outcome is recorded in it by position
+        in employee_emails. With only_failed=True, the ledger decides who is sent to: only
+        recipients whose previous attempt failed, so a partial failure can be retried without
+        resending to everyone.
+        Failed recipients are retried up to max_retries times, with exponential backoff between passes.
+        Suppressed addresses are skipped (marked in the ledger and counted in report['suppressed'],
+        but not in 'total'). Returns True when every recipient that wasn't suppressed has been sent to.
+        """
+        self.logger.info("Preparing to send survey invitations for '%s'", survey_details.get('title', 'Survey'))
+        template = InvitationTemplate(survey_details)
+        subject = template.subject
+        if report is None:
+            report = {}
+        recipients = self.invitation_recipients(employee_emails, report, ledger, only_failed)
+        items = ((position, (email, subject, template.render(email, name))) for position, (email, name) in recipients)
+        failures = self._dispatch_batches(self._iter_batches(items), report, ledger, retrying=only_failed)
+        if not only_failed:
+            report["total"] = report["sent"] + report["failed"]
+        self._retry_failures(failures, report, ledger, survey_details)
+
+        self.logger.info("%d/%d survey invitations sent for '%s'.", report["sent"], report["total"], survey_details.get('title', 'Survey'))
+        return report["sent"] == report["total"]
+
+    def invitation_recipients(self, employee_emails, report, ledger=None, only_failed=False):
+        """
+        Lazily yields the (position, (email, name)) recipients send_survey_invitations sends to,
+        after setting report's starting counts. With only_failed, only recipients whose previous
+        attempt failed in ledger are included. Suppressed addresses are skipped, counted in report
+        and marked in ledger.
+        """
+        recipients = enumerate(iter_recipients(employee_emails))
+        if only_failed:
+            if ledger is None:
+                raise ValueError("only_failed needs the ledger of the previous attempt")
+            report.update(total=len(ledger) - ledger.suppressed_count, sent=ledger.sent_count,
+                          failed=ledger.failed_count, suppressed=ledger.suppressed_count)
+            recipients = ((position, recipient) for position, recipient in recipients if ledger.status(position) == FAILED)
+        else:
+            # Known up front for lists; grows while streaming otherwise
+            report.update(total=len(employee_emails) if hasattr(employee_emails, "__len__") else 0, sent=0, failed=0, suppressed=0)
+        if len(self.suppression): # No per-recipient lookups while the list is empty
+            recipients = self._skip_suppressed(recipients, report, ledger, only_failed)
+        return recipients
+
+    def send_to_recipients(self, recipients, survey_details, reminder=False):
+        """
+        Sends invitations (or reminders) to a list of (email, name) recipients the caller has
+        already chosen, e.g. with invitation_recipients. Used by a caller in another process
+        (see MessageBus.register_process_pool), which keeps the survey's delivery ledger itself.
+        Returns {'report': {...}, 'statuses': bytes}: for invitations, one DeliveryLedger status
+        per recipient, in order (empty for reminders).
+        """
+        report = {}
+        if reminder:
+            self.send_survey_reminders(recipients, survey_details, lambda email, token: False, report=report)
+            return {"report": report, "statuses": b""}
+        ledger = DeliveryLedger()
+        self.send_survey_invitations(recipients, survey_details, report=report, ledger=ledger)
+        return {"report": report, "statuses": ledger.to_bytes()}
+
+    def send_survey_reminders(self, employee_emails, survey_details, has_responded, ledger=None, report=None):
+        """
+        Sends a reminder to the recipients of a survey who haven't responded yet.
+        employee_emails is the same audience the invitations went to, and has_responded(email, token)
+        says whether a recipient has answered (by email or by their survey token).
+        With the invitations' DeliveryLedger, only recipients whose invitation was delivered are
+        reminded; suppressed and failed addresses are left alone. The ledger itself isn't changed.
+        report gets 'sent', 'failed', 'suppressed' and 'total' like send_survey_invitations, plus
+        'responded' (recipients skipped because they already answered).
+        Returns True when every reminder was sent.
+        """
+        template = InvitationTemplate(survey_details, reminder=True)
+        subject = template.subject
+        if report is None:
+            report = {}
+        recipients = self.reminder_recipients(employee_emails, survey_details, has_responded, report, ledger, template)
+        items = ((position, (email, subject, template.render(email, name))) for position, (email, name) in recipients)
+        failures = self._dispatch_batches(self._iter_batches(items), report)
+        report["total"] = report["sent"] + report["failed"]
+        self._retry_failures(failures, report, None, survey_details)
+        self.logger.info("%d/%d reminders sent for '%s' (%d already responded).", report["sent"], report["total"],
+                         survey_details.get('title', 'Survey'), report["responded"])
+        return report["sent"] == report["total"]
+
+    def reminder_recipients(self, employee_emails, survey_details, has_responded, report, ledger=None, template=None):
+        """
+        Lazily yields the (position, (email, name)) recipients send_survey_reminders sends to,
+        after setting report's starting counts: with a ledger, only those whose invitation was
+        delivered, minus suppressed addresses and anyone has_responded(email, token) says answered.
+        """
+        template = template or InvitationTemplate(survey_details, reminder=True)
+        report.update(total=0, sent=0, failed=0, suppressed=0, responded=0)
+        recipients = enumerate(iter_recipients(employee_emails))
+        if ledger is not None:
+            status = ledger.status
+            recipients = ((position, recipient) for position, recipient in recipients if status(position) == SENT)
+        if len(self.suppression): # Unsubscribed or bounced since the invitation went out
+            recipients = self._skip_suppressed(recipients, report, None, False)
+
+        def pending():
+            for position, (email, name) in recipients:
+                if has_responded(email, template.token_for(email)):
+                    report["responded"] += 1
+                    continue
+                yield position, (email, name)
+        return pending()
+
+    def _retry_failures(self, failures, report, ledger, survey_details):
+        """Retries failed (position, message) pairs up to max_retries times, with exponential backoff between passes."""
+        for attempt in range(self.max_retries):
+            if not failures:
+                break
+            delay = self.retry_backoff * (2 ** attempt)
+            self.logger.info("Retrying %d failed messages for '%s' in %.1fs.", len(failures), survey_details.get('title', 'Survey'), delay)
+            if delay:
+                time.sleep(delay * random.uniform(0.8, 1.2)) # Jitter, so retries of parallel surveys don't line up
+            failures = self._dispatch_batches(self._iter_batches(failures), report, ledger, retrying=True)
+
+    def _skip_suppressed(self, recipients, report, ledger, previously_failed):
+        """Filters suppressed addresses out of (position, (email, name)) pairs, accounting for each one skipped."""
+        suppression = self.suppression
+        for position, recipient in recipients:
+            if recipient[0] in suppression:
+                report["suppressed"] += 1
+                report["total"] = max(0, report["total"] - 1)
+                if previously_failed:
+                    report["failed"] -= 1
+                if ledger is not None:
+                    ledger.mark(position, SUPPRESSED)
+                continue
+            yield position, recipient
 
     def handle_incoming_email(self, email_data):
         """
-        Simulates handling an incoming email (e.g., an out-of-office reply).
+        Handles one incoming email, given as a dict with 'from', 'subject' and optional 'body'
+        and 'headers'. It is classified like the bulk inbound pipeline (see inbound.classify_message):
+        hard bounces and unsubscribes add the affected addresses to the suppression list.
+        """
+        self.logger.info("Received incoming email: From='%s', Subject='%s'", email_data.get('from'), email_data.get('subject'))
+        category, addresses = classify_email_data(email_data)
+        if category == "out_of_office":
+            self.logger.info("Detected Out Of Office reply from %s.", email_data.get('from'))
+        suppressed = []
+        if category in SUPPRESSING_CATEGORIES:
+            suppressed = [address for address in addresses if address and self.suppression.add(address, category)]
+            self.suppression.flush()
+            if suppressed:
+                self.logger.info("Suppressed %s after %s.", ", ".join(suppressed), category)
+        return {"status": "processed", "category": category, "suppressed": suppressed}
+
+    def ingest_inbound_mail(self, path, workers=None):
+        """
+        Bulk-processes inbound mail from an mbox file, a Maildir or a spool directory of message
+        files (see InboundProcessor), adding hard bounces and unsubscribes to the suppression list.
+        """
+        return InboundProcessor(self.suppression, workers=workers).ingest(path)
+
+    def shutdown(self):
+        """
+        Stops the worker pool and closes pooled transport connections.
         """
-        print(f"[{self.name}] Received incoming email: From='{email_data.get('from')}', Subject='{email_data.get('subject')}'")
-        # Basic logic: if "out of office" in subject, log it.
-        if "out of office" in email_data.get('subject', '').lower():
-            print(f"[{self.name}] Detected Out Of Office reply from {email_data.get('from')}.")
-            # Potentially update employee status or notify admin
-        return {"status": "processed"}
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self.transport.close()
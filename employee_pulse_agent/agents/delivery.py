@@ -0,0 +1,165 @@
+# employee_pulse_survey_project/agents/delivery.py
+
+import os
+import threading
+import time
+from collections import Counter
+
+# Delivery status of one recipient, stored as a single byte in DeliveryLedger.
+PENDING = 0
+SENT = 1
+FAILED = 2
+SUPPRESSED = 3 # Skipped: the address is on the suppression list
+
+
+class DeliveryLedger:
+    """
+    Per-recipient delivery status for one survey (pending, sent, failed or suppressed), as one
+    byte per recipient indexed by the recipient's position in the audience (a million recipients take 1 MB).
+    Counts per status are kept up to date, so progress never needs a scan; failed_positions()
+    is the only walk, and it runs at C speed over the bytearray.
+    """
+    def __init__(self, statuses=b""):
+        self._statuses = bytearray(statuses)
+        self._counts = Counter(self._statuses)
+
+    def __len__(self):
+        return len(self._statuses)
+
+    def mark(self, position, status):
+        statuses = self._statuses
+        if position >= len(statuses):
+            # Streaming audiences grow the ledger as positions are reached.
+            self._counts[PENDING] += position + 1 - len(statuses)
+            statuses.extend(bytes(position + 1 - len(statuses)))
+        self._counts[statuses[position]] -= 1
+        self._counts[status] += 1
+        statuses[position] = status
+
+    def status(self, position):
+        return self._statuses[position] if position < len(self._statuses) else PENDING
+
+    def count(self, status):
+        return self._counts[status]
+
+    @property
+    def sent_count(self):
+        return self._counts[SENT]
+
+    @property
+    def failed_count(self):
+        return self._counts[FAILED]
+
+    @property
+    def suppressed_count(self):
+        return self._counts[SUPPRESSED]
+
+    def failed_positions(self):
+        """Positions of recipients whose last attempt failed, in audience order."""
+        statuses = self._statuses
+        positions = []
+        position = statuses.find(FAILED)
+        while position != -1:
+            positions.append(position)
+            position = statuses.find(FAILED, position + 1)
+        return positions
+
+    def to_bytes(self):
+        return bytes(self._statuses)
+
+    def summary(self):
+        return {"recipients": len(self._statuses), "sent": self.sent_count, "failed": self.failed_count,
+                "suppressed": self.suppressed_count, "pending": self._counts[PENDING]}
+
+
+class TokenBucket:
+    """
+    Allows rate operations per second on average, with bursts of up to capacity.
+    acquire() never polls: a caller that finds too few tokens takes them anyway (the balance
+    goes negative) and sleeps exactly as long as the refill takes, so waiters are served in order.
+    """
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, n=1):
+        """Takes n tokens and returns how many seconds the caller must wait before using them."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= n
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self, n=1):
+        wait = self.reserve(n)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class DomainThrottle:
+    """
+    Rate limits for outgoing mail: an optional overall rate plus a token bucket per recipient
+    domain (domain_rates overrides the default domain_rate for named domains).
+    A domain's bucket is created the first time mail goes to it.
+    """
+    def __init__(self, rate=None, domain_rate=None, domain_rates=None, burst=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.domain_rate = domain_rate
+        self.domain_rates = {d.lower(): r for d, r in (domain_rates or {}).items()}
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._overall = TokenBucket(rate, burst, clock, sleep) if rate else None
+        self._buckets = {} # domain: TokenBucket
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, share=1.0):
+        """
+        Builds a throttle from PULSE_SEND_RATE (messages/second overall), PULSE_DOMAIN_RATE
+        (per domain) and PULSE_DOMAIN_RATES ('example.com=50,gmail.com=10').
+        share scales every limit (and PULSE_SEND_BURST) down, e.g. to 1/N for each of N sending
+        processes, so together they stay within the configured rates.
+        Returns None when no limit is configured.
+        """
+        rate = float(os.getenv("PULSE_SEND_RATE") or 0) * share or None
+        domain_rate = float(os.getenv("PULSE_DOMAIN_RATE") or 0) * share or None
+        domain_rates = {}
+        for item in (os.getenv("PULSE_DOMAIN_RATES") or "").split(","):
+            domain, _, value = item.partition("=")
+            if domain.strip() and value.strip():
+                domain_rates[domain.strip()] = float(value) * share
+        if not (rate or domain_rate or domain_rates):
+            return None
+        burst = float(os.getenv("PULSE_SEND_BURST") or 0) * share or None
+        return cls(rate=rate, domain_rate=domain_rate, domain_rates=domain_rates,
+                   burst=max(1.0, burst) if burst else None)
+
+    def _bucket(self, domain):
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            rate = self.domain_rates.get(domain, self.domain_rate)
+            if not rate:
+                return None
+            with self._lock:
+                bucket = self._buckets.setdefault(domain, TokenBucket(rate, self.burst, self._clock, self._sleep))
+        return bucket
+
+    def wait_for(self, recipients):
+        """Blocks until the given recipient addresses may be sent to; returns the seconds waited."""
+        wait = self._overall.reserve(len(recipients)) if self._overall is not None else 0.0
+        domains = Counter(email.rpartition("@")[2].lower() for email in recipients)
+        for domain, n in domains.items():
+            bucket = self._bucket(domain)
+            if bucket is not None:
+                wait = max(wait, bucket.reserve(n))
+        if wait > 0:
+            self._sleep(wait)
+        return wait
@@ -0,0 +1,294 @@
+# employee_pulse_survey_project/agents/directory.py
+
+import csv
+import re
+from bisect import bisect_left, bisect_right
+from datetime import date
+from functools import lru_cache
+
+# Fields indexed when the directory is loaded; other columns are indexed on first use.
+INDEXED_FIELDS = ("department", "location", "manager")
+# Fields that don't make sense to select on.
+UNINDEXED_FIELDS = ("name", "hire_date", "tenure_years", "tenure")
+
+
+class SelectorError(ValueError):
+    """Raised for an audience selector that can't be parsed or refers to an unknown field."""
+
+
+class EmployeeDirectory:
+    """
+    An in-memory employee directory, indexed for audience selection.
+    Each employee is a dict with 'email' and optional 'name', 'department', 'location',
+    'manager' (the manager's email) and 'hire_date' (YYYY-MM-DD) or 'tenure_years'.
+    Emails are normalized (trimmed, lower-cased) and deduplicated (the first row wins).
+    Selectors such as "department=Engineering AND location=Pune" resolve against the indexes
+    to recipient positions (see select()); resolutions are memoized in an LRU cache.
+    """
+    def __init__(self, employees, today=None, cache_size=256):
+        today = today or date.today()
+        self._employees = []
+        self._positions = {} # email: position
+        self._index = {field: {} for field in INDEXED_FIELDS} # field: {lower-cased value: [position, ...]}
+        self._reports = {} # manager email: [position of each direct report]
+        tenures = []
+        for employee in employees:
+            email = (employee.get("email") or "").strip().lower()
+            if not email or email in self._positions:
+                continue
+            record = {k: (v.strip() if isinstance(v, str) else v) for k, v in employee.items() if v not in (None, "")}
+            record["email"] = email
+            if record.get("manager"):
+                record["manager"] = record["manager"].lower()
+            position = len(self._employees)
+            self._positions[email] = position
+            self._employees.append(record)
+            for field in INDEXED_FIELDS:
+                value = record.get(field)
+                if value is not None:
+                    self._index[field].setdefault(str(value).lower(), []).append(position)
+            if record.get("manager"):
+                self._reports.setdefault(record["manager"], []).append(position)
+            tenure = _tenure_years(record, today)
+            if tenure is not None:
+                tenures.append((tenure, position))
+        tenures.sort()
+        self._tenure_values = [t for t, _ in tenures] # Sorted, for range queries by bisection
+        self._tenure_positions = [p for _, p in tenures]
+        self._resolve_cached = lru_cache(maxsize=cache_size)(self._resolve)
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        with open(path, newline="", encoding="utf-8") as f:
+            return cls(csv.DictReader(f), **kwargs)
+
+    @classmethod
+    def from_sqlite(cls, path, table="employees", **kwargs):
+        import sqlite3
+        conn = sqlite3.connect(path)
+        try:
+            conn.row_factory = sqlite3.Row
+            if not table.isidentifier():
+                raise ValueError(f"Invalid table name '{table}'")
+            rows = [dict(row) for row in conn.execute(f"SELECT * FROM {table}")]
+        finally:
+            conn.close()
+        return cls(rows, **kwargs)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Loads a .csv file, or a SQLite database (.db, .sqlite, .sqlite3) with an 'employees' table."""
+        if path.endswith(".csv"):
+            return cls.from_csv(path, **kwargs)
+        return cls.from_sqlite(path, **kwargs)
+
+    def __len__(self):
+        return len(self._employees)
+
+    def __contains__(self, email):
+        return email.strip().lower() in self._positions
+
+    def get(self, email):
+        position = self._positions.get(email.strip().lower())
+        return self._employees[position] if position is not None else None
+
+    # --- Selection ---
+
+    def select(self, selector):
+        """
+        Returns the positions (in directory order) of the employees matching a selector.
+
+        A selector is a boolean expression of comparisons joined by AND / OR (AND binds tighter),
+        with NOT and parentheses, e.g.
+            department=Engineering AND location=Pune
+            department IN (Sales, Marketing) AND NOT location="New York"
+            reports_to=cto@example.com OR tenure>=5
+        Fields: any directory column (matched case-insensitively with = or !=), plus
+        'reports_to' (everyone in a manager's reporting chain) and 'tenure' (years; =, !=, <, <=, >, >=).
+        An empty selector selects everyone. Raises SelectorError for invalid selectors.
+        """
+        return self._resolve_cached(" ".join((selector or "").split()))
+
+    def count(self, selector):
+        return len(self.select(selector))
+
+    def recipients(self, selector):
+        """Yields (email, name) for every employee matching the selector, in directory order."""
+        employees = self._employees
+        for position in self.select(selector):
+            employee = employees[position]
+            yield employee["email"], employee.get("name")
+
+    def cache_info(self):
+        return self._resolve_cached.cache_info()
+
+    def _resolve(self, selector):
+        if not selector:
+            return tuple(range(len(self._employees)))
+        parser = _SelectorParser(selector, self)
+        return tuple(sorted(parser.parse()))
+
+    def _everyone(self):
+        return set(range(len(self._employees)))
+
+    def _equals(self, field, value):
+        if field == "email":
+            position = self._positions.get(value.lower())
+            return {position} if position is not None else set()
+        if field == "reports_to":
+            return self._reporting_chain(value.lower())
+        if field in UNINDEXED_FIELDS:
+            raise SelectorError(f"Can't select on '{field}'")
+        index = self._index.get(field)
+        if index is None:
+            index = self._build_index(field)
+        return set(index.get(value.lower(), ()))
+
+    def _build_index(self, field):
+        index = {}
+        for position, employee in enumerate(self._employees):
+            value = employee.get(field)
+            if value is not None:
+                index.setdefault(str(value).lower(), []).append(position)
+        if not index:
+            raise SelectorError(f"Unknown field '{field}'")
+        self._index[field] = index
+        return index
+
+    def _reporting_chain(self, manager):
+        """Everyone who reports to manager, directly or indirectly."""
+        found = set()
+        pending = [manager]
+        while pending:
+            for position in self._reports.get(pending.pop(), ()):
+                if position not in found:
+                    found.add(position)
+                    pending.append(self._employees[position]["email"])
+        return found
+
+    def _tenure(self, op, value):
+        try:
+            years = float(value)
+        except ValueError:
+            raise SelectorError(f"tenure needs a number of years, not '{value}'")
+        values, positions = self._tenure_values, self._tenure_positions
+        if op == "=":
+            return set(positions[bisect_left(values, years):bisect_right(values, years)])
+        if op == "!=":
+            return set(positions) - set(positions[bisect_left(values, years):bisect_right(values, years)])
+        start, end = {
+            ">": (bisect_right(values, years), len(values)),
+            ">=": (bisect_left(values, years), len(values)),
+            "<": (0, bisect_left(values, years)),
+            "<=": (0, bisect_right(values, years)),
+        }[op]
+        return set(positions[start:end])
+
+    def compare(self, field, op, values):
+        """Positions where field op value holds; several values (IN) match any of them."""
+        if field == "tenure":
+            if len(values) > 1:
+                raise SelectorError("tenure can't be used with IN")
+            return self._tenure(op, values[0])
+        if op not in ("=", "!="):
+            raise SelectorError(f"'{op}' only works with tenure")
+        matched = set()
+        for value in values:
+            matched |= self._equals(field, value)
+        return self._everyone() - matched if op == "!=" else matched
+
+
+def _tenure_years(record, today):
+    if record.get("tenure_years") is not None:
+        try:
+            return float(record["tenure_years"])
+        except ValueError:
+            return None
+    if record.get("hire_date"):
+        try:
+            hired = date.fromisoformat(str(record["hire_date"])[:10])
+        except ValueError:
+            return None
+        return round((today - hired).days / 365.25, 2)
+    return None
+
+
+class _SelectorParser:
+    """Recursive-descent parser for audience selectors; evaluates straight to position sets."""
+    _KEYWORD = re.compile(r"\s*(AND|OR|NOT)\b\s*", re.IGNORECASE)
+    _FIELD = re.compile(r"\s*([A-Za-z_][A-Za-z0-9_]*)\s*(>=|<=|!=|=|>|<|\bIN\b)\s*", re.IGNORECASE)
+    _QUOTED = re.compile(r"\s*(?:\"([^\"]*)\"|'([^']*)')\s*")
+    _BARE = re.compile(r"\s*(.*?)\s*(?=\)|,|\s+(?:AND|OR)\b|$)", re.IGNORECASE)
+
+    def __init__(self, text, directory):
+        self.text = text
+        self.pos = 0
+        self.directory = directory
+
+    def parse(self):
+        result = self._expression()
+        if self.pos != len(self.text):
+            raise SelectorError(f"Unexpected '{self.text[self.pos:]}' in selector")
+        return result
+
+    def _keyword(self, word):
+        match = self._KEYWORD.match(self.text, self.pos)
+        if match and match.group(1).upper() == word:
+            self.pos = match.end()
+            return True
+        return False
+
+    def _char(self, char):
+        rest = self.text[self.pos:]
+        stripped = rest.lstrip()
+        if stripped.startswith(char):
+            self.pos += len(rest) - len(stripped) + 1
+            return True
+        return False
+
+    def _expression(self):
+        result = self._term()
+        while self._keyword("OR"):
+            result = result | self._term()
+        return result
+
+    def _term(self):
+        result = self._factor()
+        while self._keyword("AND"):
+            result = result & self._factor()
+        return result
+
+    def _factor(self):
+        if self._keyword("NOT"):
+            return self.directory._everyone() - self._factor()
+        if self._char("("):
+            result = self._expression()
+            if not self._char(")"):
+                raise SelectorError("Missing ')' in selector")
+            return result
+        match = self._FIELD.match(self.text, self.pos)
+        if not match:
+            raise SelectorError(f"Expected a comparison like department=Engineering at '{self.text[self.pos:]}'")
+        self.pos = match.end()
+        field, op = match.group(1).lower(), match.group(2).upper()
+        if op == "IN":
+            if not self._char("("):
+                raise SelectorError("IN needs a parenthesised list of values")
+            values = [self._value()]
+            while self._char(","):
+                values.append(self._value())
+            if not self._char(")"):
+                raise SelectorError("Missing ')' after IN list")
+            return self.directory.compare(field, "=", values)
+        return self.directory.compare(field, op, [self._value()])
+
+    def _value(self):
+        match = self._QUOTED.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            return match.group(1) if match.group(1) is not None else match.group(2)
+        match = self._BARE.match(self.text, self.pos)
+        if not match.group(1):
+            raise SelectorError(f"Missing value at '{self.text[self.pos:]}'")
+        self.pos = match.end()
+        return match.group(1)
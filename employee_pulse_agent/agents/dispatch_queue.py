@@ -0,0 +1,157 @@
+# employee_pulse_survey_project/agents/dispatch_queue.py
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .logging_config import get_logger
+
+
+class DispatchJob:
+    """
+    One survey's invitation run. state moves from 'queued' to 'sending' to 'sent' or 'send_failed';
+    report holds the live sent/failed/total counts, written by the send loop as batches complete.
+    """
+    def __init__(self, survey_id):
+        self.survey_id = survey_id
+        self.state = "queued"
+        self.report = {"sent": 0, "failed": 0, "suppressed": 0, "total": 0}
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self.future = None
+
+    @property
+    def done(self):
+        return self.finished_at is not None
+
+    def progress(self):
+        report = self.report
+        return {
+            "state": self.state,
+            "sent": report.get("sent", 0),
+            "failed": report.get("failed", 0),
+            "suppressed": report.get("suppressed", 0),
+            "total": report.get("total", 0),
+            "elapsed_seconds": round((self.finished_at or time.time()) - self.started_at, 3) if self.started_at else None
+        }
+
+    def wait(self, timeout=None):
+        """Blocks until the job has finished (or timeout expires); returns True if it finished."""
+        if self.future is None:
+            return self.done
+        try:
+            self.future.result(timeout=timeout)
+        except Exception:
+            pass
+        return self.done
+
+
+class DispatchQueue:
+    """
+    Runs survey dispatch jobs in the background, so approving a survey doesn't wait for its emails.
+    Up to max_concurrent jobs run at once, and the rest wait in FIFO order. Running jobs share the
+    CommunicationAgent's send pool. Each job keeps only a bounded number of batches in flight there,
+    so one large survey can't crowd out the others.
+    Only the max_finished most recently finished jobs are kept for get() and progress reports;
+    queued and sending jobs are always kept.
+    """
+    def __init__(self, max_concurrent=4, max_finished=1000, name="DispatchQueue"):
+        self.max_concurrent = max_concurrent
+        self.max_finished = max_finished
+        self.logger = get_logger(name)
+        self._jobs = {} # survey_id: latest DispatchJob
+        self._finished = OrderedDict() # Keys of finished jobs, oldest first, for pruning
+        # Job counts, kept current for cheap reads ('sent' and 'send_failed' include pruned jobs)
+        self._states = {"queued": 0, "sending": 0, "sent": 0, "send_failed": 0}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="dispatch")
+
+    def submit(self, survey_id, run, on_start=None, on_finish=None):
+        """
+        Queues run(job) for a survey and returns the DispatchJob immediately.
+        run must return True when every recipient was sent to; it may update job.report as it goes.
+        on_start(job) and on_finish(job) are called on the worker thread around it.
+        Returns the existing job instead if one is already queued or sending for this survey.
+        """
+        with self._lock:
+            existing = self._jobs.get(survey_id)
+            if existing is not None and not existing.done:
+                return existing
+            job = self._jobs[survey_id] = DispatchJob(survey_id)
+            self._finished.pop(survey_id, None)
+            self._states["queued"] += 1
+            job.future = self._executor.submit(self._run, job, run, on_start, on_finish)
+        self.logger.info("Queued dispatch for survey %s.", survey_id)
+        return job
+
+    def _run(self, job, run, on_start, on_finish):
+        self._move(job, "sending")
+        job.started_at = time.time()
+        try:
+            if on_start is not None:
+                on_start(job)
+            success = run(job)
+        except Exception as exc:
+            self.logger.exception("Dispatch for survey %s failed.", job.survey_id)
+            job.error = str(exc)
+            success = False
+        self._move(job, "sent" if success else "send_failed")
+        job.finished_at = time.time()
+        self._prune(job)
+        if on_finish is not None:
+            try:
+                on_finish(job)
+            except Exception:
+                self.logger.exception("Finishing dispatch for survey %s failed.", job.survey_id)
+        return success
+
+    def _move(self, job, state):
+        with self._lock:
+            self._states[job.state] -= 1
+            self._states[state] += 1
+            job.state = state
+
+    def _prune(self, job):
+        with self._lock:
+            if self._jobs.get(job.survey_id) is not job:
+                return
+            self._finished[job.survey_id] = None
+            while len(self._finished) > self.max_finished:
+                survey_id, _ = self._finished.popitem(last=False)
+                old = self._jobs.get(survey_id)
+                if old is not None and old.done:
+                    del self._jobs[survey_id]
+
+    def get(self, survey_id):
+        return self._jobs.get(survey_id)
+
+    def pending_count(self):
+        """Number of jobs queued or sending."""
+        with self._lock:
+            return self._states["queued"] + self._states["sending"]
+
+    def state_counts(self):
+        """Jobs by state: waiting ('queued'), in flight ('sending') and finished ('sent', 'send_failed')."""
+        with self._lock:
+            return dict(self._states)
+
+    def wait(self, survey_id, timeout=None):
+        job = self._jobs.get(survey_id)
+        return job.wait(timeout) if job is not None else True
+
+    def wait_all(self, timeout=None):
+        """Blocks until every job submitted so far has finished; returns False on timeout."""
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            remaining = None if deadline is None else max(0, deadline - time.time())
+            if not job.wait(remaining):
+                return False
+        return True
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
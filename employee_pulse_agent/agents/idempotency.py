@@ -0,0 +1,157 @@
+# employee_pulse_survey_project/agents/idempotency.py
+
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from .logging_config import get_logger
+
+_NO_RESULT = object() # A call still running, or one that failed; None is a valid result
+
+
+class _Entry:
+    __slots__ = ("result", "expires", "ready")
+
+    def __init__(self):
+        self.result = _NO_RESULT
+        self.expires = None
+        self.ready = threading.Event()
+
+
+class IdempotencyCache:
+    """
+    A bounded result cache for operations that must not run twice for the same request.
+    Entries are keyed by operation name plus either an explicit idempotency key or the call's
+    arguments. They expire ttl seconds after the call completes, and the least recently used
+    completed entry is evicted beyond max_entries. Each caller gets its own copy of a cached result.
+    A duplicate that arrives while the first call is still running waits for that call's
+    result instead of starting a second run.
+    Error results ({"status": "error", ...}) and exceptions are not cached, so a failed call
+    can be retried.
+    """
+    def __init__(self, max_entries=1024, ttl=600.0, clock=time.monotonic, name="IdempotencyCache"):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict() # key: _Entry, least recently used first
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "waits": 0, "evictions": 0, "expirations": 0, "uncached_errors": 0}
+        self.logger = get_logger(name)
+
+    @staticmethod
+    def make_key(operation, arguments=None, idempotency_key=None):
+        """Builds a cache key from an explicit idempotency key, or from a canonical encoding of the arguments."""
+        if idempotency_key:
+            return f"{operation}:key:{idempotency_key}"
+        encoded = json.dumps(arguments, sort_keys=True, default=str, separators=(",", ":"))
+        return f"{operation}:args:{hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()}"
+
+    def run(self, key, func):
+        """Returns the cached result for key, or calls func() once and caches what it returns."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires is not None and entry.expires <= self._clock():
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                owner = False
+                self._stats["hits" if entry.ready.is_set() else "waits"] += 1
+            else:
+                entry = self._entries[key] = _Entry()
+                owner = True
+                self._stats["misses"] += 1
+                if len(self._entries) > self.max_entries:
+                    self._evict_locked()
+
+        if not owner:
+            entry.ready.wait()
+            if entry.result is not _NO_RESULT:
+                self.logger.info("Duplicate call %s answered from the idempotency cache.", key)
+                return copy.deepcopy(entry.result)
+            return self.run(key, func) # The first call failed and was not cached; run it now
+
+        try:
+            result = func()
+        except BaseException:
+            self._discard(key, entry)
+            raise
+        if isinstance(result, dict) and result.get("status") == "error":
+            self._discard(key, entry)
+            with self._lock:
+                self._stats["uncached_errors"] += 1
+            return result
+        entry.result = copy.deepcopy(result) # The caller may change the result it gets back
+        entry.expires = self._clock() + self.ttl
+        entry.ready.set()
+        return result
+
+    def _evict_locked(self):
+        """
+        Evicts least recently used entries down to max_entries. Calls still running are skipped:
+        dropping one would let a duplicate start a second run. Until they finish the cache may
+        hold more than max_entries.
+        """
+        excess = len(self._entries) - self.max_entries
+        evicted = []
+        for key, entry in self._entries.items():
+            if len(evicted) == excess:
+                break
+            if entry.ready.is_set():
+                evicted.append(key)
+        for key in evicted:
+            del self._entries[key]
+        self._stats["evictions"] += len(evicted)
+
+    def _discard(self, key, entry):
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+        entry.ready.set() # Wakes waiters; with no result they run the call themselves
+
+    def call(self, func, args=(), kwargs=None, operation=None, key_param="idempotency_key"):
+        """
+        Calls func(*args, **kwargs) through the cache. The call is keyed on operation (default:
+        the function's name) and the key_param argument when one is given, else on all bound arguments.
+        """
+        kwargs = kwargs or {}
+        bound = _signature(func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        explicit_key = arguments.pop(key_param, None)
+        key = self.make_key(operation or func.__name__, arguments, explicit_key)
+        return self.run(key, lambda: func(*args, **kwargs))
+
+    def wrap(self, operation=None, key_param="idempotency_key"):
+        """
+        Decorator form of call(). functools.wraps keeps the signature and docstring,
+        so tool schemas generated from the function are unchanged.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                return self.call(func, args, kwargs, operation, key_param)
+            return wrapper
+        return decorator
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries), max_entries=self.max_entries, ttl=self.ttl)
+        lookups = stats["hits"] + stats["misses"] + stats["waits"]
+        stats["hit_rate"] = round((stats["hits"] + stats["waits"]) / lookups, 4) if lookups else None
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _signature(func):
+    return inspect.signature(func)
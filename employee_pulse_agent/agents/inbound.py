@@ -0,0 +1,255 @@
+# employee_pulse_survey_project/agents/inbound.py
+
+import os
+import re
+import threading
+from collections import Counter, deque
+from email.parser import BytesParser
+from email.policy import compat32
+from email.utils import parseaddr
+
+from .logging_config import get_logger
+
+# Message categories. Hard bounces and unsubscribes suppress the address; the others don't.
+BOUNCE = "bounce"
+SOFT_BOUNCE = "soft_bounce"
+OUT_OF_OFFICE = "out_of_office"
+UNSUBSCRIBE = "unsubscribe"
+REPLY = "reply"
+SUPPRESSING_CATEGORIES = (BOUNCE, UNSUBSCRIBE)
+
+OUT_OF_OFFICE_MARKERS = ("out of office", "out of the office", "automatic reply", "auto-reply", "autoreply", "on vacation",
+                         "away from the office", "away from my desk")
+
+_header_parser = BytesParser(policy=compat32)
+_FINAL_RECIPIENT = re.compile(rb"^Final-Recipient:\s*rfc822;\s*<?([^\s>]+)", re.IGNORECASE | re.MULTILINE)
+_DSN_STATUS = re.compile(rb"^Status:\s*([245])\.\d{1,3}\.\d{1,3}", re.IGNORECASE | re.MULTILINE)
+_HEADER_END = re.compile(rb"\r?\n\r?\n")
+_REPLY_PREFIX = re.compile(r"^(?:(?:re|fwd?|aw|sv)\s*:\s*)+", re.IGNORECASE)
+# An unsubscribe request is a subject or body line that says just that, e.g. "Unsubscribe" or
+# "Please unsubscribe me." Mentioning the word in a sentence doesn't count.
+_UNSUBSCRIBE_COMMAND = re.compile(r"^(?:please\s+)?unsubscribe(?:\s+me)?(?:\s+please)?[\s.!]*$", re.IGNORECASE)
+
+
+def classify_message(raw):
+    """
+    Classifies one raw RFC 822 message (bytes) as a bounce, soft bounce, out-of-office reply,
+    unsubscribe request or ordinary reply. Returns (category, [affected addresses]): the failed
+    recipients for bounces, otherwise the sender.
+    Only the headers are parsed; delivery status fields are found with regexes over the raw bytes.
+    """
+    headers = _header_parser.parsebytes(raw, headersonly=True)
+    sender = parseaddr(headers.get("From") or "")[1].lower()
+    subject = str(headers.get("Subject") or "").lower()
+    content_type = str(headers.get("Content-Type") or "").lower()
+    failed_header = headers.get("X-Failed-Recipients")
+
+    if "report-type=delivery-status" in content_type or failed_header or sender.startswith(("mailer-daemon@", "postmaster@")):
+        if failed_header:
+            recipients = [a.strip().lower() for a in str(failed_header).split(",") if a.strip()]
+        else:
+            recipients = [a.decode("ascii", "replace").lower() for a in _FINAL_RECIPIENT.findall(raw)]
+        status = _DSN_STATUS.search(raw)
+        # Without a status code, treat the bounce as permanent only when it says so.
+        if status is not None:
+            hard = status.group(1) == b"5"
+        else:
+            hard = any(word in subject for word in ("undeliverable", "failure", "failed", "returned"))
+        return (BOUNCE if hard else SOFT_BOUNCE), recipients
+
+    auto_submitted = str(headers.get("Auto-Submitted") or "no").lower()
+    if (auto_submitted != "no" or headers.get("X-Autoreply") or headers.get("X-Autorespond")
+            or any(marker in subject for marker in OUT_OF_OFFICE_MARKERS)):
+        return OUT_OF_OFFICE, [sender]
+
+    if _UNSUBSCRIBE_COMMAND.match(_REPLY_PREFIX.sub("", subject.strip())):
+        return UNSUBSCRIBE, [sender]
+    parts = _HEADER_END.split(raw, 1)
+    if len(parts) == 2 and b"unsubscribe" in parts[1][:500].lower():
+        # Only the reply's own lines, not quoted text (our invitation may mention unsubscribing)
+        for line in parts[1][:500].decode("utf-8", "replace").splitlines():
+            line = line.strip()
+            if line and not line.startswith(">") and _UNSUBSCRIBE_COMMAND.match(line):
+                return UNSUBSCRIBE, [sender]
+    return REPLY, [sender]
+
+
+def classify_email_data(email_data):
+    """
+    classify_message() for an already-parsed message dict with 'from', 'subject' and
+    optional 'body' and 'headers' keys (as passed to CommunicationAgent.handle_incoming_email).
+    """
+    lines = [f"From: {email_data.get('from') or ''}", f"Subject: {email_data.get('subject') or ''}"]
+    lines.extend(f"{name}: {value}" for name, value in (email_data.get("headers") or {}).items())
+    raw = ("\r\n".join(lines) + "\r\n\r\n" + (email_data.get("body") or "")).encode("utf-8", "replace")
+    return classify_message(raw)
+
+
+def _classify_chunk(items):
+    """
+    Worker entry point: classifies raw messages or message file paths.
+    Returns (category counts, [(category, address), ...] for suppressing categories only),
+    so only the small result crosses back from the worker process.
+    """
+    counts = Counter()
+    suppress = []
+    for item in items:
+        if isinstance(item, str):
+            try:
+                with open(item, "rb") as f:
+                    item = f.read()
+            except OSError:
+                counts["unreadable"] += 1
+                continue
+        try:
+            category, addresses = classify_message(item)
+        except Exception:
+            counts["unparseable"] += 1
+            continue
+        counts[category] += 1
+        if category in SUPPRESSING_CATEGORIES:
+            suppress.extend((category, address) for address in addresses if address)
+    return counts, suppress
+
+
+def iter_mbox_messages(path):
+    """
+    Streams raw messages (bytes) out of an mbox file, split on 'From ' separator lines.
+    '>From ' escaping is left alone; it doesn't affect classification.
+    """
+    lines = []
+    with open(path, "rb") as f:
+        for line in f:
+            if line.startswith(b"From ") and (not lines or lines[-1] in (b"\n", b"\r\n")):
+                if lines:
+                    yield b"".join(lines)
+                lines = []
+                continue # The separator line isn't part of the message
+            lines.append(line)
+    if lines:
+        yield b"".join(lines)
+
+
+def iter_message_files(path):
+    """
+    Yields the paths of the messages in a Maildir (its new/ and cur/ folders) or, for any other
+    directory, of every regular file in it (a spool directory of .eml files).
+    """
+    folders = [os.path.join(path, sub) for sub in ("new", "cur") if os.path.isdir(os.path.join(path, sub))] or [path]
+    for folder in folders:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith("."):
+                    yield entry.path
+
+
+class SuppressionList:
+    """
+    Addresses that must not be emailed again (hard bounces, unsubscribes), as a set of
+    normalized addresses, so checking a recipient is one hash lookup.
+    With a path, the list is loaded from that file at startup and new entries are appended
+    to it ('address<TAB>reason' per line) when flush() is called.
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self._reasons = {} # address: reason
+        self._unsaved = []
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    address, _, reason = line.rstrip("\n").partition("\t")
+                    if address:
+                        self._reasons[address] = reason or None
+
+    def __contains__(self, email):
+        return email.strip().lower() in self._reasons
+
+    def __len__(self):
+        return len(self._reasons)
+
+    def reason(self, email):
+        return self._reasons.get(email.strip().lower())
+
+    def add(self, email, reason=None):
+        """Adds an address; returns True if it wasn't already suppressed."""
+        address = email.strip().lower()
+        if not address or address in self._reasons:
+            return False
+        with self._lock:
+            if address in self._reasons:
+                return False
+            self._reasons[address] = reason
+            self._unsaved.append((address, reason))
+        return True
+
+    def flush(self):
+        """Appends entries added since the last flush to the suppression file."""
+        with self._lock:
+            unsaved, self._unsaved = self._unsaved, []
+        if self.path and unsaved:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(f"{address}\t{reason or ''}\n" for address, reason in unsaved)
+
+    def counts(self):
+        return dict(Counter(self._reasons.values()))
+
+
+class InboundProcessor:
+    """
+    Bulk ingestion of inbound mail (replies, bounces, out-of-office notices, unsubscribes)
+    from an mbox file, a Maildir or a spool directory of message files.
+    Messages are classified in chunks across a process pool (parsing is CPU-bound, so threads
+    wouldn't help). At most 2 chunks per worker are in flight, so memory stays flat however
+    large the mailbox is. Hard bounces and unsubscribes go into the SuppressionList.
+    """
+    def __init__(self, suppression, workers=None, chunk_size=500, name="InboundProcessor"):
+        self.suppression = suppression
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self.logger = get_logger(name)
+
+    def ingest(self, path):
+        """
+        Classifies every message at path (a directory is read as a Maildir or spool directory,
+        a file as mbox) and returns {'messages': n, 'categories': {...}, 'newly_suppressed': n}.
+        """
+        if os.path.isdir(path):
+            items = iter_message_files(path) # Workers read the files themselves
+        else:
+            items = iter_mbox_messages(path)
+        counts, newly_suppressed = Counter(), 0
+        for chunk_counts, suppress in self._classify_chunks(self._chunks(items)):
+            counts.update(chunk_counts)
+            for category, address in suppress:
+                newly_suppressed += self.suppression.add(address, category)
+        self.suppression.flush()
+        result = {"messages": sum(counts.values()), "categories": dict(counts), "newly_suppressed": newly_suppressed}
+        self.logger.info("Ingested %d inbound messages from %s: %s; %d addresses newly suppressed.",
+                         result["messages"], path, result["categories"], newly_suppressed)
+        return result
+
+    def _chunks(self, items):
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _classify_chunks(self, chunks):
+        if self.workers <= 1:
+            for chunk in chunks:
+                yield _classify_chunk(chunk)
+            return
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            in_flight = deque()
+            for chunk in chunks:
+                in_flight.append(pool.submit(_classify_chunk, chunk))
+                if len(in_flight) >= self.workers * 2:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
@@ -0,0 +1,71 @@
+# employee_pulse_survey_project/agents/invitation_template.py
+
+import base64
+import hashlib
+import os
+import secrets
+import threading
+
+# Key for the per-recipient link tokens. Set PULSE_LINK_SECRET so links stay valid across restarts.
+# Read on first use rather than at import, so a PULSE_LINK_SECRET loaded from .env is honoured.
+_link_secret = None
+_link_secret_lock = threading.Lock()
+
+
+def link_secret():
+    """Returns the link token key: PULSE_LINK_SECRET, or a random key kept for the life of the process."""
+    global _link_secret
+    if _link_secret is None:
+        with _link_secret_lock:
+            if _link_secret is None:
+                _link_secret = os.getenv("PULSE_LINK_SECRET", "").encode() or secrets.token_bytes(32)
+    return _link_secret
+
+
+def set_link_secret(secret):
+    """
+    Sets the link token key for this process. Send worker processes are given the parent's key,
+    so the links they send carry the tokens the parent checks responses against.
+    """
+    global _link_secret
+    with _link_secret_lock:
+        _link_secret = secret
+
+
+class InvitationTemplate:
+    """
+    A survey invitation compiled once per survey.
+    Everything that is the same for every recipient (subject, survey text, link prefix and the
+    keyed hash state for the survey) is prepared up front; render() only fills in the
+    recipient's name and tokenized link.
+    """
+    def __init__(self, survey_details, base_url="http://survey.example.com", secret=None, reminder=False):
+        survey_id = survey_details.get("survey_id", "default_survey")
+        if reminder: # Same link and token as the invitation, so either email can be used to respond
+            self.subject = f"Reminder: Please participate in the {survey_details.get('title', 'Employee Survey')}"
+            self._body_middle = (f",\n\nThis is a friendly reminder that our pulse survey is still open: {survey_details.get('title', '')}.\n"
+                                 f"If you haven't had a chance yet, it only takes a few minutes.\n\n"
+                                 f"Access the survey here: ")
+        else:
+            self.subject = f"Invitation: Please participate in the {survey_details.get('title', 'Employee Survey')}"
+            self._body_middle = (f",\n\nPlease take a few moments to complete our pulse survey: {survey_details.get('title', '')}.\n"
+                                 f"Your feedback is valuable.\n\n"
+                                 f"Access the survey here: ")
+        self._link_prefix = f"{base_url}/s/{survey_id}?t="
+        self._body_end = "\n\nThank you,\nHR Department"
+        # Hash state already keyed and fed the survey ID; each token only copies it and adds the email.
+        self._token_hash = hashlib.blake2b(key=secret or link_secret(), digest_size=12)
+        self._token_hash.update(survey_id.encode() + b"\0")
+
+    def token_for(self, email):
+        """Returns the recipient's unique, unguessable survey token."""
+        h = self._token_hash.copy()
+        h.update(email.lower().encode())
+        return base64.urlsafe_b64encode(h.digest()).decode("ascii")
+
+    def link_for(self, email):
+        return self._link_prefix + self.token_for(email)
+
+    def render(self, email, name=None):
+        """Returns the invitation body for one recipient."""
+        return f"Dear {name or 'Employee'}{self._body_middle}{self.link_for(email)}{self._body_end}"
@@ -0,0 +1,64 @@
+# employee_pulse_survey_project/agents/logging_config.py
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+LOGGER_NAME = "employee_pulse_agent"
+
+_listener = None
+
+
+def get_logger(name):
+    """Returns the logger for an agent or module, e.g. 'employee_pulse_agent.CommunicationAgent'."""
+    return logging.getLogger(LOGGER_NAME).getChild(name)
+
+
+def configure_logging(level=None, quiet=None, stream=None):
+    """
+    Routes all employee_pulse_agent logs through a queue to a background listener thread,
+    so a log call only enqueues a record and never waits on stdout.
+
+    level defaults to PULSE_LOG_LEVEL (INFO if unset). quiet (or PULSE_QUIET=1) is the
+    production mode: only warnings and errors are emitted, so per-recipient DEBUG records
+    are dropped at the isEnabledFor() check before any formatting happens.
+    Calling it again replaces the previous configuration.
+    """
+    global _listener
+    if quiet is None:
+        quiet = os.getenv("PULSE_QUIET", "").lower() in ("1", "true", "yes")
+    if level is None:
+        level = os.getenv("PULSE_LOG_LEVEL", "INFO")
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    if quiet:
+        level = max(level, logging.WARNING)
+
+    shutdown_logging()
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    records = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+
+    logger = logging.getLogger(LOGGER_NAME)
+    for old_handler in list(logger.handlers):
+        logger.removeHandler(old_handler)
+    logger.addHandler(logging.handlers.QueueHandler(records))
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def shutdown_logging():
+    """Drains queued records and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,196 @@
+# employee_pulse_survey_project/agents/mail_transport.py
+
+import base64
+import logging
+import os
+import threading
+
+from .logging_config import get_logger
+
+# smtplib (and the email package it pulls in) is imported inside SMTPTransport's methods,
+# so simulated-only deployments never pay for it at startup.
+
+
+class SimulatedTransport:
+    """
+    Default delivery backend: logs each email at DEBUG level instead of delivering it.
+    """
+    def __init__(self, logger=None):
+        self.logger = logger or get_logger("SimulatedTransport")
+
+    def send(self, recipient_email, subject, body):
+        # Checked up front so the per-recipient cost is a single level test when DEBUG is off.
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("SIMULATING EMAIL SEND:\n  To: %s\n  Subject: %s\n  Body:\n%s\n", recipient_email, subject, body)
+            self.logger.debug("Email to %s sent successfully (simulated).", recipient_email)
+        return True
+
+    def send_batch(self, messages):
+        """
+        Sends a batch of (recipient_email, subject, body) tuples.
+        Returns one boolean per message, in order.
+        """
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return [True] * len(messages)
+        return [self.send(recipient, subject, body) for recipient, subject, body in messages]
+
+    def close(self):
+        pass
+
+
+class SMTPTransport:
+    """
+    Delivers email over SMTP using a bounded pool of reusable connections.
+    Each send_batch call checks out one connection and sends the whole batch over it,
+    so the connect/EHLO/login cost is paid once per connection rather than once per email.
+    """
+    def __init__(self, host, port=25, sender="hr@example.com", username=None, password=None,
+                 use_starttls=False, pool_size=4, timeout=30):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_starttls = use_starttls
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle = [] # Connections ready for reuse (LIFO keeps the warmest one on top)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(pool_size) # Caps open connections
+
+    @classmethod
+    def from_env(cls):
+        """
+        Builds a transport from SMTP_* environment variables.
+        Returns None when SMTP_HOST is not set.
+        """
+        host = os.getenv("SMTP_HOST")
+        if not host:
+            return None
+        return cls(
+            host=host,
+            port=int(os.getenv("SMTP_PORT", "25")),
+            sender=os.getenv("SMTP_SENDER", "hr@example.com"),
+            username=os.getenv("SMTP_USERNAME") or None,
+            password=os.getenv("SMTP_PASSWORD") or None,
+            use_starttls=os.getenv("SMTP_STARTTLS", "").lower() in ("1", "true", "yes"),
+            pool_size=int(os.getenv("SMTP_POOL_SIZE", "4")),
+        )
+
+    def _connect(self):
+        import smtplib
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_starttls:
+            conn.starttls()
+        if self.username:
+            conn.login(self.username, self.password or "")
+        return conn
+
+    def _acquire(self):
+        self._slots.acquire()
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, conn, broken=False):
+        if broken:
+            _close_quietly(conn)
+        else:
+            with self._lock:
+                self._idle.append(conn)
+        self._slots.release()
+
+    def _build_message(self, recipient_email, subject, body):
+        # Built by hand rather than with email.message.EmailMessage: its header parsing
+        # costs far more than the network round-trip on a local relay.
+        if not subject.isascii():
+            from email.header import Header
+            subject = Header(subject, "utf-8").encode()
+        if body.isascii():
+            encoding, payload = "7bit", body
+        else:
+            encoding, payload = "base64", base64.encodebytes(body.encode("utf-8")).decode("ascii")
+        return (f"From: {self.sender}\r\nTo: {recipient_email}\r\nSubject: {subject}\r\n"
+                f"MIME-Version: 1.0\r\nContent-Type: text/plain; charset=utf-8\r\n"
+                f"Content-Transfer-Encoding: {encoding}\r\n\r\n{payload}")
+
+    def send(self, recipient_email, subject, body):
+        return self.send_batch([(recipient_email, subject, body)])[0]
+
+    def send_batch(self, messages):
+        """
+        Sends a batch of (recipient_email, subject, body) tuples over one pooled connection.
+        Returns one boolean per message, in order. A dropped connection is reopened once
+        and the interrupted message retried; refused recipients are reported as False.
+        """
+        import smtplib
+        results = []
+        conn = self._acquire()
+        broken = False
+        try:
+            for recipient, subject, body in messages:
+                msg = self._build_message(recipient, subject, body)
+                try:
+                    conn.sendmail(self.sender, [recipient], msg)
+                    results.append(True)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException):
+                    # Rejected by the server (e.g. 550 on RCPT). Reset the transaction and move on.
+                    results.append(False)
+                    _reset_quietly(conn)
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    _close_quietly(conn)
+                    try:
+                        conn = self._connect()
+                    except (smtplib.SMTPException, OSError):
+                        broken = True # Can't reach the server; the rest of the batch fails below
+                        break
+                    try:
+                        conn.sendmail(self.sender, [recipient], msg)
+                        results.append(True)
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException):
+                        # The new connection is fine; only this recipient was rejected.
+                        results.append(False)
+                        _reset_quietly(conn)
+                    except (smtplib.SMTPServerDisconnected, OSError):
+                        results.append(False)
+                        broken = True
+                        break
+        except BaseException:
+            broken = True
+            raise
+        finally:
+            self._release(conn, broken=broken)
+        # Anything left unsent after a hard connection failure counts as failed.
+        results.extend([False] * (len(messages) - len(results)))
+        return results
+
+    def close(self):
+        """Closes all idle pooled connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            _close_quietly(conn)
+
+
+def _reset_quietly(conn):
+    import smtplib
+    try:
+        conn.rset()
+    except smtplib.SMTPException:
+        pass
+
+
+def _close_quietly(conn):
+    import smtplib
+    try:
+        conn.quit()
+    except (smtplib.SMTPException, OSError):
+        try:
+            conn.close()
+        except OSError:
+            pass
@@ -0,0 +1,361 @@
+# employee_pulse_survey_project/agents/message_bus.py
+
+import asyncio
+import atexit
+import itertools
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .logging_config import get_logger
+
+
+class MessageError(RuntimeError):
+    """Raised to the sender when the receiving agent's handler failed or its worker process died."""
+
+
+def handle_batch(agent, messages):
+    """
+    Delivers (message_id, sender, message_type, payload) messages to agent.process_message in
+    order and returns (message_id, ok, result or error text) for each. A failing message doesn't
+    stop the rest of the batch.
+    """
+    results = []
+    for message_id, sender, message_type, payload in messages:
+        try:
+            results.append((message_id, True, agent.process_message(sender, message_type, payload)))
+        except Exception as exc:
+            results.append((message_id, False, f"{type(exc).__name__}: {exc}"))
+    return results
+
+
+def _worker_main(factory, requests, replies):
+    """
+    Worker process loop: builds its own agent with factory(), then answers request batches
+    until it receives None.
+    """
+    agent = factory()
+    while True:
+        try:
+            batch = requests.recv()
+        except EOFError:
+            break
+        if batch is None:
+            break
+        replies.send(handle_batch(agent, batch))
+    replies.close()
+
+
+class _Worker:
+    """One agent process: a request pipe in, a reply pipe out, and the futures awaiting its replies."""
+    def __init__(self, process, requests, replies, max_in_flight):
+        self.process = process
+        self.requests = requests
+        self.replies = replies
+        self.max_in_flight = max_in_flight
+        self.slots = None # asyncio.Semaphore, created on the bus loop
+        self.pending = {} # message_id: asyncio.Future
+        self.alive = True
+
+
+class _Route:
+    """Where one agent name's messages go: a bounded queue drained by an in-process consumer or by worker pumps."""
+    def __init__(self, name, agent=None, workers=None, concurrency=1):
+        self.name = name
+        self.agent = agent
+        self.workers = workers or []
+        self.concurrency = concurrency
+        self.executor = None
+        self.queue = None
+        self.tasks = []
+        self.delivered = 0
+        self.batches = 0
+
+
+class MessageBus:
+    """
+    Asynchronous message passing between agents, behind BaseAgent.process_message.
+    Each registered agent name has a bounded asyncio queue. Senders await when it is full
+    (max_pending), so a slow agent pushes back on whoever floods it instead of buffering without limit.
+
+    Messages are delivered in batches of up to batch_size: whatever is queued when the consumer
+    wakes goes in one batch, so a busy queue pays the hand-off cost per batch, not per message.
+    - In-process agents (register) handle batches on their own thread(s), off the event loop,
+      so blocking agent code never stalls the loop or other agents.
+    - Process pools (register_process_pool) run an agent per worker process and receive
+      pickled batches over pipes. Each worker has at most max_in_flight batches outstanding and
+      idle workers take the next batch, so the load spreads over cores.
+
+    The bus binds to the first event loop that uses it. Synchronous code calls start() to run it
+    on a background thread and then uses call(), call_many() and submit().
+    """
+    def __init__(self, batch_size=64, max_pending=1024, name="MessageBus"):
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.logger = get_logger(name)
+        self._routes = {} # agent name: _Route
+        self._ids = itertools.count(1)
+        self._loop = None
+        self._thread = None
+        self._closed = False
+
+    # --- Registration ---
+
+    def register(self, agent, name=None, concurrency=1):
+        """
+        Routes messages for name (default agent.name) to an in-process agent.
+        concurrency is how many batches it may handle at once (1 keeps the agent single-threaded).
+        """
+        name = name or agent.name
+        self._routes[name] = _Route(name, agent=agent, concurrency=concurrency)
+        return name
+
+    def register_process_pool(self, name, factory, processes=2, max_in_flight=2):
+        """
+        Starts processes worker processes, each running the agent built by factory() (a picklable
+        callable, such as an agent class or a functools.partial of one), and routes messages for
+        name to them. Payloads and results must be picklable.
+        """
+        context = multiprocessing.get_context("spawn") # Forking would copy this process's threads and locks
+        workers = []
+        for index in range(processes):
+            request_reader, request_writer = context.Pipe(duplex=False)
+            reply_reader, reply_writer = context.Pipe(duplex=False)
+            process = context.Process(target=_worker_main, args=(factory, request_reader, reply_writer),
+                                      name=f"{name}-{index}", daemon=True)
+            process.start()
+            request_reader.close() # The child's ends; keeping them open here would hide a dead child
+            reply_writer.close()
+            workers.append(_Worker(process, request_writer, reply_reader, max_in_flight))
+        self._routes[name] = _Route(name, workers=workers)
+        # Registered after the processes started, so it runs before multiprocessing's own exit hook
+        # kills them (which would look like workers dying)
+        atexit.register(self.close)
+        self.logger.info("Started %d worker processes for %s.", processes, name)
+        return name
+
+    # --- Sending (on the bus loop) ---
+
+    async def send(self, recipient, message_type, payload=None, sender=None):
+        """Delivers one message and returns the handler's result (raising MessageError if it failed)."""
+        future = await self._enqueue(recipient, message_type, payload, sender)
+        return await future
+
+    async def send_many(self, recipient, messages, sender=None):
+        """
+        Delivers (message_type, payload) pairs to one agent and returns their results in order.
+        Failed messages come back as MessageError instances instead of raising.
+        """
+        futures = [await self._enqueue(recipient, message_type, payload, sender) for message_type, payload in messages]
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    async def _enqueue(self, recipient, message_type, payload, sender):
+        if self._closed:
+            raise MessageError("The message bus is closed")
+        route = self._routes.get(recipient)
+        if route is None:
+            raise MessageError(f"No agent registered as '{recipient}'")
+        if route.queue is None:
+            self._start_route(route)
+        future = self._loop.create_future()
+        await route.queue.put(((next(self._ids), sender, message_type, payload), future)) # Waits while the queue is full
+        return future
+
+    def _start_route(self, route):
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+        elif self._loop is not loop:
+            raise RuntimeError("MessageBus is bound to another event loop; use call() from other threads")
+        route.queue = asyncio.Queue(maxsize=self.max_pending)
+        if route.agent is not None:
+            route.executor = ThreadPoolExecutor(max_workers=route.concurrency, thread_name_prefix=f"bus-{route.name}")
+            route.tasks = [loop.create_task(self._consume_local(route)) for _ in range(route.concurrency)]
+            return
+        for worker in route.workers:
+            worker.slots = asyncio.Semaphore(worker.max_in_flight)
+            threading.Thread(target=self._read_replies, args=(route, worker), name=f"bus-{route.name}-replies", daemon=True).start()
+            route.tasks.append(loop.create_task(self._pump(route, worker)))
+
+    async def _next_batch(self, route):
+        queue = route.queue
+        batch = [await queue.get()]
+        while len(batch) < self.batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+        route.batches += 1
+        return batch
+
+    async def _consume_local(self, route):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch(route)
+            messages = [message for message, _ in batch]
+            try:
+                results = await loop.run_in_executor(route.executor, handle_batch, route.agent, messages)
+            except Exception as exc: # Only if the executor itself fails
+                results = [(message[0], False, str(exc)) for message in messages]
+            for (_, future), (_, ok, value) in zip(batch, results):
+                self._settle(future, ok, value)
+            route.delivered += len(batch)
+
+    async def _pump(self, route, worker):
+        loop = asyncio.get_running_loop()
+        while worker.alive:
+            await worker.slots.acquire() # At most max_in_flight batches outstanding per worker
+            batch = await self._next_batch(route)
+            if not worker.alive: # Died while we waited; hand the batch back for the surviving workers
+                self._requeue(route, batch)
+                return
+            for message, future in batch:
+                worker.pending[message[0]] = future
+            try:
+                await loop.run_in_executor(None, worker.requests.send, [message for message, _ in batch])
+            except (OSError, ValueError) as exc:
+                self._worker_died(route, worker, exc)
+
+    def _read_replies(self, route, worker):
+        """Reader thread: hands each reply batch from a worker back to the bus loop."""
+        while True:
+            try:
+                results = worker.replies.recv()
+            except (EOFError, OSError) as exc:
+                if not self._closed:
+                    self._loop.call_soon_threadsafe(self._worker_died, route, worker, exc)
+                return
+            try:
+                self._loop.call_soon_threadsafe(self._deliver, route, worker, results)
+            except RuntimeError: # The loop has been closed; nobody is waiting any more
+                return
+
+    def _deliver(self, route, worker, results):
+        for message_id, ok, value in results:
+            future = worker.pending.pop(message_id, None)
+            if future is not None:
+                self._settle(future, ok, value)
+        route.delivered += len(results)
+        worker.slots.release()
+
+    def _worker_died(self, route, worker, exc):
+        if not worker.alive:
+            return
+        worker.alive = False
+        self.logger.error("Worker %s for %s exited (%s); failing %d pending messages.", worker.process.name, route.name,
+                          exc, len(worker.pending))
+        for future in worker.pending.values():
+            self._settle(future, False, f"worker process {worker.process.name} exited")
+        worker.pending.clear()
+        worker.slots.release() # Wakes the pump so it can stop
+        if not any(other.alive for other in route.workers):
+            self._requeue(route, []) # Nobody left to take queued messages; fail them
+
+    def _requeue(self, route, batch):
+        """Puts messages back on the route's queue, or fails them (and everything queued) once no worker is left."""
+        if any(worker.alive for worker in route.workers):
+            for item in batch:
+                if route.queue.full():
+                    self._settle(item[1], False, "worker process exited")
+                else:
+                    route.queue.put_nowait(item)
+            return
+        while not route.queue.empty():
+            batch.append(route.queue.get_nowait())
+        for _, future in batch:
+            self._settle(future, False, f"no live worker processes for {route.name}")
+
+    @staticmethod
+    async def _cancel(tasks):
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _settle(future, ok, value):
+        if future.done():
+            return
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(MessageError(value))
+
+    # --- Synchronous use ---
+
+    def start(self):
+        """Runs the bus on its own event loop in a background thread, for call() and call_many()."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name="message-bus", daemon=True)
+            self._thread.start()
+        return self
+
+    def call(self, recipient, message_type, payload=None, sender=None, timeout=None):
+        """send() from synchronous code (after start()): blocks until the reply arrives."""
+        return self.submit(recipient, message_type, payload, sender).result(timeout)
+
+    def submit(self, recipient, message_type, payload=None, sender=None):
+        """
+        send() from synchronous code (after start()) without waiting: returns a
+        concurrent.futures.Future for the handler's result, so a caller can keep several
+        messages in flight.
+        """
+        return self._submit(self.send(recipient, message_type, payload, sender))
+
+    def call_many(self, recipient, messages, sender=None, timeout=None):
+        """send_many() from synchronous code (after start())."""
+        return self._run(self.send_many(recipient, messages, sender), timeout)
+
+    def _run(self, coroutine, timeout):
+        return self._submit(coroutine).result(timeout)
+
+    def _submit(self, coroutine):
+        if self._thread is None:
+            coroutine.close()
+            raise RuntimeError("Call MessageBus.start() before using call() from synchronous code")
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    # --- Introspection and shutdown ---
+
+    def queue_depths(self):
+        """Messages waiting per agent name (not yet handed to a handler or worker)."""
+        return {name: route.queue.qsize() if route.queue is not None else 0 for name, route in self._routes.items()}
+
+    def stats(self):
+        stats = {}
+        for name, route in self._routes.items():
+            in_flight = sum(len(worker.pending) for worker in route.workers)
+            stats[name] = {
+                "mode": "process" if route.workers else "local",
+                "workers": sum(worker.alive for worker in route.workers) if route.workers else route.concurrency,
+                "queued": route.queue.qsize() if route.queue is not None else 0,
+                "in_flight": in_flight,
+                "delivered": route.delivered,
+                "batches": route.batches,
+                "mean_batch": round(route.delivered / route.batches, 1) if route.batches else None,
+            }
+        return stats
+
+    def close(self, timeout=10):
+        """Stops the consumers and worker processes. Messages still queued are dropped."""
+        if self._closed:
+            return
+        self._closed = True
+        tasks = [task for route in self._routes.values() for task in route.tasks]
+        if self._thread is not None and tasks: # Our own loop: let the cancellations finish before it stops
+            asyncio.run_coroutine_threadsafe(self._cancel(tasks), self._loop).result(timeout)
+        elif self._loop is not None and not self._loop.is_closed(): # asyncio.run() cancels its own tasks
+            for task in tasks:
+                self._loop.call_soon_threadsafe(task.cancel)
+        for route in self._routes.values():
+            for worker in route.workers:
+                try:
+                    worker.requests.send(None)
+                except (OSError, ValueError):
+                    pass
+            for worker in route.workers:
+                worker.process.join(timeout)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+            if route.executor is not None:
+                route.executor.shutdown(wait=False)
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
@@ -0,0 +1,442 @@
+# employee_pulse_survey_project/agents/metrics.py
+
+import functools
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+
+from .logging_config import get_logger
+
+# Latency histogram bucket upper bounds, in seconds (Prometheus 'le' labels; +Inf is implicit).
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_perf_counter = time.perf_counter
+
+
+class Histogram:
+    """
+    Call count, error count and latency distribution of one instrumented function.
+    observe() only appends to a deque (atomic, so no lock is taken per call); every FOLD_AT
+    observations, and before any read, the pending ones are folded into the bucket counts.
+    Errors are rare and recorded straight away under the lock, latency and error count together,
+    so a read never sees an error whose call isn't counted yet.
+    """
+    FOLD_AT = 256
+
+    __slots__ = ("buckets", "counts", "count", "errors", "total", "_pending", "_lock")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # Last slot is +Inf
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self._pending = deque()
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, error=False):
+        if error:
+            with self._lock:
+                self.counts[bisect_left(self.buckets, seconds)] += 1
+                self.count += 1
+                self.total += seconds
+                self.errors += 1
+            return
+        pending = self._pending
+        pending.append(seconds)
+        if len(pending) >= self.FOLD_AT:
+            self._fold()
+
+    def _fold(self):
+        with self._lock:
+            self._fold_locked()
+
+    def _fold_locked(self):
+        pending, buckets, counts = self._pending, self.buckets, self.counts
+        folded, total = 0, 0.0
+        while True:
+            try:
+                seconds = pending.popleft()
+            except IndexError:
+                break
+            counts[bisect_left(buckets, seconds)] += 1
+            folded += 1
+            total += seconds
+        self.count += folded
+        self.total += total
+
+    def values(self):
+        """Returns (bucket counts, count, total seconds, errors), consistent with each other."""
+        with self._lock:
+            self._fold_locked()
+            return list(self.counts), self.count, self.total, self.errors
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+            self.counts = [0] * len(self.counts)
+            self.count = self.errors = 0
+            self.total = 0.0
+
+    def quantile(self, q, values=None):
+        """Estimates a quantile from the buckets (the upper bound of the bucket it falls in)."""
+        counts, count, _, _ = values or self.values()
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def summary(self):
+        values = self.values()
+        _, count, total, errors = values
+        return {
+            "calls": count,
+            "errors": errors,
+            "mean_ms": round(total / count * 1000, 3) if count else None,
+            "p50_ms": _ms(self.quantile(0.50, values)),
+            "p95_ms": _ms(self.quantile(0.95, values)),
+            "p99_ms": _ms(self.quantile(0.99, values)),
+        }
+
+
+def _ms(seconds):
+    if seconds is None:
+        return None
+    return "+Inf" if seconds == float("inf") else round(seconds * 1000, 3)
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics: a Histogram per instrumented agent method and tool, plus gauges and
+    counters read from callbacks only when metrics are collected (dispatch queue depth,
+    in-flight sends, idempotency cache stats, ...).
+    While disabled, instrumented functions only check one flag before calling through.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._histograms = {} # (metric, label_items): Histogram
+        self._callbacks = {} # metric: (kind, help, label_name, func)
+        self._lock = threading.Lock()
+        self.profiler = None
+
+    def histogram(self, metric, **labels):
+        key = (metric, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        return histogram
+
+    def register(self, metric, kind, help_text, func, label=None):
+        """
+        Adds a metric whose value is read by calling func() at collection time. kind is 'gauge'
+        or 'counter'. func returns a number, or with label a {label value: number} dict.
+        Registering the same metric again replaces it.
+        """
+        with self._lock:
+            self._callbacks[metric] = (kind, help_text, label, func)
+
+    def timed(self, metric, **labels):
+        """Decorator recording each call's latency (and whether it raised) in a histogram."""
+        def decorator(func):
+            observe = self.histogram(metric, **labels).observe
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = _perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except BaseException:
+                    observe(_perf_counter() - start, True)
+                    raise
+                observe(_perf_counter() - start)
+                return result
+            wrapper.__wrapped_metric__ = metric
+            return wrapper
+        return decorator
+
+    def _read_callbacks(self):
+        with self._lock:
+            callbacks = list(self._callbacks.items())
+        values = []
+        for metric, (kind, help_text, label, func) in callbacks:
+            try:
+                value = func()
+            except Exception:
+                get_logger("metrics").exception("Reading metric %s failed.", metric)
+                continue
+            if value is not None:
+                values.append((metric, kind, help_text, label, value))
+        return values
+
+    def snapshot(self):
+        """All metrics as a JSON-friendly dict: latency summaries by metric and label, then gauges and counters."""
+        with self._lock:
+            histograms = list(self._histograms.items())
+        timings = {}
+        for (metric, labels), histogram in histograms:
+            if histogram.count or histogram._pending:
+                name = ".".join(value for _, value in labels) or metric
+                timings.setdefault(metric, {})[name] = histogram.summary()
+        result = {"enabled": self.enabled, "timings": timings}
+        for metric, _, _, _, value in self._read_callbacks():
+            result[metric] = value
+        if self.profiler is not None:
+            result["profile"] = self.profiler.report()
+        return result
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        by_metric = {}
+        for (metric, labels), histogram in histograms:
+            values = histogram.values()
+            if values[1]:
+                label_text = "".join(f'{name}="{_escape(value)}",' for name, value in labels)
+                by_metric.setdefault(metric, []).append((label_text, histogram.buckets, values))
+        for metric, series in by_metric.items():
+            lines.append(f"# HELP {metric}_seconds Call latency.")
+            lines.append(f"# TYPE {metric}_seconds histogram")
+            for label_text, buckets, (counts, count, total, _) in series:
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_seconds_bucket{{{label_text}le="{le}"}} {cumulative}')
+                lines.append(f"{metric}_seconds_sum{_braces(label_text)} {total!r}")
+                lines.append(f"{metric}_seconds_count{_braces(label_text)} {count}")
+            lines.append(f"# HELP {metric}_errors_total Calls that raised.")
+            lines.append(f"# TYPE {metric}_errors_total counter")
+            lines.extend(f"{metric}_errors_total{_braces(label_text)} {values[3]}" for label_text, _, values in series)
+        for metric, kind, help_text, label, value in self._read_callbacks():
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            if label is None:
+                lines.append(f"{metric} {value}")
+            else:
+                lines.extend(f'{metric}{{{label}="{_escape(key)}"}} {number}' for key, number in value.items()
+                             if isinstance(number, (int, float)))
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path):
+        """Writes the Prometheus text to path, atomically (for node_exporter's textfile collector, say)."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(temp_path, path)
+
+    def reset(self):
+        """Zeroes every histogram (instrumented functions keep recording into the same ones)."""
+        with self._lock:
+            histograms = list(self._histograms.values())
+        for histogram in histograms:
+            histogram.reset()
+
+
+def _braces(label_text):
+    # label_text is 'name="value",...' with a trailing comma, or empty for an unlabeled series.
+    return "{" + label_text.rstrip(",") + "}" if label_text else ""
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = MetricsRegistry()
+
+
+def instrument_class(cls, registry=METRICS):
+    """
+    Times every public method defined on cls (not inherited ones, which their own class
+    instruments) as pulse_agent_method{agent=<class>,method=<name>}.
+    """
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not callable(value) or isinstance(value, (staticmethod, classmethod, type)):
+            continue
+        if getattr(value, "__wrapped_metric__", None):
+            continue
+        setattr(cls, attr, registry.timed("pulse_agent_method", agent=cls.__name__, method=attr)(value))
+    return cls
+
+
+class SamplingProfiler:
+    """
+    Opt-in statistical profiler: a background thread snapshots every other thread's stack each
+    interval seconds (sys._current_frames) and counts where time goes. Threads parked in
+    threading/queue/selectors waits are skipped, so idle pools don't drown out real work.
+    The profiled code isn't instrumented at all; the cost is the sampling thread itself.
+    """
+    IDLE_MODULES = ("threading.py", "queue.py", "selectors.py", "socketserver.py", "thread.py")
+    IDLE_FUNCTIONS = ("dequeue",) # The logging QueueListener waiting for records
+
+    def __init__(self, interval=0.01, max_depth=40):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = 0
+        self.self_counts = Counter() # 'file:function' at the top of the stack
+        self.stack_counts = Counter() # Collapsed stacks, outermost first (flame graph input)
+        self.started_at = None
+        self.stopped_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+        self._stop.clear()
+        self.started_at, self.stopped_at = time.time(), None
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped_at = time.time()
+        return self
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                code = frame.f_code
+                if thread_id == own_id or code.co_filename.endswith(self.IDLE_MODULES) or code.co_name in self.IDLE_FUNCTIONS:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.samples += 1
+                self.self_counts[stack[0]] += 1
+                self.stack_counts[";".join(reversed(stack))] += 1
+
+    def report(self, top=15):
+        samples = self.samples or 1
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "top_functions": [{"function": name, "samples": count, "share": round(count / samples, 4)}
+                              for name, count in self.self_counts.most_common(top)],
+            "top_stacks": [{"stack": stack, "samples": count} for stack, count in self.stack_counts.most_common(5)],
+        }
+
+    def write_collapsed(self, path):
+        """Writes 'stack count' lines, the input format of flamegraph.pl and speedscope."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in self.stack_counts.most_common())
+
+
+def start_profiler(interval=0.01, registry=METRICS):
+    """Starts a fresh sampling profiler whose report is included in the registry's snapshot."""
+    if registry.profiler is not None and registry.profiler.running:
+        return registry.profiler
+    registry.profiler = SamplingProfiler(interval).start()
+    return registry.profiler
+
+
+def stop_profiler(registry=METRICS):
+    """Stops the sampling profiler, keeping its report; returns it (or None if none was started)."""
+    if registry.profiler is None:
+        return None
+    return registry.profiler.stop().report()
+
+
+class MetricsExporter:
+    """
+    Publishes a registry's Prometheus text: rewrites a file every interval seconds, and/or serves
+    it at http://host:port/metrics. Both run on daemon threads; the server binds to localhost
+    unless told otherwise.
+    """
+    def __init__(self, registry=METRICS, path=None, interval=15.0, port=None, host="127.0.0.1"):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self.port = port
+        self.host = host
+        self.server = None
+        self._stop = threading.Event()
+        self._writer = None
+        self.logger = get_logger("MetricsExporter")
+
+    def start(self):
+        if self.path:
+            self._writer = threading.Thread(target=self._write_loop, name="metrics-file", daemon=True)
+            self._writer.start()
+        if self.port is not None:
+            self._start_server()
+        return self
+
+    def _write_loop(self):
+        while True:
+            try:
+                self.registry.write_file(self.path)
+            except OSError:
+                self.logger.exception("Writing metrics to %s failed.", self.path)
+            if self._stop.wait(self.interval):
+                return
+
+    def _start_server(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args): # Scrapes would flood the log otherwise
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1] # The actual port when 0 was asked for
+        threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+        self.logger.info("Serving metrics at http://%s:%d/metrics", self.host, self.port)
+
+    def stop(self):
+        self._stop.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self._writer is not None:
+            self._writer.join()
+            self.registry.write_file(self.path) # Leave the final values behind
+
+
+def configure_metrics(enabled=None, registry=METRICS):
+    """
+    Turns metrics collection on or off. enabled defaults to PULSE_METRICS (on unless '0'/'false').
+    PULSE_PROFILE=1 also starts the sampling profiler (PULSE_PROFILE_INTERVAL_MS, default 10).
+    """
+    if enabled is None:
+        enabled = os.getenv("PULSE_METRICS", "1").lower() not in ("0", "false", "no")
+    registry.enabled = enabled
+    if os.getenv("PULSE_PROFILE", "").lower() in ("1", "true", "yes"):
+        start_profiler(float(os.getenv("PULSE_PROFILE_INTERVAL_MS", "10")) / 1000, registry)
+    return registry
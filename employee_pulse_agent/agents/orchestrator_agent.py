@@ -1,19 +1,64 @@
 # employee_pulse_survey_project/agents/orchestrator_agent.py
 
+import copy
+import logging
+from collections import Counter, deque
+from itertools import islice
+
+from .audience import iter_recipients_from_csv
 from .base_agent import BaseAgent
+from .delivery import FAILED, DeliveryLedger
+from .directory import SelectorError
+from .dispatch_queue import DispatchQueue
+from .message_bus import MessageError
+from .response_agent import ResponseAgent
+from .survey_store import SurveyStore
 # We will pass instances of other agents to the constructor, so direct import of classes here is not strictly necessary
 # unless type hinting is desired more explicitly for the constructor.
 
+# Fields returned by get_survey_status / list_active_surveys unless others are requested.
+# Large values (audience list, questions) are reported as counts.
+SUMMARY_FIELDS = (
+    "survey_id", "title", "topic", "status", "approval_status", "approval_request_id", "approver_contact",
+    "num_questions", "audience_source", "audience_size", "sent_count", "dispatch", "respondents", "response_rate"
+)
+# Extra fields that can be requested explicitly.
+DETAIL_FIELDS = ("questions", "live_results", "target_audience_csv", "target_audience_selector", "recipient_count", "failed_count", "suppressed_count",
+                 "reminders", "next_reminder_at")
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+
 class OrchestratingAgent(BaseAgent):
     """
     Coordinates the workflow between other agents.
     """
-    def __init__(self, questionnaire_agent, approval_agent, communication_agent, name="OrchestratorAgent"):
+    def __init__(self, questionnaire_agent, approval_agent, communication_agent, name="OrchestratorAgent", backend=None,
+                 response_agent=None, dispatch_queue=None, directory=None, reminder_scheduler=None, reminder_offsets=(),
+                 message_bus=None, send_route=None, bus_chunk_size=1000, bus_chunks_in_flight=4):
         super().__init__(name)
         self.questionnaire_agent = questionnaire_agent
         self.approval_agent = approval_agent
         self.communication_agent = communication_agent
-        self.active_surveys = {} # Stores survey_id: survey_details
+        self.response_agent = response_agent if response_agent is not None else ResponseAgent()
+        self.survey_store = SurveyStore(backend=backend) # Stores survey_id: survey_details, indexed by approval request, status and approver
+        self.dispatch_queue = dispatch_queue if dispatch_queue is not None else DispatchQueue() # Sends approved surveys in the background
+        self._delivery_ledgers = {} # survey_id: DeliveryLedger of the latest dispatch
+        self.directory = directory # Optional EmployeeDirectory for selector-based audiences
+        # Reminders to non-respondents, reminder_offsets seconds after the invitations went out (none without a scheduler)
+        self.reminder_scheduler = reminder_scheduler
+        self.reminder_offsets = tuple(sorted(reminder_offsets)) if reminder_scheduler is not None else ()
+        # With a started MessageBus, invitations and reminders are sent by the agent registered as
+        # send_route (e.g. a pool of CommunicationAgent processes) instead of in this process.
+        # Recipients are chosen here and streamed to it bus_chunk_size at a time.
+        self.message_bus = message_bus
+        self.send_route = send_route or communication_agent.name
+        self.bus_chunk_size = bus_chunk_size
+        self.bus_chunks_in_flight = bus_chunks_in_flight
+
+    @property
+    def active_surveys(self):
+        """All surveys as a survey_id: survey_details mapping (read-only; change surveys through survey_store)."""
+        return self.survey_store.surveys
 
     def initiate_pulse_survey(self, survey_params):
         """
@@ -26,105 +71,675 @@ class OrchestratingAgent(BaseAgent):
             "target_audience_emails": ["employee1@example.com", "employee2@example.com"],
             "approver_contact": "hr_manager@example.com"
         }
+        Optional question filters: "question_tags", "language", "question_type", "question_seed"
+        and "exclude_recent_questions" (see PulseQuestionnaireAgent.get_survey_questions).
+        target_audience_emails may be any iterable (it is only read when invitations go out).
+        Alternatively pass "target_audience_csv": "/path/to/audience.csv" to stream recipients
+        from a CSV file with an 'email' (and optional 'name') column at send time, or
+        "target_audience_selector": "department=Engineering AND location=Pune" to select recipients
+        from the employee directory (see EmployeeDirectory.select). A selector is stored as is and
+        resolved again when invitations go out; the recipient list is never copied into the survey.
         """
-        print(f"\n[{self.name}] Initiating new pulse survey: '{survey_params.get('title')}'")
+        self.logger.info("Initiating new pulse survey: '%s'", survey_params.get('title'))
+
+        error = self._check_survey_params(survey_params)
+        if error:
+            return {"status": "error", "message": error, "survey_id": survey_params.get("survey_id")}
+        existing = self._existing_survey_result(survey_params["survey_id"])
+        if existing:
+            return existing
 
         # 1. Get Questions
-        print(f"[{self.name}] Requesting questions from {self.questionnaire_agent.name}...")
-        questions = self.questionnaire_agent.get_survey_questions(
-            topic=survey_params.get("topic", "default"),
-            num_questions=survey_params.get("num_questions", 2)
-        )
+        self.logger.info("Requesting questions from %s...", self.questionnaire_agent.name)
+        questions = self._get_questions(survey_params)
         if not questions:
-            print(f"[{self.name}] Failed to retrieve questions. Aborting survey initiation.")
+            self.logger.error("Failed to retrieve questions. Aborting survey initiation.")
             return {"status": "error", "message": "Failed to get questions", "survey_id": survey_params["survey_id"]}
 
-        current_survey_details = {
-            **survey_params,
-            "questions": questions,
-            "status": "pending_approval", # Initial status
-            "approval_request_id": None,
-            "approval_status": None
-        }
-        self.active_surveys[survey_params["survey_id"]] = current_survey_details
+        current_survey_details = self._new_survey_record(survey_params, questions)
+        try:
+            self.survey_store.put(current_survey_details)
+        except TypeError as exc: # A value the state backend can't store; nothing has been changed
+            self.logger.error("Survey %s can't be stored: %s", survey_params["survey_id"], exc)
+            return {"status": "error", "message": str(exc), "survey_id": survey_params["survey_id"]}
         
         # 2. Request Approval
-        print(f"[{self.name}] Requesting approval from {self.approval_agent.name}...")
+        self.logger.info("Requesting approval from %s...", self.approval_agent.name)
         approval_request_id, initial_status = self.approval_agent.request_approval(
             survey_details=current_survey_details,
             approver_contact=survey_params["approver_contact"]
         )
-        current_survey_details["approval_request_id"] = approval_request_id
-        current_survey_details["approval_status"] = initial_status # Should be 'pending'
+        self.survey_store.update(
+            survey_params["survey_id"],
+            approval_request_id=approval_request_id,
+            approval_status=initial_status # Should be 'pending'
+        )
         
-        print(f"[{self.name}] Survey '{current_survey_details['title']}' is now pending approval (Request ID: {approval_request_id}).")
+        self.logger.info("Survey '%s' is now pending approval (Request ID: %s).", current_survey_details['title'], approval_request_id)
         return {"status": "pending_approval", "survey_id": survey_params["survey_id"], "approval_request_id": approval_request_id}
 
-    def handle_approval_response(self, approval_request_id, approval_decision): # Renamed for clarity
+    def initiate_pulse_surveys(self, surveys, defaults=None):
+        """
+        Starts many pulse surveys in one call, e.g. a quarterly rollout to every team.
+        Each item of surveys takes the same keys as initiate_pulse_survey's survey_params;
+        defaults (e.g. topic, num_questions, approver_contact) fill in keys an item leaves out.
+        Surveys asking for the same question selection share one questionnaire lookup, and
+        all approval requests are created together. One bad item doesn't stop the others.
+        Returns {"results": [per-item result, in order], "counts": {status: n}}.
+        """
+        surveys = [{**(defaults or {}), **params} for params in surveys]
+        self.logger.info("Initiating %d pulse surveys.", len(surveys))
+        results = [None] * len(surveys)
+        seen_ids = set()
+        question_cache = {} # question selection: questions
+        ready = [] # (index, survey record)
+        for index, params in enumerate(surveys):
+            error = self._check_survey_params(params)
+            if not error and params["survey_id"] in seen_ids:
+                error = "Duplicate survey_id in this batch"
+            if error:
+                results[index] = {"status": "error", "message": error, "survey_id": params.get("survey_id")}
+                continue
+            seen_ids.add(params["survey_id"])
+            existing = self._existing_survey_result(params["survey_id"])
+            if existing:
+                results[index] = existing
+                continue
+            key = self._question_key(params)
+            questions = question_cache.get(key) if key is not None else None
+            if questions is None:
+                questions = self._get_questions(params)
+                if key is not None:
+                    question_cache[key] = questions
+            else:
+                questions = copy.deepcopy(questions) # Each survey record owns its questions
+            if not questions:
+                results[index] = {"status": "error", "message": "Failed to get questions", "survey_id": params["survey_id"]}
+                continue
+            ready.append((index, self._new_survey_record(params, questions)))
+
+        # Approval IDs are known before the surveys are stored, so each record is written and indexed once.
+        approvals = self.approval_agent.request_approvals([(record, record["approver_contact"]) for _, record in ready])
+        for (index, record), (approval_request_id, initial_status) in zip(ready, approvals):
+            record.update(approval_request_id=approval_request_id, approval_status=initial_status)
+            try:
+                self.survey_store.put(record)
+            except TypeError as exc: # A value the state backend can't store; its approval request is withdrawn
+                self.logger.error("Survey %s can't be stored: %s", record["survey_id"], exc)
+                self.approval_agent.record_approval_response(approval_request_id, "withdrawn")
+                results[index] = {"status": "error", "message": str(exc), "survey_id": record["survey_id"]}
+                continue
+            results[index] = {"status": "pending_approval", "survey_id": record["survey_id"], "approval_request_id": approval_request_id}
+        counts = Counter(result["status"] for result in results)
+        self.logger.info("Batch initiation finished: %s (%d distinct question selections).", dict(counts), len(question_cache))
+        return {"results": results, "counts": dict(counts)}
+
+    def _check_survey_params(self, survey_params):
+        """Returns an error message for survey parameters that can't be used, else None."""
+        missing = [key for key in ("survey_id", "title", "approver_contact") if not survey_params.get(key)]
+        if missing:
+            return f"Missing required field(s): {', '.join(missing)}"
+        selector = survey_params.get("target_audience_selector")
+        if selector:
+            return self._check_selector(selector)
+        return None
+
+    def _existing_survey_result(self, survey_id):
+        """
+        If a survey with this ID already exists, returns its current state instead of creating it
+        again (a repeated or retried initiate call must not overwrite it or open a second approval).
+        """
+        survey = self.survey_store.get(survey_id)
+        if survey is None:
+            return None
+        self.logger.warning("Survey %s already exists (status '%s'); not re-creating it.", survey_id, survey.get("status"))
+        return {"status": survey.get("status"), "survey_id": survey_id, "approval_request_id": survey.get("approval_request_id"),
+                "duplicate": True, "message": "A survey with this ID already exists; it was not re-created."}
+
+    def _question_key(self, survey_params):
+        """Identifies a survey's question selection, or None when it depends on earlier calls (exclude_recent_questions)."""
+        if survey_params.get("exclude_recent_questions"):
+            return None
+        return (survey_params.get("topic", "default"), survey_params.get("num_questions", 2),
+                tuple(sorted(survey_params.get("question_tags") or ())), survey_params.get("language"),
+                survey_params.get("question_type"), survey_params.get("question_seed"))
+
+    def _get_questions(self, survey_params):
+        return self.questionnaire_agent.get_survey_questions(
+            topic=survey_params.get("topic", "default"),
+            num_questions=survey_params.get("num_questions", 2),
+            tags=survey_params.get("question_tags"),
+            language=survey_params.get("language"),
+            question_type=survey_params.get("question_type"),
+            seed=survey_params.get("question_seed"),
+            exclude_recent=survey_params.get("exclude_recent_questions", False)
+        )
+
+    def _new_survey_record(self, survey_params, questions):
+        record = {
+            **survey_params,
+            "questions": questions,
+            "status": "pending_approval", # Initial status
+            "approval_request_id": None,
+            "approval_status": None
+        }
+        if survey_params.get("target_audience_selector"):
+            record["target_audience_emails"] = None # Resolved from the directory at send time
+        return record
+
+    def handle_approval_response(self, approval_request_id, approval_decision, wait=False): # Renamed for clarity
         """
         Process the response from the approval agent (or simulated user approval).
         approval_decision should be 'approved' or 'rejected'.
+        An approved survey is queued for dispatch and this returns straight away with status 'queued';
+        the survey then moves to 'sending' and finally 'sent' or 'send_failed' (see get_survey_status).
+        Pass wait=True to block until the invitations are out and get the final status instead.
         """
-        print(f"\n[{self.name}] Handling approval response for Request ID: {approval_request_id}, Decision: {approval_decision}")
+        self.logger.info("Handling approval response for Request ID: %s, Decision: %s", approval_request_id, approval_decision)
         
+        decided = self._already_decided_result(approval_request_id)
+        if decided:
+            return decided
+
         # Record the approval status with the Approval Agent
         # This ensures the ApprovalAgent's internal state is also updated.
-        if not self.approval_agent.record_approval_response(approval_request_id, approval_decision):
-            print(f"[{self.name}] Could not record approval response in Approval Agent for {approval_request_id}. Aborting.")
-            return {"status": "error", "message": f"Approval request ID {approval_request_id} not found in Approval Agent."}
+        recorded = self.approval_agent.record_approval_response(approval_request_id, approval_decision)
+        result, job = self._apply_approval(approval_request_id, approval_decision, recorded)
+        if wait and job is not None:
+            job.wait()
+            result["status"] = job.state
+        return result
+
+    def handle_approval_responses(self, decisions, wait=False):
+        """
+        Applies many approval decisions in one call. decisions is a list of
+        (approval_request_id, decision) pairs or {"approval_request_id": ..., "decision": ...} dicts.
+        All decisions are recorded with the approval agent together, and every approved survey is
+        queued for dispatch before any sending is waited on, so the sends run side by side.
+        A malformed item gets an error result; one bad item doesn't stop the others.
+        Returns {"results": [per-item result, in order], "counts": {status: n}}.
+        """
+        pairs = [self._decision_pair(d) for d in decisions]
+        self.logger.info("Handling %d approval responses.", len(pairs))
+        outcomes = [None] * len(pairs)
+        undecided = [] # (index, (request_id, decision))
+        repeated = [] # Indexes of requests that appear earlier in this batch
+        seen = set()
+        for index, pair in enumerate(pairs):
+            if isinstance(pair, str):
+                outcomes[index] = ({"status": "error", "message": pair}, None)
+                continue
+            request_id, decision = pair
+            if request_id in seen:
+                repeated.append(index)
+                continue
+            seen.add(request_id)
+            decided = self._already_decided_result(request_id)
+            if decided:
+                outcomes[index] = (decided, None)
+            else:
+                undecided.append((index, (request_id, decision)))
+        recorded = self.approval_agent.record_approval_responses([pair for _, pair in undecided])
+        for (index, (request_id, decision)), ok in zip(undecided, recorded):
+            outcomes[index] = self._apply_approval(request_id, decision, ok)
+        for index in repeated: # Decided by their first occurrence above
+            request_id = pairs[index][0]
+            outcomes[index] = (self._already_decided_result(request_id) or
+                               {"status": "error", "message": f"Approval request ID {request_id} not found in Approval Agent."}, None)
+        if wait:
+            for result, job in outcomes:
+                if job is not None:
+                    job.wait()
+                    result["status"] = job.state
+        results = [result for result, _ in outcomes]
+        counts = Counter(result["status"] for result in results)
+        self.logger.info("Batch approval finished: %s.", dict(counts))
+        return {"results": results, "counts": dict(counts)}
+
+    @staticmethod
+    def _decision_pair(item):
+        """Returns (approval_request_id, decision) for one batch item, or an error message if it's malformed."""
+        if isinstance(item, dict):
+            pair = (item.get("approval_request_id"), item.get("decision"))
+        elif isinstance(item, (list, tuple)) and len(item) == 2:
+            pair = tuple(item)
+        else:
+            return "Each decision must be an (approval_request_id, decision) pair or a dict with those keys"
+        if not pair[0] or not pair[1]:
+            return "Each decision needs both approval_request_id and decision"
+        return pair
+
+    def _already_decided_result(self, approval_request_id):
+        """
+        If the survey behind an approval request has already been decided, returns its current
+        state: a repeated decision must not flip it or send the invitations a second time.
+        """
+        survey = self.survey_store.find_by_approval_request(approval_request_id)
+        if survey is None or survey.get("status") == "pending_approval":
+            return None
+        self.logger.warning("Approval %s was already handled (survey %s is '%s'); ignoring the repeated decision.",
+                            approval_request_id, survey["survey_id"], survey.get("status"))
+        return {"status": survey.get("status"), "survey_id": survey["survey_id"], "approval_request_id": approval_request_id,
+                "duplicate": True, "message": f"This approval was already handled; the survey is '{survey.get('status')}'."}
+
+    def _apply_approval(self, approval_request_id, approval_decision, recorded):
+        """
+        Updates the survey behind an approval request that the approval agent has (or hasn't)
+        recorded, queueing approved surveys for dispatch. Returns (result, DispatchJob or None).
+        """
+        if not recorded:
+            self.logger.error("Could not record approval response in Approval Agent for %s. Aborting.", approval_request_id)
+            status = self.approval_agent.get_approval_status(approval_request_id)
+            if status != "not_found":
+                return {"status": "error", "message": f"Approval request ID {approval_request_id} was already decided ('{status}')."}, None
+            return {"status": "error", "message": f"Approval request ID {approval_request_id} not found in Approval Agent."}, None
 
         # Find the survey associated with this approval request in the orchestrator's active surveys
-        survey_to_update = None
-        survey_id_for_approval = None
-        for sid, details in self.active_surveys.items():
-            if details.get("approval_request_id") == approval_request_id:
-                survey_to_update = details
-                survey_id_for_approval = sid
-                break
+        survey_to_update = self.survey_store.find_by_approval_request(approval_request_id)
         
         if not survey_to_update:
-            print(f"[{self.name}] No active survey found in Orchestrator for approval request ID '{approval_request_id}'. This might indicate an inconsistency.")
+            self.logger.error("No active survey found in Orchestrator for approval request ID '%s'. This might indicate an inconsistency.", approval_request_id)
             # Even if not in active_surveys (should not happen if flow is correct), the approval_agent has recorded it.
-            return {"status": "error", "message": f"Survey not found in Orchestrator for approval ID {approval_request_id}"}
+            return {"status": "error", "message": f"Survey not found in Orchestrator for approval ID {approval_request_id}"}, None
 
-        survey_to_update["approval_status"] = approval_decision # Update orchestrator's copy
+        survey_id_for_approval = survey_to_update["survey_id"]
+        self.survey_store.update(survey_id_for_approval, approval_status=approval_decision) # Update orchestrator's copy
 
         if approval_decision == "approved":
-            survey_to_update["status"] = "approved_ready_to_send"
-            print(f"[{self.name}] Survey '{survey_to_update['title']}' (ID: {survey_id_for_approval}) approved.")
+            self.survey_store.update(survey_id_for_approval, status="approved_ready_to_send")
+            self.logger.info("Survey '%s' (ID: %s) approved.", survey_to_update['title'], survey_id_for_approval)
             
-            # 3. Send Survey Invitations
-            print(f"[{self.name}] Instructing {self.communication_agent.name} to send survey invitations...")
-            send_success = self.communication_agent.send_survey_invitations(
-                employee_emails=survey_to_update["target_audience_emails"],
-                survey_details=survey_to_update
+            # 3. Queue the survey invitations; the dispatch queue sends them in the background
+            self.logger.info("Queueing survey invitations for %s...", self.communication_agent.name)
+            job = self._queue_dispatch(survey_id_for_approval)
+            return {"status": "queued", "survey_id": survey_id_for_approval, "approval_request_id": approval_request_id}, job
+        else: # 'rejected' or any other non-approved status
+            self.survey_store.update(survey_id_for_approval, status="rejected")
+            self.logger.info("Survey '%s' (ID: %s) was '%s'. No emails will be sent.", survey_to_update['title'], survey_id_for_approval, approval_decision)
+            return {"status": "rejected", "survey_id": survey_id_for_approval, "approval_request_id": approval_request_id}, None
+
+    def _queue_dispatch(self, survey_id, only_failed=False):
+        """
+        Hands a survey's invitations to the dispatch queue and returns the DispatchJob.
+        With only_failed, recipients marked failed in the survey's delivery ledger are retried
+        and everyone else is skipped.
+        """
+        self.survey_store.update(survey_id, status="queued")
+        ledger = self.delivery_ledger(survey_id) if only_failed else DeliveryLedger()
+        self._delivery_ledgers[survey_id] = ledger
+
+        def run(job):
+            survey = self.survey_store.get(survey_id)
+            if self.message_bus is not None:
+                recipients = self.communication_agent.invitation_recipients(
+                    self._audience_for(survey), job.report, ledger, only_failed)
+                return self._send_over_bus(survey, job, recipients, ledger, retrying=only_failed)
+            return self.communication_agent.send_survey_invitations(
+                employee_emails=self._audience_for(survey),
+                survey_details=survey,
+                report=job.report,
+                ledger=ledger,
+                only_failed=only_failed
             )
-            if send_success:
-                survey_to_update["status"] = "sent"
-                print(f"[{self.name}] Survey '{survey_to_update['title']}' invitations have been sent.")
-                return {"status": "sent", "survey_id": survey_id_for_approval}
+
+        return self.dispatch_queue.submit(
+            survey_id, run,
+            on_start=lambda job: self.survey_store.update(survey_id, status="sending"),
+            on_finish=self._finish_dispatch
+        )
+
+    def resume_dispatches(self):
+        """
+        Picks up dispatches a restart interrupted, for surveys loaded back from the backend.
+        Approved and queued surveys hadn't started sending and are queued again (a queued retry
+        again only to its failed recipients). Surveys caught part-way through sending are marked
+        'send_failed', so retry_failed_invitations can finish them.
+        Returns {'requeued': [survey_id, ...], 'interrupted': [survey_id, ...]}.
+        """
+        requeued, interrupted = [], []
+        for status in ("approved_ready_to_send", "queued", "sending"):
+            for survey in self.survey_store.query(status=status):
+                survey_id = survey["survey_id"]
+                job = self.dispatch_queue.get(survey_id)
+                if job is not None and not job.done:
+                    continue # Queued by this process, not left over from a previous one
+                if status == "sending":
+                    self.survey_store.update(survey_id, status="send_failed")
+                    interrupted.append(survey_id)
+                else:
+                    ledger = self.delivery_ledger(survey_id)
+                    self._queue_dispatch(survey_id, only_failed=ledger is not None and ledger.failed_count > 0)
+                    requeued.append(survey_id)
+        if requeued or interrupted:
+            self.logger.warning("Resumed dispatches after restart: %d queued again, %d interrupted while sending (now send_failed).",
+                                len(requeued), len(interrupted))
+        return {"requeued": requeued, "interrupted": interrupted}
+
+    def _send_over_bus(self, survey, job, recipients, ledger=None, reminder=False, retrying=False):
+        """
+        Sends invitations (or reminders) through the message bus, to (position, (email, name))
+        recipients already filtered here (suppression, ledger, responses), so workers in other
+        processes never act on a stale suppression list. Recipients go out bus_chunk_size at a
+        time with at most bus_chunks_in_flight chunks outstanding, so a streamed audience is never
+        held in memory whole and job.report shows progress as chunks complete. A chunk that fails
+        on the bus counts its recipients as failed. Each outcome is marked in ledger, if given.
+        """
+        report = job.report
+        survey_details = {key: value for key, value in survey.items() if key != "target_audience_emails"}
+        in_flight = deque() # (future, chunk)
+        queued = 0
+
+        def fold(future, chunk):
+            try:
+                outcome = future.result()
+            except MessageError as exc:
+                self.logger.warning("Chunk of %d emails for survey %s failed on the bus: %s", len(chunk), survey["survey_id"], exc)
+                if not retrying:
+                    report["failed"] += len(chunk)
+                if ledger is not None:
+                    for position, _ in chunk:
+                        ledger.mark(position, FAILED)
+                return
+            counts = outcome["report"]
+            report["sent"] += counts["sent"]
+            report["suppressed"] += counts["suppressed"] # Suppressed by the worker since we filtered
+            if retrying:
+                report["failed"] -= counts["sent"] + counts["suppressed"]
+                report["total"] -= counts["suppressed"]
             else:
-                survey_to_update["status"] = "send_failed"
-                print(f"[{self.name}] Failed to send all invitations for survey '{survey_to_update['title']}'.")
-                return {"status": "send_failed", "survey_id": survey_id_for_approval}
-        else: # 'rejected' or any other non-approved status
-            survey_to_update["status"] = "rejected"
-            print(f"[{self.name}] Survey '{survey_to_update['title']}' (ID: {survey_id_for_approval}) was '{approval_decision}'. No emails will be sent.")
-            return {"status": "rejected", "survey_id": survey_id_for_approval}
+                report["failed"] += counts["failed"]
+            if ledger is not None:
+                for (position, _), status in zip(chunk, outcome["statuses"]):
+                    ledger.mark(position, status)
+
+        recipients = iter(recipients)
+        while True:
+            chunk = list(islice(recipients, self.bus_chunk_size))
+            if not chunk:
+                break
+            if not retrying:
+                queued += len(chunk)
+                report["total"] = max(report["total"], queued)
+            in_flight.append((self.message_bus.submit(self.send_route, "send_to_recipients", {
+                "recipients": [recipient for _, recipient in chunk],
+                "survey_details": survey_details,
+                "reminder": reminder
+            }, sender=self.name), chunk))
+            if len(in_flight) >= self.bus_chunks_in_flight:
+                fold(*in_flight.popleft())
+        while in_flight:
+            fold(*in_flight.popleft())
+        if not retrying:
+            report["total"] = report["sent"] + report["failed"]
+        return report["sent"] == report["total"]
+
+    def _finish_dispatch(self, job):
+        report = job.report
+        ledger = self._delivery_ledgers.get(job.survey_id)
+        if ledger is not None:
+            self.survey_store.backend.save_delivery_ledger(job.survey_id, ledger.to_bytes())
+        self.survey_store.update(job.survey_id, status=job.state, recipient_count=report.get("total"),
+                                 sent_count=report.get("sent"), failed_count=report.get("failed"),
+                                 suppressed_count=report.get("suppressed"))
+        if job.state == "sent":
+            self.logger.info("Survey %s invitations have been sent.", job.survey_id)
+        else:
+            self.logger.warning("Failed to send all invitations for survey %s (%d/%d sent).", job.survey_id,
+                                report.get("sent", 0), report.get("total", 0))
+        if report.get("sent"):
+            self._schedule_next_reminder(job.survey_id)
+
+    def _schedule_next_reminder(self, survey_id):
+        """
+        Schedules the survey's next reminder, if it has any left and none is pending.
+        Offsets count from when the invitations first went out, so a retry doesn't push reminders back.
+        The due time is saved with the survey as next_reminder_at, so a restart can pick it up again.
+        """
+        scheduler = self.reminder_scheduler
+        if scheduler is None or scheduler.due_time(survey_id) is not None:
+            return
+        survey = self.survey_store.get(survey_id)
+        reminders = survey.get("reminders") or []
+        if len(reminders) >= len(self.reminder_offsets):
+            self._clear_next_reminder(survey_id)
+            return
+        invited_at = survey.get("invited_at")
+        if invited_at is None:
+            invited_at = scheduler.clock()
+        number = len(reminders) + 1
+        due = invited_at + self.reminder_offsets[number - 1]
+        self.survey_store.update(survey_id, invited_at=invited_at, next_reminder_at=due)
+        scheduler.schedule(survey_id, due, lambda: self._queue_reminder(survey_id, number))
+
+    def _clear_next_reminder(self, survey_id):
+        survey = self.survey_store.get(survey_id)
+        if survey is not None and survey.get("next_reminder_at") is not None:
+            self.survey_store.update(survey_id, next_reminder_at=None)
+
+    def resume_reminders(self):
+        """
+        Schedules the pending reminders of sent surveys held by the survey store, e.g. after a
+        restart (the store loads surveys with a reminder due at startup). Reminders that fell due
+        while the service was down fire straight away.
+        Returns how many surveys have a reminder scheduled.
+        """
+        if self.reminder_scheduler is None:
+            return 0
+        for status in ("sent", "send_failed"):
+            for survey in self.survey_store.query(status=status):
+                if survey.get("invited_at") is not None:
+                    self._schedule_next_reminder(survey["survey_id"])
+        return len(self.reminder_scheduler)
+
+    def _queue_reminder(self, survey_id, number):
+        """
+        Called by the reminder scheduler: queues reminder emails to the survey's recipients who
+        received the invitation but haven't responded. Runs on the dispatch queue, like invitations.
+        """
+        survey = self.survey_store.get(survey_id)
+        if not survey or survey["status"] not in ("sent", "send_failed"):
+            return None # Withdrawn or being re-sent; a finished retry schedules the reminder again
+        ledger = self.delivery_ledger(survey_id)
+        responses = self.response_agent.responses.get(survey_id)
+        if ledger is not None and responses is not None and responses.respondent_count >= ledger.sent_count:
+            self.logger.info("Everyone has responded to survey %s; no more reminders.", survey_id)
+            self._clear_next_reminder(survey_id)
+            return None
+
+        def has_responded(email, token):
+            return responses is not None and (responses.has_responded(email) or responses.has_responded(token))
+
+        def run(job):
+            if self.message_bus is not None:
+                recipients = self.communication_agent.reminder_recipients(
+                    self._audience_for(survey), survey, has_responded, job.report, ledger=ledger)
+                return self._send_over_bus(survey, job, recipients, reminder=True)
+            return self.communication_agent.send_survey_reminders(
+                self._audience_for(survey), survey, has_responded, ledger=ledger, report=job.report)
 
-    def get_survey_status(self, survey_id):
-        """Gets the status of a specific survey."""
-        survey = self.active_surveys.get(survey_id)
+        def finish(job):
+            reminders = list(self.survey_store.get(survey_id).get("reminders") or [])
+            reminders.append({"number": number, "sent": job.report.get("sent"), "failed": job.report.get("failed"),
+                              "skipped_responded": job.report.get("responded"), "at": self.reminder_scheduler.clock()})
+            self.survey_store.update(survey_id, reminders=reminders)
+            if job.report.get("sent"): # Nobody left to remind otherwise
+                self._schedule_next_reminder(survey_id)
+            else:
+                self._clear_next_reminder(survey_id)
+
+        self.logger.info("Queueing reminder %d for survey %s.", number, survey_id)
+        return self.dispatch_queue.submit(f"{survey_id}:reminder{number}", run, on_finish=finish)
+
+    def delivery_ledger(self, survey_id):
+        """Returns the DeliveryLedger of a survey's latest dispatch (loading it from the backend if needed), or None."""
+        ledger = self._delivery_ledgers.get(survey_id)
+        if ledger is None:
+            statuses = self.survey_store.backend.load_delivery_ledger(survey_id)
+            if statuses is not None:
+                ledger = self._delivery_ledgers[survey_id] = DeliveryLedger(statuses)
+        return ledger
+
+    def retry_failed_invitations(self, survey_id, wait=False):
+        """
+        Re-sends invitations only to the recipients whose delivery failed, for a survey in
+        'send_failed' status. Like an approval, the retry is queued and this returns 'queued'
+        unless wait=True.
+        A survey whose sending was interrupted by a restart before any delivery record was saved
+        is sent to everyone again, so some recipients may get a second invitation.
+        """
+        survey = self.survey_store.get(survey_id)
+        if not survey:
+            return {"status": "error", "message": "Survey ID not found", "survey_id": survey_id}
+        if survey["status"] != "send_failed":
+            return {"status": "error", "message": f"Survey is '{survey['status']}'; only 'send_failed' surveys can be retried", "survey_id": survey_id}
+        ledger = self.delivery_ledger(survey_id)
+        if ledger is None:
+            self.logger.warning("No delivery record for survey %s; sending all of its invitations again.", survey_id)
+            failed = survey.get("recipient_count") # None until the audience has been counted
+        else:
+            failed = ledger.failed_count
+            self.logger.info("Retrying %d failed invitations for survey %s.", failed, survey_id)
+        job = self._queue_dispatch(survey_id, only_failed=ledger is not None)
+        if wait:
+            job.wait()
+            return {"status": job.state, "survey_id": survey_id, "retried": failed, "failed": job.report.get("failed")}
+        return {"status": "queued", "survey_id": survey_id, "retried": failed}
+
+    def _check_selector(self, selector):
+        """Returns an error message if an audience selector can't be used, else None."""
+        if self.directory is None:
+            return "No employee directory is configured, so target_audience_selector can't be used."
+        try:
+            count = self.directory.count(selector)
+        except SelectorError as e:
+            return f"Invalid audience selector: {e}"
+        if not count:
+            return f"Audience selector '{selector}' matches no employees."
+        return None
+
+    def preview_audience(self, selector, sample_size=5):
+        """Resolves an audience selector and returns its size with a few sample recipients."""
+        error = self._check_selector(selector)
+        if error:
+            return {"status": "error", "message": error}
+        positions = self.directory.select(selector)
+        sample = [email for email, _ in islice(self.directory.recipients(selector), sample_size)]
+        return {"status": "ok", "selector": selector, "audience_size": len(positions), "sample": sample}
+
+    def _audience_for(self, survey):
+        """
+        Returns the survey's recipients as an iterable: resolved from the directory for a selector,
+        streamed from CSV when one was given, else the stored list.
+        """
+        if survey.get("target_audience_selector"):
+            if self.directory is None:
+                raise RuntimeError(f"Survey {survey['survey_id']} selects its audience from the employee directory, but none is configured")
+            return self.directory.recipients(survey["target_audience_selector"])
+        if survey.get("target_audience_csv"):
+            return iter_recipients_from_csv(survey["target_audience_csv"])
+        return survey.get("target_audience_emails") or []
+
+    def record_survey_responses(self, survey_id, responses):
+        """
+        Stores answers for a sent survey.
+        responses is an iterable of (respondent, {question_id: score}, segment) tuples;
+        respondent is the recipient's email (or survey token) and segment an optional label.
+        """
+        survey = self.survey_store.get(survey_id)
+        if not survey:
+            return {"status": "error", "message": "Survey ID not found", "survey_id": survey_id}
+        # Early recipients can answer while the rest are still being sent, and those reached by a partly failed dispatch can too
+        if survey["status"] not in ("sending", "sent", "send_failed"):
+            return {"status": "error", "message": f"Survey is '{survey['status']}', not accepting responses", "survey_id": survey_id}
+        self.response_agent.open_survey(survey_id, survey["questions"])
+        return self.response_agent.record_responses(survey_id, responses)
+
+    def summarize_survey(self, survey, fields=None):
+        """
+        Returns a compact projection of a survey record: counts instead of the audience and
+        question lists. fields selects which keys to return (see SUMMARY_FIELDS and
+        DETAIL_FIELDS); by default all SUMMARY_FIELDS are returned.
+        """
+        wanted = SUMMARY_FIELDS if not fields else [f for f in fields if f in SUMMARY_FIELDS or f in DETAIL_FIELDS]
+        audience = survey.get("target_audience_emails")
+        live = None
+        summary = {}
+        for field in wanted:
+            if field == "audience_size":
+                value = survey.get("recipient_count")
+                if value is None and isinstance(audience, (list, tuple)):
+                    value = len(audience)
+                elif value is None and survey.get("target_audience_selector") and self.directory is not None:
+                    value = self.directory.count(survey["target_audience_selector"]) # Memoized by the directory
+            elif field == "audience_source":
+                if survey.get("target_audience_selector"):
+                    value = "directory"
+                else:
+                    value = "csv" if survey.get("target_audience_csv") else "list"
+            elif field == "dispatch":
+                job = self.dispatch_queue.get(survey["survey_id"])
+                value = job.progress() if job is not None else None
+            elif field == "sent_count" and survey.get("status") in ("queued", "sending"):
+                job = self.dispatch_queue.get(survey["survey_id"])
+                value = job.report.get("sent", 0) if job is not None else survey.get(field)
+            elif field == "next_reminder_at":
+                value = self.reminder_scheduler.due_time(survey["survey_id"]) if self.reminder_scheduler is not None else None
+            elif field == "num_questions":
+                value = len(survey.get("questions") or ())
+            elif field in ("respondents", "response_rate", "live_results"):
+                if live is None:
+                    live = self.response_agent.live_summary(survey["survey_id"], survey.get("recipient_count")) or {}
+                value = live if field == "live_results" else live.get(field)
+            else:
+                value = survey.get(field)
+            summary[field] = value
+        return summary
+
+    def get_survey_status(self, survey_id, fields=None):
+        """
+        Gets the status of a specific survey as a compact summary (see summarize_survey).
+        Pass fields=['questions', 'live_results', ...] for more detail.
+        """
+        survey = self.survey_store.get(survey_id)
         if survey:
-            return survey
+            return self.summarize_survey(survey, fields)
         return {"status": "error", "message": "Survey ID not found"}
 
-    def list_active_surveys(self):
-        """Lists all active surveys and their current status."""
-        if not self.active_surveys:
-            print(f"[{self.name}] No active surveys.")
-            return {}
-        print(f"[{self.name}] Current Active Surveys:")
-        for sid, details in self.active_surveys.items():
-            print(f"  ID: {sid}, Title: {details['title']}, Status: {details['status']}, Approval: {details.get('approval_status', 'N/A')}")
-        return self.active_surveys
+    def get_survey_results(self, survey_id, group_by="question"):
+        """Gets aggregated results for a survey, grouped by 'question', 'topic', 'segment' or 'overall'."""
+        if not self.survey_store.get(survey_id):
+            return {"status": "error", "message": "Survey ID not found", "survey_id": survey_id}
+        return self.response_agent.get_results(survey_id, group_by=group_by)
+
+    def list_active_surveys(self, status=None, approver=None, cursor=None, limit=DEFAULT_PAGE_SIZE, fields=None):
+        """
+        Lists active surveys and their current status, one page at a time, oldest first.
+        Optionally filtered by status and/or approver_contact, using the store's indexes.
+        Returns {"surveys": [summary, ...], "next_cursor": ..., "total": ...}; pass next_cursor
+        back as cursor to fetch the following page (it is None on the last page).
+        limit defaults to DEFAULT_PAGE_SIZE and is capped at MAX_PAGE_SIZE.
+        """
+        try:
+            after = int(cursor) if cursor else None
+        except ValueError:
+            return {"status": "error", "message": f"Invalid cursor '{cursor}'"}
+        try:
+            limit = DEFAULT_PAGE_SIZE if limit is None else int(limit)
+        except (TypeError, ValueError):
+            limit = 0
+        if limit <= 0:
+            return {"status": "error", "message": "limit must be a positive number"}
+        limit = min(limit, MAX_PAGE_SIZE)
+        surveys, last_seq = self.survey_store.page(status=status, approver=approver, after=after, limit=limit)
+        if not surveys:
+            self.logger.info("No active surveys.")
+        else:
+            self.logger.info("Listing %d active surveys.", len(surveys))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for details in surveys:
+                self.logger.debug("  ID: %s, Title: %s, Status: %s, Approval: %s", details['survey_id'], details['title'], details['status'], details.get('approval_status', 'N/A'))
+        return {
+            "surveys": [self.summarize_survey(details, fields) for details in surveys],
+            "next_cursor": str(last_seq) if last_seq is not None else None,
+            "total": self.survey_store.count(status=status, approver=approver)
+        }
@@ -0,0 +1,321 @@
+# employee_pulse_survey_project/agents/persistence.py
+
+import atexit
+import json
+import os
+import threading
+from collections.abc import Iterator
+
+from .logging_config import get_logger
+
+# Surveys in these states never change again, so they are not loaded back into memory at startup
+# (unless a reminder is still due; see the reminder_due column).
+TERMINAL_STATUSES = ("sent", "rejected")
+
+
+class InMemoryBackend:
+    """
+    Default persistence backend: state lives only in the agents' own dicts and is lost on restart.
+    """
+    def save_survey(self, survey, include_audience=False):
+        pass
+
+    def save_approval(self, request_id, approval):
+        pass
+
+    def save_delivery_ledger(self, survey_id, statuses):
+        pass
+
+    def load_open_surveys(self):
+        return []
+
+    def load_survey(self, survey_id):
+        return None
+
+    def load_survey_by_approval_request(self, approval_request_id):
+        return None
+
+    def load_pending_approvals(self):
+        return {}
+
+    def load_approval(self, request_id):
+        return None
+
+    def last_approval_id(self):
+        return None
+
+    def load_delivery_ledger(self, survey_id):
+        return None
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SQLiteBackend:
+    """
+    Durable persistence in a SQLite file (WAL journal).
+    Writes are buffered and committed together, either when batch_size records are pending
+    or flush_interval seconds after the first buffered write, whichever comes first.
+    Repeated saves of the same record inside one window collapse into a single row write,
+    so a survey moving through several statuses quickly costs one commit, not one per transition.
+    Records are encoded when saved, so one that can't be persisted raises TypeError from the save
+    call, before anything is buffered, rather than failing a later flush.
+    Call flush() when a write must be on disk before continuing.
+    """
+    _UPSERT_SURVEY = (
+        "INSERT INTO surveys (survey_id, status, approval_request_id, approver, payload, audience, reminder_due) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT(survey_id) DO UPDATE SET status = excluded.status, "
+        "approval_request_id = excluded.approval_request_id, approver = excluded.approver, "
+        "payload = excluded.payload, audience = COALESCE(excluded.audience, surveys.audience), "
+        "reminder_due = excluded.reminder_due"
+    )
+    _UPSERT_APPROVAL = (
+        "INSERT INTO approvals (request_id, status, survey_id, payload) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(request_id) DO UPDATE SET status = excluded.status, payload = excluded.payload"
+    )
+    _UPSERT_DELIVERY = (
+        "INSERT INTO deliveries (survey_id, statuses) VALUES (?, ?) "
+        "ON CONFLICT(survey_id) DO UPDATE SET statuses = excluded.statuses"
+    )
+
+    def __init__(self, path, batch_size=500, flush_interval=0.2):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        import sqlite3 # Only needed when SQLite persistence is actually configured
+        # isolation_level=None: transactions are opened explicitly in _write_pending.
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL") # With WAL, commits don't fsync; checkpoints do
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS surveys (
+                survey_id TEXT PRIMARY KEY,
+                status TEXT,
+                approval_request_id TEXT,
+                approver TEXT,
+                payload TEXT NOT NULL,
+                audience TEXT
+            );
+            CREATE TABLE IF NOT EXISTS approvals (
+                request_id TEXT PRIMARY KEY,
+                status TEXT,
+                survey_id TEXT,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS approvals_status ON approvals (status);
+            CREATE TABLE IF NOT EXISTS deliveries (
+                survey_id TEXT PRIMARY KEY,
+                statuses BLOB NOT NULL
+            );
+        """)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(surveys)")]
+        if "reminder_due" not in columns: # Databases created before reminders were persisted
+            self._conn.execute("ALTER TABLE surveys ADD COLUMN reminder_due REAL")
+        self._conn.executescript("""
+            CREATE INDEX IF NOT EXISTS surveys_status ON surveys (status);
+            CREATE INDEX IF NOT EXISTS surveys_approval_request ON surveys (approval_request_id);
+            CREATE INDEX IF NOT EXISTS surveys_reminder_due ON surveys (reminder_due) WHERE reminder_due IS NOT NULL;
+        """)
+        self._pending_surveys = {} # survey_id: row (latest write wins)
+        self._pending_approvals = {} # request_id: row
+        self._pending_deliveries = {} # survey_id: ledger bytes
+        self._lock = threading.Lock()
+        self._timer = None
+        self._closed = False
+        self.logger = get_logger("SQLiteBackend")
+        atexit.register(self.close)
+
+    # --- Writes ---
+
+    def save_survey(self, survey, include_audience=False):
+        """
+        Buffers a survey write. The audience list is large and never changes after creation,
+        so it is only written when include_audience is True.
+        """
+        survey_id = survey["survey_id"]
+        payload = _encode({k: v for k, v in survey.items() if k != "target_audience_emails"}, f"survey {survey_id}")
+        audience = survey.get("target_audience_emails") if include_audience else None
+        audience = _encode(audience, f"survey {survey_id} audience") if isinstance(audience, (list, tuple)) else None
+        row = [survey_id, survey.get("status"), survey.get("approval_request_id"),
+               survey.get("approver_contact"), payload, audience, survey.get("next_reminder_at")]
+        with self._lock:
+            previous = self._pending_surveys.get(row[0])
+            if previous is not None and row[5] is None:
+                row[5] = previous[5] # Keep an audience that hasn't been written yet
+            self._pending_surveys[row[0]] = row
+            self._after_write_locked()
+
+    def save_approval(self, request_id, approval):
+        payload = {k: v for k, v in approval.items() if k != "survey_details"}
+        survey_id = (approval.get("survey_details") or {}).get("survey_id")
+        payload["survey_id"] = survey_id
+        payload = _encode(payload, f"approval {request_id}")
+        with self._lock:
+            self._pending_approvals[request_id] = (request_id, approval.get("status"), survey_id, payload)
+            self._after_write_locked()
+
+    def save_delivery_ledger(self, survey_id, statuses):
+        """Buffers a survey's per-recipient delivery statuses (DeliveryLedger.to_bytes())."""
+        with self._lock:
+            self._pending_deliveries[survey_id] = bytes(statuses)
+            self._after_write_locked()
+
+    def _after_write_locked(self):
+        if len(self._pending_surveys) + len(self._pending_approvals) + len(self._pending_deliveries) >= self.batch_size:
+            # The caller has already changed its own state, so a failed write is logged rather than
+            # raised here; the batch stays buffered and the next flush retries it.
+            try:
+                self._write_pending_locked()
+            except Exception:
+                self.logger.exception("Writing buffered state to %s failed.", self.path)
+        elif self._timer is None and self.flush_interval is not None:
+            self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Commits all buffered writes in one transaction."""
+        with self._lock:
+            self._write_pending_locked()
+
+    def _flush_from_timer(self):
+        # Nobody is waiting on a timed flush, so a failure is logged here rather than lost in the timer thread.
+        try:
+            self.flush()
+        except Exception:
+            self.logger.exception("Flushing buffered state to %s failed.", self.path)
+
+    def _write_pending_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._closed or not (self._pending_surveys or self._pending_approvals or self._pending_deliveries):
+            return
+        surveys, self._pending_surveys = self._pending_surveys, {}
+        approvals, self._pending_approvals = self._pending_approvals, {}
+        deliveries, self._pending_deliveries = self._pending_deliveries, {}
+        try:
+            self._conn.execute("BEGIN")
+            try:
+                # executemany reuses one prepared statement for every row.
+                self._conn.executemany(self._UPSERT_SURVEY, surveys.values())
+                self._conn.executemany(self._UPSERT_APPROVAL, approvals.values())
+                self._conn.executemany(self._UPSERT_DELIVERY, deliveries.items())
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        except Exception:
+            # Nothing was written; put the batch back so the next flush retries it.
+            # (The lock is held throughout, so no newer write for these keys can be buffered.)
+            surveys.update(self._pending_surveys)
+            approvals.update(self._pending_approvals)
+            deliveries.update(self._pending_deliveries)
+            self._pending_surveys, self._pending_approvals, self._pending_deliveries = surveys, approvals, deliveries
+            raise
+
+    # --- Reads ---
+
+    def _decode_survey(self, payload, audience):
+        survey = json.loads(payload)
+        if audience is not None:
+            survey["target_audience_emails"] = json.loads(audience)
+        return survey
+
+    def load_open_surveys(self):
+        """Returns all surveys that are not in a terminal status or still have a reminder due, oldest first."""
+        self.flush()
+        placeholders = ", ".join("?" for _ in TERMINAL_STATUSES)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT payload, audience FROM surveys WHERE status NOT IN ({placeholders}) OR reminder_due IS NOT NULL "
+                "ORDER BY rowid",
+                TERMINAL_STATUSES
+            ).fetchall()
+        return [self._decode_survey(payload, audience) for payload, audience in rows]
+
+    def load_survey(self, survey_id):
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT payload, audience FROM surveys WHERE survey_id = ?", (survey_id,)).fetchone()
+        return self._decode_survey(*row) if row else None
+
+    def load_survey_by_approval_request(self, approval_request_id):
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT payload, audience FROM surveys WHERE approval_request_id = ?",
+                                     (approval_request_id,)).fetchone()
+        return self._decode_survey(*row) if row else None
+
+    def load_pending_approvals(self):
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute("SELECT request_id, payload FROM approvals WHERE status = 'pending' ORDER BY rowid").fetchall()
+        return {request_id: _decode_approval(payload) for request_id, payload in rows}
+
+    def load_approval(self, request_id):
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM approvals WHERE request_id = ?", (request_id,)).fetchone()
+        return _decode_approval(row[0]) if row else None
+
+    def last_approval_id(self):
+        """The most recently created approval request ID (upserts keep a row's rowid)."""
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT request_id FROM approvals ORDER BY rowid DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def load_delivery_ledger(self, survey_id):
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT statuses FROM deliveries WHERE survey_id = ?", (survey_id,)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._write_pending_locked()
+            except Exception:
+                self.logger.exception("Writing buffered state to %s on close failed.", self.path)
+            self._closed = True
+            self._conn.close()
+
+
+def _decode_approval(payload):
+    approval = json.loads(payload)
+    # The full survey record isn't duplicated on disk; keep a minimal reference for context.
+    approval["survey_details"] = {"survey_id": approval.pop("survey_id", None), "title": approval.get("survey_title")}
+    return approval
+
+
+def _encode(value, label):
+    """JSON-encodes a record for storage, raising TypeError naming the record if it can't be."""
+    try:
+        return json.dumps(value, default=_json_default)
+    except (TypeError, ValueError) as exc:
+        raise TypeError(f"Not persisted: {label}: {exc}") from exc
+
+
+def _json_default(value):
+    # One-shot iterables (e.g. a generator passed as the audience) can't be persisted, and reading
+    # them here would consume them; they are stored as null. Anything else is a bug worth surfacing.
+    if isinstance(value, Iterator):
+        return None
+    raise TypeError(f"Object of type {type(value).__name__} can't be persisted")
+
+
+def backend_from_env():
+    """
+    Returns a SQLiteBackend when PULSE_STATE_DB points at a database file, else an InMemoryBackend.
+    """
+    path = os.getenv("PULSE_STATE_DB")
+    if path:
+        return SQLiteBackend(path)
+    return InMemoryBackend()
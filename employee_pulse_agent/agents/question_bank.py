@@ -0,0 +1,110 @@
+# employee_pulse_survey_project/agents/question_bank.py
+
+import csv
+import json
+import random
+from functools import lru_cache
+
+# The built-in questions, used when no question bank file is configured.
+DEFAULT_QUESTIONS = [
+    {"id": "eng1", "topic": "engagement", "text": "How motivated are you at work?"},
+    {"id": "eng2", "topic": "engagement", "text": "Do you feel your contributions are valued?"},
+    {"id": "wel1", "topic": "wellness", "text": "How would you rate your current work-life balance?"},
+    {"id": "wel2", "topic": "wellness", "text": "Do you have access to resources that support your well-being?"},
+    {"id": "def1", "topic": "default", "text": "Any other feedback you would like to share?"},
+]
+
+
+class QuestionBank:
+    """
+    A read-only question library with an index over topic, tag, language and question type.
+    Each question is a dict with 'id', 'topic' and 'text', plus optional 'tags' (list),
+    'language' (default 'en') and 'type' (default 'rating').
+    Selections are memoized in an LRU cache, so repeated requests for the same survey shape
+    don't touch the index again. Callers get copies of the questions, never the bank's own dicts.
+    """
+    def __init__(self, questions, cache_size=256):
+        self._questions = []
+        self._index = {"topic": {}, "tag": {}, "language": {}, "type": {}} # field: {value: {position, ...}}
+        for question in questions:
+            question = dict(question)
+            position = len(self._questions)
+            question.setdefault("language", "en")
+            question.setdefault("type", "rating")
+            question.setdefault("tags", [])
+            self._questions.append(question)
+            self._index["topic"].setdefault(question.get("topic"), set()).add(position)
+            self._index["language"].setdefault(question["language"], set()).add(position)
+            self._index["type"].setdefault(question["type"], set()).add(position)
+            for tag in question["tags"]:
+                self._index["tag"].setdefault(tag, set()).add(position)
+        self._select_cached = lru_cache(maxsize=cache_size)(self._select)
+
+    @classmethod
+    def from_file(cls, path, cache_size=256):
+        """
+        Loads questions from a .json (list of objects), .jsonl (one object per line) or .csv file.
+        CSV files need id, topic and text columns; tags may be separated with ';'.
+        """
+        if path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as f:
+                questions = [json.loads(line) for line in f if line.strip()]
+        elif path.endswith(".csv"):
+            with open(path, newline="", encoding="utf-8") as f:
+                questions = []
+                for row in csv.DictReader(f):
+                    row["tags"] = [tag.strip() for tag in (row.get("tags") or "").split(";") if tag.strip()]
+                    questions.append({k: v for k, v in row.items() if v not in (None, "")})
+        else:
+            with open(path, encoding="utf-8") as f:
+                questions = json.load(f)
+        return cls(questions, cache_size=cache_size)
+
+    def __len__(self):
+        return len(self._questions)
+
+    def topics(self):
+        return list(self._index["topic"])
+
+    def select(self, topic=None, tags=(), language=None, question_type=None, num_questions=None, seed=None, exclude_ids=()):
+        """
+        Returns questions matching every given criterion (a question must carry all of tags).
+        Without a seed the first num_questions matches are returned in bank order; with a seed
+        a reproducible random sample is drawn. Questions whose IDs are in exclude_ids are skipped.
+        A negative num_questions selects nothing.
+        """
+        if num_questions is not None:
+            num_questions = max(0, int(num_questions))
+        key_tags = tuple(sorted(set(tags or ())))
+        selected = self._select_cached(topic, key_tags, language, question_type, num_questions, seed, frozenset(exclude_ids or ()))
+        return [dict(question, tags=list(question["tags"])) for question in selected]
+
+    def _select(self, topic, tags, language, question_type, num_questions, seed, exclude_ids):
+        buckets = []
+        for field, value in (("topic", topic), ("language", language), ("type", question_type)):
+            if value is not None:
+                buckets.append(self._index[field].get(value, set()))
+        buckets.extend(self._index["tag"].get(tag, set()) for tag in tags)
+
+        if buckets:
+            buckets.sort(key=len) # Intersect starting from the rarest criterion
+            positions = sorted(buckets[0].intersection(*buckets[1:]))
+        else:
+            positions = range(len(self._questions))
+        candidates = [self._questions[p] for p in positions]
+        if exclude_ids:
+            candidates = [q for q in candidates if q["id"] not in exclude_ids]
+
+        if num_questions is None or num_questions >= len(candidates):
+            if seed is not None:
+                random.Random(seed).shuffle(candidates)
+            return tuple(candidates)
+        if seed is None:
+            return tuple(candidates[:num_questions])
+        return tuple(random.Random(seed).sample(candidates, num_questions))
+
+    def cache_info(self):
+        return self._select_cached.cache_info()
+
+    def clear_cache(self):
+        self._select_cached.cache_clear()
@@ -1,37 +1,43 @@
 # employee_pulse_survey_project/agents/questionnaire_agent.py
 
+from collections import deque
+
 from .base_agent import BaseAgent
+from .question_bank import DEFAULT_QUESTIONS, QuestionBank
 
 class PulseQuestionnaireAgent(BaseAgent):
     """
     Manages survey questions.
+    Questions come from a QuestionBank (the five built-in questions unless one is passed in,
+    e.g. QuestionBank.from_file(path)).
     """
-    def __init__(self, name="QuestionnaireAgent"):
+    def __init__(self, name="QuestionnaireAgent", question_bank=None, recent_window=100):
         super().__init__(name)
-        self.question_bank = {
-            "engagement": [
-                {"id": "eng1", "text": "How motivated are you at work?"},
-                {"id": "eng2", "text": "Do you feel your contributions are valued?"},
-            ],
-            "wellness": [
-                {"id": "wel1", "text": "How would you rate your current work-life balance?"},
-                {"id": "wel2", "text": "Do you have access to resources that support your well-being?"},
-            ],
-            "default": [
-                {"id": "def1", "text": "Any other feedback you would like to share?"}
-            ]
-        }
+        self.question_bank = question_bank if question_bank is not None else QuestionBank(DEFAULT_QUESTIONS)
+        self._recent_question_ids = deque(maxlen=recent_window) # IDs handed out most recently
 
-    def get_survey_questions(self, topic="default", num_questions=2):
+    def get_survey_questions(self, topic="default", num_questions=2, tags=None, language=None,
+                             question_type=None, seed=None, exclude_recent=False):
         """
         Retrieves a list of questions for a given topic.
+        Optionally narrowed by tags, language and question_type; a seed draws a reproducible
+        random sample instead of the first matches, and exclude_recent skips questions handed
+        out by recent calls. Unknown topics fall back to the 'default' topic.
         """
-        print(f"[{self.name}] Received request for questions on topic: {topic}")
-        questions = self.question_bank.get(topic, [])
-        if not questions:
-            questions = self.question_bank["default"]
-        
-        selected_questions = questions[:num_questions]
-        print(f"[{self.name}] Providing {len(selected_questions)} questions: {selected_questions}")
+        self.logger.info("Received request for questions on topic: %s", topic)
+        criteria = {
+            "tags": tags or (),
+            "language": language,
+            "question_type": question_type,
+            "num_questions": num_questions,
+            "seed": seed,
+            "exclude_ids": frozenset(self._recent_question_ids) if exclude_recent else (),
+        }
+        selected_questions = self.question_bank.select(topic=topic, **criteria)
+        if not selected_questions and topic != "default":
+            selected_questions = self.question_bank.select(topic="default", **criteria)
+
+        self._recent_question_ids.extend(q["id"] for q in selected_questions)
+        self.logger.info("Providing %d questions: %s", len(selected_questions), selected_questions)
         return selected_questions
 
@@ -0,0 +1,155 @@
+# employee_pulse_survey_project/agents/reminders.py
+
+import heapq
+import itertools
+import threading
+import time
+
+from .logging_config import get_logger
+
+
+class SimulatedClock:
+    """
+    A clock that only moves when told to, for deterministic tests and benchmarks.
+    Call it for the current time, like time.time.
+    """
+    def __init__(self, start=0.0):
+        self._now = float(start)
+
+    def __call__(self):
+        return self._now
+
+    def advance(self, seconds):
+        self._now += seconds
+        return self._now
+
+
+class ReminderScheduler:
+    """
+    Fires callbacks at due times, from a heap ordered by due time.
+    One entry is kept per scheduled reminder (per survey, not per recipient); recipients are
+    only worked out when a reminder fires.
+    Cancelling or rescheduling a key just bumps its generation; stale heap entries are dropped
+    when they reach the top.
+
+    With the real clock (time.time) a single background thread sleeps until the earliest due
+    time, and is woken early only when an earlier reminder is scheduled. It never polls.
+    With a SimulatedClock no thread is started: advance(seconds) moves the clock and runs
+    whatever became due, in order, on the caller's thread.
+    """
+    def __init__(self, clock=None, name="ReminderScheduler"):
+        self.clock = clock if clock is not None else time.time
+        self.simulated = isinstance(self.clock, SimulatedClock)
+        self.logger = get_logger(name)
+        self._heap = [] # (due, seq, key, generation)
+        self._entries = {} # key: (generation, due, callback)
+        self._generations = itertools.count(1)
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self.fired = 0
+
+    def schedule(self, key, due, callback):
+        """
+        Schedules callback() to run at time due (in clock seconds), replacing any reminder
+        already scheduled under key.
+        """
+        with self._condition:
+            generation = next(self._generations)
+            self._entries[key] = (generation, due, callback)
+            heapq.heappush(self._heap, (due, next(self._seq), key, generation))
+            if not self.simulated:
+                self._ensure_thread_locked()
+                if self._heap[0][2] == key:
+                    self._condition.notify() # New earliest reminder: wake the thread to shorten its sleep
+
+    def cancel(self, key):
+        """Cancels the reminder scheduled under key; returns True if there was one."""
+        with self._condition:
+            return self._entries.pop(key, None) is not None
+
+    def due_time(self, key):
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None else None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _pop_due_locked(self, now):
+        """Removes and returns the callbacks due at or before now, in due order."""
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, key, generation = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                del self._entries[key]
+                due.append((key, entry[2]))
+        return due
+
+    def run_due(self):
+        """Runs every reminder that is due now. Returns how many ran."""
+        with self._condition:
+            due = self._pop_due_locked(self.clock())
+        for key, callback in due:
+            try:
+                callback()
+            except Exception:
+                self.logger.exception("Reminder %s failed.", key)
+        self.fired += len(due)
+        return len(due)
+
+    def advance(self, seconds):
+        """
+        Simulated clock only: moves time forward, running reminders as they fall due, including
+        ones scheduled by callbacks within the window. Returns how many ran.
+        """
+        if not self.simulated:
+            raise RuntimeError("advance() needs a scheduler built with a SimulatedClock")
+        target = self.clock() + seconds
+        ran = 0
+        while True:
+            with self._condition:
+                next_due = self._next_due_locked()
+            if next_due is None or next_due > target:
+                break
+            self.clock.advance(max(0.0, next_due - self.clock()))
+            ran += self.run_due()
+        self.clock.advance(max(0.0, target - self.clock()))
+        return ran
+
+    def _next_due_locked(self):
+        heap = self._heap
+        while heap:
+            _, _, key, generation = heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                return heap[0][0]
+            heapq.heappop(heap) # Cancelled or rescheduled
+        return None
+
+    def _ensure_thread_locked(self):
+        if self._thread is None and not self._stopped:
+            self._thread = threading.Thread(target=self._run, name="reminders", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    next_due = self._next_due_locked()
+                    delay = None if next_due is None else next_due - self.clock()
+                    if delay is not None and delay <= 0:
+                        break
+                    self._condition.wait(delay) # None: sleep until something is scheduled
+                if self._stopped:
+                    return
+            self.run_due()
+
+    def shutdown(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,94 @@
+# employee_pulse_survey_project/agents/response_agent.py
+
+import threading
+
+from .base_agent import BaseAgent
+from .response_store import SurveyResponses
+
+class ResponseAgent(BaseAgent):
+    """
+    Collects survey answers and computes results.
+    Answers are kept per survey in a columnar SurveyResponses store, keyed by the survey IDs
+    from OrchestratingAgent and the question IDs from PulseQuestionnaireAgent.
+    """
+    def __init__(self, name="ResponseAgent"):
+        super().__init__(name)
+        self.responses = {} # Stores survey_id: SurveyResponses
+        self._lock = threading.Lock()
+
+    def open_survey(self, survey_id, questions):
+        """
+        Prepares storage for a survey's answers. Does nothing if it is already open.
+        """
+        with self._lock:
+            if survey_id not in self.responses:
+                self.responses[survey_id] = SurveyResponses(survey_id, questions)
+                self.logger.info("Collecting responses for survey '%s' (%d questions).", survey_id, len(questions))
+            return self.responses[survey_id]
+
+    def record_response(self, survey_id, respondent, answers, segment=None):
+        """
+        Stores one respondent's answers ({question_id: score}) for an open survey.
+        segment is an optional label (e.g. department) used for per-segment results.
+        """
+        return self.record_responses(survey_id, [(respondent, answers, segment)])
+
+    def record_responses(self, survey_id, responses):
+        """
+        Stores many (respondent, answers, segment) tuples for an open survey in one call.
+        Repeat submissions from the same respondent are ignored.
+        """
+        survey_responses = self.responses.get(survey_id)
+        if survey_responses is None:
+            self.logger.warning("Responses received for survey '%s', which is not collecting responses.", survey_id)
+            return {"status": "error", "message": f"Survey {survey_id} is not collecting responses", "survey_id": survey_id}
+        accepted = duplicates = 0
+        with self._lock:
+            for respondent, answers, segment in responses:
+                if survey_responses.add(respondent, answers, segment) is None:
+                    duplicates += 1
+                else:
+                    accepted += 1
+        self.logger.debug("Recorded %d responses (%d duplicates) for survey '%s'.", accepted, duplicates, survey_id)
+        return {"status": "recorded", "survey_id": survey_id, "accepted": accepted, "duplicates": duplicates}
+
+    def live_summary(self, survey_id, recipient_count=None):
+        """
+        Returns the running statistics for a survey (respondents, response rate, overall and
+        per-question scores) in constant time, without rescanning stored answers.
+        """
+        survey_responses = self.responses.get(survey_id)
+        if survey_responses is None:
+            return None
+        with self._lock:
+            return survey_responses.live.snapshot(recipient_count)
+
+    def merge_partial_aggregate(self, survey_id, aggregate):
+        """
+        Folds a SurveyAggregate built elsewhere (e.g. by a parallel ingestion shard) into the
+        survey's live statistics. The shard's raw answers are not added to the stored columns.
+        """
+        survey_responses = self.responses.get(survey_id)
+        if survey_responses is None:
+            return False
+        with self._lock:
+            survey_responses.live.merge(aggregate)
+        return True
+
+    def get_results(self, survey_id, group_by="question"):
+        """
+        Returns statistics for a survey grouped by 'question', 'topic', 'segment' or 'overall'.
+        """
+        survey_responses = self.responses.get(survey_id)
+        if survey_responses is None:
+            return {"status": "error", "message": "No responses collected for this survey", "survey_id": survey_id}
+        with self._lock:
+            stats = survey_responses.statistics(group_by)
+            respondent_count = survey_responses.respondent_count
+        return {
+            "status": "ok",
+            "survey_id": survey_id,
+            "group_by": group_by,
+            "respondents": respondent_count,
+            "results": stats
+        }
@@ -0,0 +1,136 @@
+# employee_pulse_survey_project/agents/response_store.py
+
+from array import array
+from collections import Counter
+
+from .streaming_stats import SurveyAggregate, summarize_histogram
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; aggregation falls back to pure Python over the same columns
+    np = None
+
+class SurveyResponses:
+    """
+    Columnar storage for one survey's answers: one row per (respondent, question) answer,
+    held in parallel typed arrays instead of a dict per response.
+    Scores are integers from 0 to scale_max (10 by default, which also enables eNPS).
+    All statistics are derived from a score histogram per group, which NumPy builds with a
+    single bincount over the columns.
+    """
+    def __init__(self, survey_id, questions, scale_max=10):
+        self.survey_id = survey_id
+        self.scale_max = scale_max
+        self.question_ids = [q["id"] for q in questions]
+        self._question_codes = {qid: i for i, qid in enumerate(self.question_ids)}
+        self.topics = []
+        self._topic_codes = {}
+        self._question_topic = array("H") # question code -> topic code
+        for q in questions:
+            topic = q.get("topic", "default")
+            self._question_topic.append(self._topic_codes.setdefault(topic, len(self._topic_codes)))
+            if len(self.topics) < len(self._topic_codes):
+                self.topics.append(topic)
+        self.segments = []
+        self._segment_codes = {}
+        self._respondents = {} # respondent key: respondent code
+        self.live = SurveyAggregate(self.question_ids, scale_max) # Updated as answers arrive
+        # The columns
+        self.respondent = array("I")
+        self.question = array("H")
+        self.segment = array("H")
+        self.score = array("B")
+
+    def __len__(self):
+        return len(self.score)
+
+    @property
+    def respondent_count(self):
+        return len(self._respondents)
+
+    def has_responded(self, respondent):
+        return respondent.lower() in self._respondents
+
+    def respondents(self):
+        return self._respondents.keys()
+
+    def add(self, respondent, answers, segment=None):
+        """
+        Appends one respondent's answers ({question_id: score}).
+        Returns the number of answers stored, or None if this respondent already responded.
+        Answers to unknown questions and non-integer or out-of-range scores are skipped.
+        """
+        key = respondent.lower()
+        if key in self._respondents:
+            return None
+        respondent_code = self._respondents[key] = len(self._respondents)
+        self.live.respondents += 1
+        segment_code = self._segment_code(segment)
+        stored = 0
+        for question_id, score in answers.items():
+            question_code = self._question_codes.get(question_id)
+            if question_code is None or isinstance(score, bool) or not isinstance(score, int) or not 0 <= score <= self.scale_max:
+                continue
+            self.respondent.append(respondent_code)
+            self.question.append(question_code)
+            self.segment.append(segment_code)
+            self.score.append(score)
+            self.live.add_answer(question_id, score)
+            stored += 1
+        return stored
+
+    def _segment_code(self, segment):
+        label = segment if segment is not None else "unspecified"
+        code = self._segment_codes.get(label)
+        if code is None:
+            code = self._segment_codes[label] = len(self.segments)
+            self.segments.append(label)
+        return code
+
+    # --- Aggregation ---
+
+    def _group_column(self, group_by):
+        """Returns (group code per row, group labels) for a grouping."""
+        if group_by == "question":
+            return self.question, self.question_ids
+        if group_by == "segment":
+            return self.segment, self.segments
+        if group_by == "topic":
+            if np is not None:
+                # Gather: topic code of every row's question, in one indexing operation.
+                topic_of = np.frombuffer(self._question_topic, dtype=np.uint16)
+                return topic_of[np.frombuffer(self.question, dtype=np.uint16)], self.topics
+            topic_of = self._question_topic
+            return array("H", (topic_of[q] for q in self.question)), self.topics
+        if group_by == "overall":
+            return None, ["overall"]
+        raise ValueError(f"Unknown group_by '{group_by}'. Use 'question', 'topic', 'segment' or 'overall'.")
+
+    def histograms(self, group_by="question"):
+        """Returns {group label: [count of score 0, count of score 1, ...]}."""
+        codes, labels = self._group_column(group_by)
+        width = self.scale_max + 1
+        if np is not None:
+            scores = np.frombuffer(self.score, dtype=np.uint8).astype(np.int64)
+            if codes is None:
+                flat = np.bincount(scores, minlength=width)
+            else:
+                if not isinstance(codes, np.ndarray):
+                    codes = np.frombuffer(codes, dtype=np.uint16)
+                groups = codes.astype(np.int64)
+                flat = np.bincount(groups * width + scores, minlength=len(labels) * width)
+            table = flat.reshape(len(labels), width).tolist()
+        else:
+            table = [[0] * width for _ in labels]
+            if codes is None:
+                for score, count in Counter(self.score).items():
+                    table[0][score] = count
+            else:
+                for (group, score), count in Counter(zip(codes, self.score)).items():
+                    table[group][score] = count
+        return dict(zip(labels, table))
+
+    def statistics(self, group_by="question"):
+        """Per-group response count, mean, score distribution, percentiles and (0-10 scales) eNPS."""
+        return {label: summarize_histogram(hist, enps=self.scale_max == 10)
+                for label, hist in self.histograms(group_by).items()}
@@ -0,0 +1,117 @@
+# employee_pulse_survey_project/agents/streaming_stats.py
+
+import math
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+class RunningStats:
+    """
+    Running count, mean, variance and histogram of a stream of integer scores.
+    Scores are bounded (0..scale_max), so the histogram is a complete summary of the stream:
+    add() is a single counter increment, the moments are derived from the histogram's
+    scale_max + 1 buckets when read, and merging shards is exact (bucket-wise addition).
+    """
+    __slots__ = ("count", "histogram")
+
+    def __init__(self, scale_max=10):
+        self.count = 0
+        self.histogram = [0] * (scale_max + 1)
+
+    def add(self, score):
+        self.histogram[score] += 1
+        self.count += 1
+
+    def add_many(self, scores):
+        histogram = self.histogram
+        for score in scores:
+            histogram[score] += 1
+        self.count = sum(histogram)
+
+    def merge(self, other):
+        for score, c in enumerate(other.histogram):
+            self.histogram[score] += c
+        self.count += other.count
+        return self
+
+    @property
+    def mean(self):
+        if not self.count:
+            return None
+        return sum(score * c for score, c in enumerate(self.histogram)) / self.count
+
+    @property
+    def variance(self):
+        """Sample variance, or None with fewer than two values."""
+        if self.count < 2:
+            return None
+        mean = self.mean
+        return sum(c * (score - mean) ** 2 for score, c in enumerate(self.histogram)) / (self.count - 1)
+
+    def summary(self):
+        summary = summarize_histogram(self.histogram, enps=len(self.histogram) == 11)
+        variance = self.variance
+        summary["stddev"] = round(math.sqrt(variance), 3) if variance is not None else None
+        return summary
+
+
+class SurveyAggregate:
+    """
+    Live statistics for one survey: respondent count plus RunningStats overall and per question.
+    Reading a snapshot costs the same no matter how many responses have arrived.
+    """
+    def __init__(self, question_ids, scale_max=10):
+        self.scale_max = scale_max
+        self.respondents = 0
+        self.overall = RunningStats(scale_max)
+        self.questions = {qid: RunningStats(scale_max) for qid in question_ids}
+
+    def add_answer(self, question_id, score):
+        self.overall.add(score)
+        self.questions[question_id].add(score)
+
+    def merge(self, other):
+        """Combines a partial aggregate (e.g. from another ingestion shard) into this one."""
+        self.respondents += other.respondents
+        self.overall.merge(other.overall)
+        for qid, stats in other.questions.items():
+            self.questions.setdefault(qid, RunningStats(self.scale_max)).merge(stats)
+        return self
+
+    def snapshot(self, recipient_count=None):
+        """
+        Current results. response_rate is included when the number of recipients is known.
+        """
+        return {
+            "respondents": self.respondents,
+            "response_rate": round(self.respondents / recipient_count, 4) if recipient_count else None,
+            "overall": self.overall.summary(),
+            "questions": {qid: {"count": s.count, "mean": round(s.mean, 3) if s.count else None}
+                          for qid, s in self.questions.items()},
+        }
+
+
+def summarize_histogram(histogram, enps=True):
+    """Derives count, mean, distribution, percentiles and eNPS from counts indexed by score."""
+    count = sum(histogram)
+    summary = {"count": count, "mean": None, "distribution": {str(s): c for s, c in enumerate(histogram) if c}}
+    if not count:
+        return summary
+    summary["mean"] = round(sum(score * c for score, c in enumerate(histogram)) / count, 3)
+    summary["percentiles"] = {f"p{p}": _percentile_from_histogram(histogram, count, p) for p in PERCENTILES}
+    if enps:
+        promoters = histogram[9] + histogram[10]
+        detractors = sum(histogram[:7])
+        summary["enps"] = round((promoters - detractors) * 100 / count, 1)
+    return summary
+
+
+def _percentile_from_histogram(histogram, count, percentile):
+    # Nearest-rank percentile: the smallest score whose cumulative count reaches the rank.
+    rank = max(1, -(-percentile * count // 100))
+    cumulative = 0
+    for score, c in enumerate(histogram):
+        cumulative += c
+        if cumulative >= rank:
+            return score
+    return len(histogram) - 1
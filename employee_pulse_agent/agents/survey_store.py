@@ -0,0 +1,199 @@
+# employee_pulse_survey_project/agents/survey_store.py
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+from .persistence import InMemoryBackend
+
+
+class SurveyStore:
+    """
+    Holds survey records keyed by survey_id, with secondary indexes on
+    approval_request_id, status and approver so lookups never scan every survey.
+    Indexed fields must only be changed through put() and update().
+    Every change is handed to the persistence backend before it is applied here, so a record
+    the backend refuses (TypeError) leaves the store unchanged. At startup only surveys that are
+    still open (or have a reminder due) are loaded; finished ones are read back from the
+    backend when asked for by ID.
+    Each survey gets a sequence number when first stored; the status and approver indexes
+    keep sorted sequence numbers, so a page of results starts with a binary search.
+    """
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else InMemoryBackend()
+        self._surveys = {} # survey_id: survey_details
+        self._seq = {} # survey_id: sequence number (creation order)
+        self._order = [] # sequence number: survey_id
+        self._by_approval_request = {} # approval_request_id: survey_id
+        self._by_status = {} # status: sorted [seq, ...]
+        self._by_approver = {} # approver_contact: sorted [seq, ...]
+        self._lock = threading.RLock()
+        for survey in self.backend.load_open_surveys():
+            self._add_locked(survey["survey_id"], survey)
+
+    @property
+    def surveys(self):
+        """The underlying survey_id: survey_details mapping. Treat as read-only."""
+        return self._surveys
+
+    def __len__(self):
+        return len(self._surveys)
+
+    def __contains__(self, survey_id):
+        return survey_id in self._surveys
+
+    def get(self, survey_id):
+        survey = self._surveys.get(survey_id)
+        if survey is None:
+            survey = self.backend.load_survey(survey_id)
+            if survey is not None:
+                with self._lock:
+                    if survey_id in self._surveys:
+                        return self._surveys[survey_id]
+                    self._add_locked(survey_id, survey)
+        return survey
+
+    def put(self, survey):
+        """Adds or replaces a survey record and indexes it."""
+        with self._lock:
+            survey_id = survey["survey_id"]
+            self.backend.save_survey(survey, include_audience=True)
+            previous = self._surveys.get(survey_id)
+            if previous is not None:
+                self._unindex(survey_id, previous)
+                self._surveys[survey_id] = survey
+                self._index(survey_id, survey)
+            else:
+                self._add_locked(survey_id, survey)
+            return survey
+
+    def update(self, survey_id, **changes):
+        """Applies field changes to a survey, keeping the indexes in step. Returns the record, or None."""
+        with self._lock:
+            survey = self._surveys.get(survey_id)
+            if survey is None:
+                return None
+            self.backend.save_survey({**survey, **changes}, include_audience="target_audience_emails" in changes)
+            self._unindex(survey_id, survey)
+            survey.update(changes)
+            self._index(survey_id, survey)
+            return survey
+
+    def find_by_approval_request(self, approval_request_id):
+        """
+        Returns the survey behind the given approval request, or None. A finished survey that
+        wasn't loaded at startup is read back from the backend, as in get().
+        """
+        survey_id = self._by_approval_request.get(approval_request_id)
+        if survey_id is not None:
+            return self._surveys.get(survey_id)
+        survey = self.backend.load_survey_by_approval_request(approval_request_id)
+        if survey is None:
+            return None
+        with self._lock:
+            survey_id = survey["survey_id"]
+            if survey_id in self._surveys:
+                return self._surveys[survey_id]
+            self._add_locked(survey_id, survey)
+        return survey
+
+    def count(self, status=None, approver=None):
+        """Number of matching surveys; constant time unless both filters are given."""
+        if status is None and approver is None:
+            return len(self._surveys)
+        if approver is None:
+            return len(self._by_status.get(status, ()))
+        if status is None:
+            return len(self._by_approver.get(approver, ()))
+        return len(self.query(status=status, approver=approver))
+
+    def status_counts(self):
+        """Number of surveys held in memory, by status."""
+        with self._lock:
+            return {status: len(seqs) for status, seqs in self._by_status.items() if seqs}
+
+    def query(self, status=None, approver=None):
+        """
+        Returns survey records matching all given filters, in creation order.
+        Covers surveys held in memory: every open survey plus any finished ones touched since startup.
+        """
+        return self.page(status=status, approver=approver)[0]
+
+    def page(self, status=None, approver=None, after=None, limit=None):
+        """
+        Returns (records, last_seq) for up to limit matching surveys created after sequence
+        number 'after', in creation order. last_seq is None when there are no further matches;
+        otherwise pass it back as 'after' to get the next page.
+        """
+        with self._lock:
+            if status is not None and approver is not None:
+                status_seqs = self._by_status.get(status, [])
+                approver_seqs = self._by_approver.get(approver, [])
+                seqs = status_seqs if len(status_seqs) <= len(approver_seqs) else approver_seqs
+            elif status is not None:
+                seqs = self._by_status.get(status, [])
+            elif approver is not None:
+                seqs = self._by_approver.get(approver, [])
+            else:
+                seqs = range(len(self._order))
+            start = bisect_right(seqs, after) if after is not None else 0
+            records = []
+            for position in range(start, len(seqs)):
+                survey = self._surveys[self._order[seqs[position]]]
+                if (status is not None and survey.get("status") != status) or \
+                        (approver is not None and survey.get("approver_contact") != approver):
+                    continue
+                if limit is not None and len(records) == limit:
+                    return records, seqs[position - 1]
+                records.append(survey)
+            return records, None
+
+    def _add_locked(self, survey_id, survey):
+        self._seq[survey_id] = len(self._order)
+        self._order.append(survey_id)
+        self._surveys[survey_id] = survey
+        self._index(survey_id, survey)
+
+    def _index(self, survey_id, survey):
+        if survey.get("approval_request_id"):
+            self._by_approval_request[survey["approval_request_id"]] = survey_id
+        seq = self._seq[survey_id]
+        insort(self._by_status.setdefault(survey.get("status"), []), seq)
+        insort(self._by_approver.setdefault(survey.get("approver_contact"), []), seq)
+
+    def _unindex(self, survey_id, survey):
+        if self._by_approval_request.get(survey.get("approval_request_id")) == survey_id:
+            del self._by_approval_request[survey["approval_request_id"]]
+        seq = self._seq[survey_id]
+        for index, key in ((self._by_status, survey.get("status")), (self._by_approver, survey.get("approver_contact"))):
+            seqs = index.get(key)
+            if seqs:
+                position = bisect_left(seqs, seq)
+                if position < len(seqs) and seqs[position] == seq:
+                    del seqs[position]
+                if not seqs:
+                    del index[key]
+
+
+class SequentialIdAllocator:
+    """
+    Hands out IDs such as 'approval_001' from a thread-safe, monotonically increasing counter.
+    Unlike deriving the next ID from len(existing) + 1, an ID is never handed out twice.
+    """
+    def __init__(self, prefix, width=3, start=1):
+        self.prefix = prefix
+        self.width = width
+        self._next = start
+        self._lock = threading.Lock()
+
+    def next_id(self):
+        with self._lock:
+            number = self._next
+            self._next += 1
+        return f"{self.prefix}{number:0{self.width}d}"
+
+    def advance_past(self, existing_id):
+        """Makes sure IDs handed out from now on sort after an ID that already exists."""
+        suffix = existing_id[len(self.prefix):] if existing_id.startswith(self.prefix) else ""
+        if suffix.isdigit():
+            with self._lock:
+                self._next = max(self._next, int(suffix) + 1)
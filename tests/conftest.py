@@ -0,0 +1,43 @@
+# tests/conftest.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ.setdefault("PULSE_QUIET", "1")
+
+import pytest
+
+from employee_pulse_agent.agents import (ApprovalAgent, CommunicationAgent, DispatchQueue, OrchestratingAgent,
+                                         PulseQuestionnaireAgent)
+
+
+def survey_params(survey_id, audience=("a@example.com", "b@example.com"), **extra):
+    return {"survey_id": survey_id, "title": f"Pulse {survey_id}", "topic": "wellness", "num_questions": 2,
+            "target_audience_emails": list(audience), "approver_contact": "hr@example.com", **extra}
+
+
+def send_survey(orchestrator, survey_id, **extra):
+    """Initiates and approves a survey and waits for its invitations to go out."""
+    approval = orchestrator.initiate_pulse_survey(survey_params(survey_id, **extra))["approval_request_id"]
+    orchestrator.handle_approval_response(approval, "approved")
+    orchestrator.dispatch_queue.wait_all()
+    return orchestrator.survey_store.get(survey_id)
+
+
+def build_orchestrator(**kwargs):
+    return OrchestratingAgent(PulseQuestionnaireAgent(), ApprovalAgent(backend=kwargs.get("backend")),
+                              CommunicationAgent(retry_backoff=0), dispatch_queue=DispatchQueue(), **kwargs)
+
+
+def stop_orchestrator(orchestrator):
+    orchestrator.dispatch_queue.shutdown()
+    orchestrator.communication_agent.shutdown()
+
+
+@pytest.fixture
+def orchestrator():
+    orchestrator = build_orchestrator()
+    yield orchestrator
+    stop_orchestrator(orchestrator)
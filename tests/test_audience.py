@@ -0,0 +1,37 @@
+# tests/test_audience.py
+
+from employee_pulse_agent.agents import iter_recipients, iter_recipients_from_csv
+
+
+def test_iter_recipients_accepts_strings_tuples_and_dicts():
+    audience = [" a@example.com ", ("b@example.com", "Bo"), ("c@example.com",),
+                {"email": "d@example.com", "name": "Di"}, {"email": "e@example.com"}]
+    assert list(iter_recipients(audience)) == [
+        ("a@example.com", None), ("b@example.com", "Bo"), ("c@example.com", None),
+        ("d@example.com", "Di"), ("e@example.com", None)]
+
+
+def test_iter_recipients_skips_blank_entries_and_stays_lazy():
+    consumed = []
+
+    def audience():
+        for email in ("a@example.com", "", {"name": "No address"}, "b@example.com"):
+            consumed.append(email)
+            yield email
+
+    recipients = iter_recipients(audience())
+    assert next(recipients) == ("a@example.com", None)
+    assert consumed == ["a@example.com"]
+    assert list(recipients) == [("b@example.com", None)]
+
+
+def test_iter_recipients_from_csv(tmp_path):
+    path = tmp_path / "audience.csv"
+    path.write_text("email,name\na@example.com,Ana\n,Nobody\n b@example.com ,\n", encoding="utf-8")
+    assert list(iter_recipients_from_csv(str(path))) == [("a@example.com", "Ana"), ("b@example.com", None)]
+
+
+def test_iter_recipients_from_csv_with_other_columns(tmp_path):
+    path = tmp_path / "audience.csv"
+    path.write_text("mail,full_name\na@example.com,Ana\n", encoding="utf-8")
+    assert list(iter_recipients_from_csv(str(path), email_column="mail", name_column="full_name")) == [("a@example.com", "Ana")]
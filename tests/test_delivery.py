@@ -0,0 +1,177 @@
+# tests/test_delivery.py
+
+import pytest
+
+from employee_pulse_agent.agents import CommunicationAgent, DeliveryLedger, DomainThrottle, TokenBucket
+from employee_pulse_agent.agents import communication_agent
+from employee_pulse_agent.agents.delivery import FAILED, PENDING, SENT
+
+
+class FakeClock:
+    """Time that only moves when something sleeps."""
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FlakyTransport:
+    """Fails each address in fail_times that many times before delivering to it."""
+    def __init__(self, fail_times=None):
+        self.fail_times = dict(fail_times or {})
+        self.attempts = []
+
+    def send_batch(self, messages):
+        results = []
+        for email, _, _ in messages:
+            self.attempts.append(email)
+            remaining = self.fail_times.get(email, 0)
+            self.fail_times[email] = remaining - 1
+            results.append(remaining <= 0)
+        return results
+
+    def close(self):
+        pass
+
+
+# --- DeliveryLedger ---
+
+def test_ledger_counts_follow_every_change():
+    ledger = DeliveryLedger()
+    ledger.mark(4, FAILED) # Grows to reach position 4
+    assert len(ledger) == 5
+    assert (ledger.count(PENDING), ledger.failed_count) == (4, 1)
+    for position in range(4):
+        ledger.mark(position, SENT)
+    ledger.mark(4, SENT)
+    ledger.mark(1, FAILED)
+    assert (ledger.sent_count, ledger.failed_count, ledger.count(PENDING)) == (4, 1, 0)
+    assert ledger.failed_positions() == [1]
+    assert ledger.status(99) == PENDING
+
+
+def test_ledger_round_trips_through_bytes():
+    ledger = DeliveryLedger(bytes([SENT, FAILED, SENT, FAILED]))
+    assert (ledger.sent_count, ledger.failed_count) == (2, 2)
+    assert ledger.failed_positions() == [1, 3]
+    assert DeliveryLedger(ledger.to_bytes()).to_bytes() == ledger.to_bytes()
+    summary = ledger.summary()
+    assert (summary["recipients"], summary["sent"], summary["failed"], summary["pending"]) == (4, 2, 2, 0)
+
+
+# --- Throttling ---
+
+def test_token_bucket_allows_a_burst_then_waits_for_the_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=5, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire(5) == 0
+    assert bucket.acquire(2) == pytest.approx(0.2)
+    assert bucket.reserve(1) == pytest.approx(0.1) # Waiters queue up behind the debt
+    clock.now += 10
+    assert bucket.acquire(5) == 0 # Refilled, but never beyond capacity
+    assert bucket.acquire(1) == pytest.approx(0.1)
+
+
+def test_domain_throttle_waits_per_domain():
+    clock = FakeClock()
+    throttle = DomainThrottle(domain_rates={"slow.com": 2}, burst=1, clock=clock, sleep=clock.sleep)
+    assert throttle.wait_for(["a@fast.com"] * 100) == 0 # No limit for other domains
+    assert throttle.wait_for(["a@slow.com"]) == 0
+    assert throttle.wait_for(["b@SLOW.com", "c@fast.com"]) == pytest.approx(0.5)
+    assert throttle.wait_for(["d@slow.com", "e@slow.com"]) == pytest.approx(1.0)
+    assert clock.sleeps == [pytest.approx(0.5), pytest.approx(1.0)]
+
+
+def test_overall_rate_applies_across_domains():
+    clock = FakeClock()
+    throttle = DomainThrottle(rate=10, domain_rate=100, burst=2, clock=clock, sleep=clock.sleep)
+    assert throttle.wait_for(["a@one.com", "b@two.com"]) == 0
+    assert throttle.wait_for(["c@three.com"]) == pytest.approx(0.1)
+
+
+def test_throttle_from_env(monkeypatch):
+    for name in ("PULSE_SEND_RATE", "PULSE_DOMAIN_RATE", "PULSE_DOMAIN_RATES", "PULSE_SEND_BURST"):
+        monkeypatch.delenv(name, raising=False)
+    assert DomainThrottle.from_env() is None
+    monkeypatch.setenv("PULSE_DOMAIN_RATES", "example.com=50, gmail.com=10")
+    throttle = DomainThrottle.from_env()
+    assert throttle.domain_rates == {"example.com": 50, "gmail.com": 10}
+
+
+# --- Retries ---
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Records the retry backoff instead of sleeping, with the jitter pinned to 1."""
+    recorded = []
+    monkeypatch.setattr(communication_agent.time, "sleep", recorded.append)
+    monkeypatch.setattr(communication_agent.random, "uniform", lambda low, high: 1.0)
+    return recorded
+
+
+def _agent(transport, **kwargs):
+    return CommunicationAgent(transport=transport, max_workers=1, batch_size=2, **kwargs)
+
+
+AUDIENCE = ["a@example.com", "b@example.com", "c@example.com", "d@example.com"]
+
+
+def test_failed_recipients_are_retried_with_backoff(sleeps):
+    transport = FlakyTransport({"b@example.com": 2})
+    agent = _agent(transport, max_retries=2, retry_backoff=0.5)
+    report, ledger = {}, DeliveryLedger()
+    assert agent.send_survey_invitations(AUDIENCE, {"survey_id": "s1"}, report=report, ledger=ledger)
+    assert (report["total"], report["sent"], report["failed"]) == (4, 4, 0)
+    assert transport.attempts.count("b@example.com") == 3
+    assert sleeps == [0.5, 1.0]
+    assert ledger.to_bytes() == bytes([SENT] * 4)
+
+
+def test_gives_up_after_max_retries(sleeps):
+    transport = FlakyTransport({"c@example.com": 10})
+    agent = _agent(transport, max_retries=2, retry_backoff=1.0)
+    report, ledger = {}, DeliveryLedger()
+    assert not agent.send_survey_invitations(AUDIENCE, {"survey_id": "s1"}, report=report, ledger=ledger)
+    assert transport.attempts.count("c@example.com") == 3 # The first attempt and two retries
+    assert (report["sent"], report["failed"]) == (3, 1)
+    assert sleeps == [1.0, 2.0]
+    assert ledger.failed_positions() == [2]
+
+
+def test_only_failed_resends_just_the_failed_recipients(sleeps):
+    transport = FlakyTransport({"b@example.com": 1, "d@example.com": 1})
+    agent = _agent(transport, max_retries=0)
+    ledger = DeliveryLedger()
+    assert not agent.send_survey_invitations(AUDIENCE, {"survey_id": "s1"}, ledger=ledger)
+    assert ledger.failed_positions() == [1, 3]
+
+    transport.attempts.clear()
+    report = {}
+    assert agent.send_survey_invitations(AUDIENCE, {"survey_id": "s1"}, report=report, ledger=ledger, only_failed=True)
+    assert transport.attempts == ["b@example.com", "d@example.com"]
+    assert (report["total"], report["sent"], report["failed"]) == (4, 4, 0)
+    assert ledger.to_bytes() == bytes([SENT] * 4)
+    assert sleeps == []
+
+
+def test_only_failed_needs_a_ledger():
+    with pytest.raises(ValueError):
+        _agent(FlakyTransport()).send_survey_invitations(AUDIENCE, {"survey_id": "s1"}, only_failed=True)
+
+
+def test_a_failing_transport_marks_the_whole_batch_failed(sleeps):
+    class BrokenTransport(FlakyTransport):
+        def send_batch(self, messages):
+            raise ConnectionError("relay unavailable")
+
+    report, ledger = {}, DeliveryLedger()
+    assert not _agent(BrokenTransport(), max_retries=0).send_survey_invitations(
+        AUDIENCE, {"survey_id": "s1"}, report=report, ledger=ledger)
+    assert (report["sent"], report["failed"]) == (0, 4)
+    assert ledger.failed_count == 4
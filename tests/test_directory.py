@@ -0,0 +1,123 @@
+# tests/test_directory.py
+
+from datetime import date
+
+import pytest
+
+from employee_pulse_agent.agents import EmployeeDirectory, SelectorError, iter_recipients
+
+TODAY = date(2026, 1, 1)
+
+EMPLOYEES = [
+    {"email": "cto@example.com", "name": "Cy", "department": "Engineering", "location": "Pune", "tenure_years": "10"},
+    {"email": "lead@example.com", "name": "Lee", "department": "Engineering", "location": "New York",
+     "manager": "CTO@example.com", "hire_date": "2020-01-01"},
+    {"email": "dev@example.com", "name": "Dev", "department": "Engineering", "location": "Pune",
+     "manager": "lead@example.com", "hire_date": "2024-01-01"},
+    {"email": "sales@example.com", "name": "Sal", "department": "Sales", "location": "Pune", "tenure_years": "3"},
+    {"email": "mkt@example.com", "name": "Mo", "department": "Marketing", "location": "New York"},
+    {"email": " DEV@Example.com ", "name": "Duplicate", "department": "Sales"},
+    {"email": "", "name": "No address"},
+]
+
+
+@pytest.fixture
+def directory():
+    return EmployeeDirectory(EMPLOYEES, today=TODAY)
+
+
+def _emails(directory, selector):
+    return [email for email, _ in directory.recipients(selector)]
+
+
+def test_emails_are_normalised_and_deduplicated(directory):
+    assert len(directory) == 5
+    assert directory.get(" Dev@EXAMPLE.com")["name"] == "Dev" # The first row wins
+    assert "DEV@example.com" in directory
+    assert directory.get("lead@example.com")["manager"] == "cto@example.com"
+
+
+def test_empty_selector_selects_everyone(directory):
+    assert directory.count("") == 5
+    assert directory.count(None) == 5
+
+
+def test_and_binds_tighter_than_or(directory):
+    selector = "department=Sales OR department=Engineering AND location=Pune"
+    assert _emails(directory, selector) == ["cto@example.com", "dev@example.com", "sales@example.com"]
+    assert _emails(directory, "(department=Sales OR department=Engineering) AND location=Pune") == \
+        ["cto@example.com", "dev@example.com", "sales@example.com"]
+    assert _emails(directory, "(department=Sales OR department=Marketing) AND location='New York'") == ["mkt@example.com"]
+
+
+def test_not_and_not_equal(directory):
+    assert _emails(directory, "NOT department=Engineering") == ["sales@example.com", "mkt@example.com"]
+    assert _emails(directory, "department!=Engineering AND NOT location=Pune") == ["mkt@example.com"]
+    assert _emails(directory, "NOT (department=Engineering OR location=Pune)") == ["mkt@example.com"]
+
+
+def test_in_lists_and_quoted_values(directory):
+    assert _emails(directory, "department IN (Sales, marketing)") == ["sales@example.com", "mkt@example.com"]
+    assert _emails(directory, 'location IN ("New York", Pune) AND department in (Sales)') == ["sales@example.com"]
+    assert _emails(directory, 'location="New York"') == ["lead@example.com", "mkt@example.com"]
+
+
+def test_reporting_chain(directory):
+    assert _emails(directory, "reports_to=cto@example.com") == ["lead@example.com", "dev@example.com"]
+    assert _emails(directory, "reports_to=LEAD@example.com") == ["dev@example.com"]
+    assert _emails(directory, "reports_to=dev@example.com") == []
+
+
+def test_tenure_from_years_and_hire_dates(directory):
+    # Tenures on 2026-01-01: cto 10, lead 6.0 (hired 2020), dev 2.0 (hired 2024), sales 3; mkt unknown
+    assert _emails(directory, "tenure>=6") == ["cto@example.com", "lead@example.com"]
+    assert _emails(directory, "tenure>6") == ["cto@example.com"]
+    assert _emails(directory, "tenure<3") == ["dev@example.com"]
+    assert _emails(directory, "tenure<=3") == ["dev@example.com", "sales@example.com"]
+    assert _emails(directory, "tenure=10") == ["cto@example.com"]
+    assert _emails(directory, "tenure!=10") == ["lead@example.com", "dev@example.com", "sales@example.com"]
+
+
+def test_email_selector_and_lazily_indexed_fields():
+    directory = EmployeeDirectory([{"email": "a@example.com", "team": "Blue"}, {"email": "b@example.com", "team": "Red"}])
+    assert _emails(directory, "email=B@example.com") == ["b@example.com"]
+    assert _emails(directory, "team=blue") == ["a@example.com"]
+
+
+@pytest.mark.parametrize("selector", [
+    "department=Sales OR",
+    "department=Sales AND",
+    "shoe_size=42",
+    "tenure IN (1, 2)",
+    "tenure>=many",
+    "name=Sal",
+    "department>Sales",
+    "(department=Sales",
+    "department IN Sales",
+    "department=",
+    "department=Sales)",
+])
+def test_invalid_selectors(directory, selector):
+    with pytest.raises(SelectorError):
+        directory.select(selector)
+
+
+def test_selections_are_cached(directory):
+    directory.select("department=Sales")
+    directory.select("department=Sales")
+    directory.select("  department=Sales ")
+    assert directory.cache_info().hits == 2
+
+
+def test_selected_recipients_feed_the_audience_stream(directory):
+    assert list(iter_recipients(directory.recipients("location=Pune AND tenure<5"))) == [
+        ("dev@example.com", "Dev"), ("sales@example.com", "Sal")]
+
+
+def test_load_from_csv(tmp_path):
+    path = tmp_path / "directory.csv"
+    path.write_text("email,name,department\na@example.com,Ana,Sales\nA@example.com,Again,Sales\nb@example.com,,Ops\n",
+                    encoding="utf-8")
+    directory = EmployeeDirectory.from_file(str(path))
+    assert _emails(directory, "department=sales") == ["a@example.com"]
+    assert directory.get("b@example.com") == {"email": "b@example.com", "department": "Ops"}
@@ -0,0 +1,32 @@
+# tests/test_dispatch_queue.py
+
+import threading
+
+from employee_pulse_agent.agents import DispatchQueue
+
+
+def test_finished_jobs_are_pruned_but_running_ones_kept():
+    queue = DispatchQueue(max_concurrent=2, max_finished=3)
+    release = threading.Event()
+    blocked = queue.submit("blocked", lambda job: release.wait(10))
+    for i in range(10):
+        queue.submit(f"s{i}", lambda job: True).wait()
+    assert [queue.get(f"s{i}") is not None for i in range(10)] == [False] * 7 + [True] * 3
+    assert queue.get("blocked") is blocked
+    assert queue.state_counts()["sent"] == 10
+    release.set()
+    assert queue.wait_all(10)
+    assert queue.get("blocked").state == "sent"
+    queue.shutdown()
+
+
+def test_resubmitted_job_replaces_the_finished_one():
+    queue = DispatchQueue(max_finished=1)
+    first = queue.submit("s1", lambda job: False)
+    first.wait()
+    second = queue.submit("s1", lambda job: True)
+    second.wait()
+    queue.submit("s2", lambda job: True).wait()
+    assert queue.get("s1") is None
+    assert queue.get("s2").state == "sent"
+    queue.shutdown()
@@ -0,0 +1,199 @@
+# tests/test_idempotency.py
+
+import threading
+import time
+
+import pytest
+
+from employee_pulse_agent.agents import IdempotencyCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Counter:
+    """A call that returns a fresh result each time, so cache hits can be told apart from reruns."""
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {"status": "ok", "call": self.calls}
+
+
+def _wait_until(condition):
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = IdempotencyCache(ttl=10, clock=clock)
+    func = Counter()
+    assert cache.run("k", func)["call"] == 1
+    clock.now = 9.9
+    assert cache.run("k", func)["call"] == 1
+    clock.now = 10
+    assert cache.run("k", func)["call"] == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = IdempotencyCache(max_entries=2)
+    funcs = {key: Counter() for key in "abc"}
+    cache.run("a", funcs["a"])
+    cache.run("b", funcs["b"])
+    cache.run("a", funcs["a"]) # 'a' is now the most recently used
+    cache.run("c", funcs["c"]) # Evicts 'b'
+    cache.run("a", funcs["a"])
+    cache.run("b", funcs["b"])
+    assert (funcs["a"].calls, funcs["b"].calls, funcs["c"].calls) == (1, 2, 1)
+    assert cache.stats()["evictions"] == 2
+    assert cache.stats()["size"] == 2
+
+
+def test_duplicate_waits_for_the_call_in_flight():
+    cache = IdempotencyCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"status": "ok"}
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.run("k", slow)))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.append(cache.run("k", slow)))
+    second.start()
+    _wait_until(lambda: cache.stats()["waits"] == 1) # The duplicate is waiting, not finding a finished entry
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert results == [{"status": "ok"}, {"status": "ok"}]
+    assert len(calls) == 1
+    assert cache.stats()["waits"] == 1
+
+
+def test_calls_in_flight_are_not_evicted():
+    cache = IdempotencyCache(max_entries=1)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"status": "ok"}
+
+    first = threading.Thread(target=cache.run, args=("slow", slow))
+    first.start()
+    started.wait(5)
+    cache.run("other", Counter()) # Over max_entries, but the oldest entry is still running
+    second = threading.Thread(target=cache.run, args=("slow", slow))
+    second.start()
+    _wait_until(lambda: cache.stats()["waits"] == 1)
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert len(calls) == 1
+    assert cache.stats()["size"] == 2
+    cache.run("third", Counter()) # Both finished entries can go now
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["evictions"] == 2
+
+
+def test_callers_get_copies_of_the_cached_result():
+    cache = IdempotencyCache()
+    first = cache.run("k", lambda: {"status": "ok", "items": [1]})
+    first["items"].append(2)
+    second = cache.run("k", Counter())
+    assert second == {"status": "ok", "items": [1]}
+    second["status"] = "changed"
+    assert cache.run("k", Counter()) == {"status": "ok", "items": [1]}
+
+
+def test_none_is_cached_like_any_other_result():
+    cache = IdempotencyCache()
+    calls = []
+    assert cache.run("k", lambda: calls.append(1)) is None
+    assert cache.run("k", lambda: calls.append(1)) is None
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_error_results_are_not_cached():
+    cache = IdempotencyCache()
+    outcomes = iter([{"status": "error", "message": "try again"}, {"status": "ok"}])
+    assert cache.run("k", lambda: next(outcomes))["status"] == "error"
+    assert cache.run("k", lambda: next(outcomes))["status"] == "ok"
+    assert cache.stats()["uncached_errors"] == 1
+
+
+def test_exceptions_are_not_cached():
+    cache = IdempotencyCache()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.run("k", fail)
+    assert cache.run("k", lambda: {"status": "ok"}) == {"status": "ok"}
+
+
+def test_waiter_runs_the_call_itself_when_the_first_one_fails():
+    cache = IdempotencyCache()
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        return {"status": "error", "message": "transient"}
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.run("k", failing)))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.append(cache.run("k", lambda: {"status": "ok"})))
+    second.start()
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert sorted(result["status"] for result in results) == ["error", "ok"]
+
+
+def test_keys_from_an_idempotency_key_or_from_the_arguments():
+    make_key = IdempotencyCache.make_key
+    assert make_key("op", {"a": 1}, "req-1") == make_key("op", {"a": 2}, "req-1") == "op:key:req-1"
+    assert make_key("op", {"a": 1, "b": [1, 2]}) == make_key("op", {"b": [1, 2], "a": 1}) # Order-independent
+    assert make_key("op", {"a": 1}) != make_key("op", {"a": 2})
+    assert make_key("op", {"a": 1}) != make_key("other", {"a": 1})
+    assert make_key("op", {"a": 1}, "") == make_key("op", {"a": 1}) # An empty key means none
+
+
+def test_wrapped_function_is_keyed_on_its_bound_arguments():
+    cache = IdempotencyCache()
+    calls = []
+
+    @cache.wrap()
+    def approve(request_id, decision="approved", idempotency_key=""):
+        """Approves a request."""
+        calls.append((request_id, decision))
+        return {"status": "ok", "calls": len(calls)}
+
+    assert approve("r1")["calls"] == 1
+    assert approve("r1", "approved")["calls"] == 1 # Defaults are bound, so this is the same call
+    assert approve(request_id="r1")["calls"] == 1
+    assert approve("r1", "rejected")["calls"] == 2
+    assert approve("r2", idempotency_key="k1")["calls"] == 3
+    assert approve("r3", idempotency_key="k1")["calls"] == 3 # Same key, same answer
+    assert approve.__doc__ == "Approves a request."
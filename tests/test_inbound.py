@@ -0,0 +1,38 @@
+# tests/test_inbound.py
+
+import pytest
+
+from employee_pulse_agent.agents import classify_message
+from employee_pulse_agent.agents.inbound import OUT_OF_OFFICE, REPLY, UNSUBSCRIBE
+
+
+def _message(subject, body="", **headers):
+    lines = ["From: Alex <alex@example.com>", f"Subject: {subject}"]
+    lines.extend(f"{name.replace('_', '-')}: {value}" for name, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n" + body).encode()
+
+
+@pytest.mark.parametrize("subject, body", [
+    ("Unsubscribe", ""),
+    ("RE: unsubscribe me", ""),
+    ("Re: Q3 Pulse", "Please unsubscribe me.\r\n"),
+    ("Re: Q3 Pulse", "\r\nUNSUBSCRIBE\r\n\r\n> Take our survey\r\n"),
+])
+def test_explicit_unsubscribe_requests(subject, body):
+    assert classify_message(_message(subject, body)) == (UNSUBSCRIBE, ["alex@example.com"])
+
+
+@pytest.mark.parametrize("subject, body", [
+    ("Re: Q3 Pulse", "please don't unsubscribe me, I like these surveys"),
+    ("Re: how do I unsubscribe from the newsletter?", "Thanks"),
+    ("Re: Q3 Pulse", "Done, thanks!\r\n\r\n> To stop these emails, reply with\r\n> unsubscribe\r\n"),
+])
+def test_mentioning_unsubscribe_is_a_reply(subject, body):
+    assert classify_message(_message(subject, body))[0] == REPLY
+
+
+def test_out_of_office_markers():
+    assert classify_message(_message("Automatic reply: Q3 Pulse"))[0] == OUT_OF_OFFICE
+    assert classify_message(_message("Away from the office until Monday"))[0] == OUT_OF_OFFICE
+    assert classify_message(_message("Re: moving away from spreadsheets"))[0] == REPLY
+    assert classify_message(_message("Re: Q3 Pulse", Auto_Submitted="auto-replied"))[0] == OUT_OF_OFFICE
@@ -0,0 +1,31 @@
+# tests/test_invitation_template.py
+
+from employee_pulse_agent.agents import InvitationTemplate
+
+SECRET = b"test-secret"
+
+
+def _template(survey_id="s1", secret=SECRET):
+    return InvitationTemplate({"survey_id": survey_id, "title": "Q3 Pulse"}, secret=secret)
+
+
+def test_tokens_are_stable_for_the_same_survey_and_recipient():
+    assert _template().token_for("a@example.com") == _template().token_for("a@example.com")
+    assert _template().token_for("A@Example.com") == _template().token_for("a@example.com")
+
+
+def test_tokens_are_unique_across_recipients_surveys_and_secrets():
+    template = _template()
+    tokens = {template.token_for(f"user{i}@example.com") for i in range(1000)}
+    assert len(tokens) == 1000
+    assert _template("s2").token_for("a@example.com") != template.token_for("a@example.com")
+    assert _template(secret=b"other").token_for("a@example.com") != template.token_for("a@example.com")
+
+
+def test_render_fills_in_name_and_link():
+    template = _template()
+    body = template.render("a@example.com", "Ana")
+    assert body.startswith("Dear Ana,")
+    assert "http://survey.example.com/s/s1?t=" + template.token_for("a@example.com") in body
+    assert template.render("b@example.com").startswith("Dear Employee,")
+    assert "Q3 Pulse" in template.subject
@@ -0,0 +1,42 @@
+# tests/test_lazy_import.py
+#
+# Each check runs in a fresh interpreter, since this process has already imported the package.
+
+import os
+import subprocess
+import sys
+
+REPO = os.path.join(os.path.dirname(__file__), "..")
+
+
+def _run(code):
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO, capture_output=True, text=True, timeout=120,
+                            env={**os.environ, "PULSE_QUIET": "1"})
+    assert result.returncode == 0, result.stderr
+    return result.stdout.split()
+
+
+def test_importing_the_package_loads_neither_adk_nor_agent():
+    assert _run(
+        "import sys, employee_pulse_agent\n"
+        "print('google.adk' in sys.modules, 'employee_pulse_agent.agent' in sys.modules)"
+    ) == ["False", "False"]
+
+
+def test_services_are_built_on_first_use_without_adk():
+    assert _run(
+        "import sys\n"
+        "import employee_pulse_agent.agent as agent\n"
+        "print(agent._services is None)\n"
+        "orchestrator = agent.get_orchestrator()\n"
+        "print(agent._services is not None, orchestrator is agent.get_orchestrator(), 'google.adk' in sys.modules)"
+    ) == ["True", "True", "True", "False"]
+
+
+def test_root_agent_is_built_through_the_package_attribute():
+    assert _run(
+        "import sys, employee_pulse_agent\n"
+        "print(employee_pulse_agent.agent._root_agent is None)\n"
+        "root = employee_pulse_agent.root_agent\n"
+        "print('google.adk' in sys.modules, root is employee_pulse_agent.agent.root_agent)"
+    ) == ["True", "True", "True"]
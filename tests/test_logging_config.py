@@ -0,0 +1,64 @@
+# tests/test_logging_config.py
+
+import io
+import logging
+import logging.handlers
+import threading
+
+import pytest
+
+from employee_pulse_agent.agents import configure_logging, get_logger, logging_config, shutdown_logging
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    yield
+    configure_logging() # Back to the environment's settings (quiet under the test suite)
+
+
+def _lines(stream):
+    return stream.getvalue().splitlines()
+
+
+def test_records_reach_the_stream_through_the_queue():
+    stream = io.StringIO()
+    logger = configure_logging(level="INFO", quiet=False, stream=stream)
+    assert [type(handler) for handler in logger.handlers] == [logging.handlers.QueueHandler]
+    thread = threading.Thread(target=lambda: get_logger("Worker").info("sent %d emails", 3))
+    thread.start()
+    thread.join()
+    shutdown_logging() # Drains the queue
+    assert len(_lines(stream)) == 1
+    assert _lines(stream)[0].endswith("INFO employee_pulse_agent.Worker: sent 3 emails")
+
+
+def test_quiet_mode_keeps_only_warnings_and_errors():
+    stream = io.StringIO()
+    configure_logging(level="DEBUG", quiet=True, stream=stream)
+    logger = get_logger("Quiet")
+    assert not logger.isEnabledFor(logging.INFO)
+    logger.info("hidden")
+    logger.warning("shown")
+    logger.error("also shown")
+    shutdown_logging()
+    assert [line.split(" ", 3)[2] for line in _lines(stream)] == ["WARNING", "ERROR"]
+
+
+def test_pulse_quiet_environment_variable(monkeypatch):
+    monkeypatch.setenv("PULSE_QUIET", "true")
+    assert configure_logging(level="DEBUG", stream=io.StringIO()).level == logging.WARNING
+    monkeypatch.setenv("PULSE_QUIET", "0")
+    monkeypatch.setenv("PULSE_LOG_LEVEL", "debug")
+    assert configure_logging(stream=io.StringIO()).level == logging.DEBUG
+
+
+def test_listener_starts_and_stops():
+    configure_logging(quiet=False, stream=io.StringIO())
+    listener = logging_config._listener
+    assert listener is not None and listener._thread.is_alive()
+    configure_logging(quiet=False, stream=io.StringIO()) # Reconfiguring replaces the listener
+    assert logging_config._listener is not listener
+    assert listener._thread is None
+    shutdown_logging()
+    assert logging_config._listener is None
+    shutdown_logging() # Safe to call twice
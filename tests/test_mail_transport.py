@@ -0,0 +1,136 @@
+# tests/test_mail_transport.py
+#
+# SMTPTransport against a local stand-in SMTP server. Recipients steer the server:
+#   refused...      -> 550 on RCPT
+#   drop...         -> connection dropped on the first RCPT for that address
+#   droprefused...  -> dropped first, then 550 when retried
+
+import socketserver
+import threading
+
+import pytest
+
+from employee_pulse_agent.agents import SMTPTransport
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write(line + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self._reply(b"220 stand-in ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in (b"EHLO", b"HELO"):
+                self._reply(b"250 stand-in")
+            elif command == b"RCPT":
+                address = line.split(b"<", 1)[1].split(b">", 1)[0].decode()
+                with server.lock:
+                    first_time = address not in server.seen
+                    server.seen.add(address)
+                if address.startswith("drop") and first_time:
+                    return # Hang up without replying
+                if address.startswith(("refused", "droprefused")):
+                    self._reply(b"550 no such user")
+                else:
+                    self._reply(b"250 ok")
+            elif command == b"DATA":
+                self._reply(b"354 go ahead")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with server.lock:
+                    server.delivered += 1
+                self._reply(b"250 queued")
+            elif command == b"QUIT":
+                self._reply(b"221 bye")
+                return
+            else: # MAIL, RSET, NOOP
+                self._reply(b"250 ok")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+@pytest.fixture
+def smtp_server():
+    server = _Server(("127.0.0.1", 0), _Handler)
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.delivered = 0
+    server.seen = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def transport(smtp_server):
+    transport = SMTPTransport("127.0.0.1", smtp_server.server_address[1], pool_size=2, timeout=5)
+    yield transport
+    transport.close()
+
+
+def _messages(*recipients):
+    return [(recipient, "Pulse survey", "Please respond.") for recipient in recipients]
+
+
+def test_refused_recipient_does_not_fail_the_rest_of_the_batch(transport, smtp_server):
+    results = transport.send_batch(_messages("a@example.com", "refused@example.com", "b@example.com"))
+    assert results == [True, False, True]
+    assert smtp_server.delivered == 2
+
+
+def test_dropped_connection_is_reopened_and_the_message_retried(transport, smtp_server):
+    results = transport.send_batch(_messages("a@example.com", "drop@example.com", "b@example.com"))
+    assert results == [True, True, True]
+    assert smtp_server.delivered == 3
+    assert smtp_server.connections == 2
+
+
+def test_refusal_after_reconnect_only_fails_that_recipient(transport, smtp_server):
+    results = transport.send_batch(_messages("droprefused@example.com", "a@example.com", "b@example.com"))
+    assert results == [False, True, True]
+    assert smtp_server.delivered == 2
+
+
+def test_unreachable_server_fails_the_batch(smtp_server):
+    port = smtp_server.server_address[1]
+    transport = SMTPTransport("127.0.0.1", port, timeout=5)
+    transport.send_batch(_messages("a@example.com")) # Leaves a pooled connection behind
+    smtp_server.shutdown()
+    smtp_server.server_close()
+    results = transport.send_batch(_messages("drop@example.com", "b@example.com"))
+    assert results == [False, False]
+
+
+def test_connections_are_reused_across_batches(transport, smtp_server):
+    for _ in range(5):
+        assert transport.send_batch(_messages("a@example.com", "b@example.com")) == [True, True]
+    assert smtp_server.delivered == 10
+    assert smtp_server.connections == 1
+
+
+def test_pool_caps_open_connections(transport, smtp_server):
+    barrier = threading.Barrier(4)
+
+    def send():
+        barrier.wait()
+        transport.send_batch(_messages(*[f"user{i}@example.com" for i in range(20)]))
+
+    threads = [threading.Thread(target=send) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert smtp_server.delivered == 80
+    assert smtp_server.connections <= 2
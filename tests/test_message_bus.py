@@ -0,0 +1,125 @@
+# tests/test_message_bus.py
+
+import functools
+
+import pytest
+
+from conftest import build_orchestrator, send_survey, stop_orchestrator
+from employee_pulse_agent import agent as agent_module
+from employee_pulse_agent.agents import (BaseAgent, CommunicationAgent, DomainThrottle, InvitationTemplate, MessageBus,
+                                         ReminderScheduler, SimulatedClock)
+from employee_pulse_agent.agents.delivery import SENT, SUPPRESSED
+
+
+class RecordingTransport:
+    def __init__(self):
+        self.batches = []
+
+    def send_batch(self, messages):
+        self.batches.append([message[0] for message in messages])
+        return [True] * len(messages)
+
+    @property
+    def recipients(self):
+        return [email for batch in self.batches for email in batch]
+
+    def close(self):
+        pass
+
+
+class TokenProbe(BaseAgent):
+    """Reports the link token a process would send for a recipient."""
+    def token_for(self, survey_id, email):
+        return InvitationTemplate({"survey_id": survey_id}).token_for(email)
+
+
+def _send_worker_probe(worker_factory):
+    worker_factory() # Sets the process up exactly as a send worker
+    return TokenProbe("TokenProbe")
+
+
+@pytest.fixture
+def bus_setup():
+    """An orchestrator sending through a bus to a separate CommunicationAgent, as a worker process would."""
+    transport = RecordingTransport()
+    sender = CommunicationAgent(transport=transport, max_workers=1, retry_backoff=0)
+    bus = MessageBus()
+    bus.register(sender)
+    bus.start()
+    orchestrator = build_orchestrator(message_bus=bus, bus_chunk_size=2, bus_chunks_in_flight=2,
+                                      reminder_scheduler=ReminderScheduler(SimulatedClock(1000)), reminder_offsets=(10,))
+    yield orchestrator, transport
+    stop_orchestrator(orchestrator)
+    sender.shutdown()
+    bus.close()
+
+
+def test_invitations_stream_over_the_bus_in_chunks(bus_setup):
+    orchestrator, transport = bus_setup
+    audience = [f"user{i}@example.com" for i in range(5)]
+    survey = send_survey(orchestrator, "s1", audience=iter(audience))
+    assert survey["status"] == "sent"
+    assert (survey["recipient_count"], survey["sent_count"], survey["failed_count"]) == (5, 5, 0)
+    assert transport.recipients == audience
+    assert orchestrator.message_bus.stats()["CommunicationAgent"]["delivered"] == 3 # Chunks of 2, 2 and 1
+    assert orchestrator.delivery_ledger("s1").to_bytes() == bytes([SENT] * 5)
+
+
+def test_suppression_in_the_orchestrator_process_applies_to_bus_sends(bus_setup):
+    orchestrator, transport = bus_setup
+    orchestrator.communication_agent.suppression.add("b@example.com", "unsubscribed")
+    survey = send_survey(orchestrator, "s1", audience=["a@example.com", "b@example.com", "c@example.com"])
+    assert "b@example.com" not in transport.recipients
+    assert (survey["recipient_count"], survey["sent_count"], survey["suppressed_count"]) == (2, 2, 1)
+    assert orchestrator.delivery_ledger("s1").to_bytes() == bytes([SENT, SUPPRESSED, SENT])
+
+
+def test_reminders_go_over_the_bus(bus_setup):
+    orchestrator, transport = bus_setup
+    survey = send_survey(orchestrator, "s1", audience=["a@example.com", "b@example.com", "c@example.com"])
+    answers = {question["id"]: 5 for question in survey["questions"]}
+    orchestrator.record_survey_responses("s1", [("a@example.com", answers, None)])
+    orchestrator.communication_agent.suppression.add("c@example.com", "bounced")
+    transport.batches.clear()
+
+    orchestrator.reminder_scheduler.advance(10)
+    orchestrator.dispatch_queue.wait_all()
+    assert transport.recipients == ["b@example.com"]
+    reminder = orchestrator.survey_store.get("s1")["reminders"][0]
+    assert (reminder["sent"], reminder["failed"], reminder["skipped_responded"]) == (1, 0, 1)
+
+
+def test_chunks_the_bus_cannot_deliver_count_as_failed(bus_setup):
+    orchestrator, transport = bus_setup
+    orchestrator.send_route = "NoSuchAgent"
+    survey = send_survey(orchestrator, "s1", audience=["a@example.com", "b@example.com", "c@example.com"])
+    assert survey["status"] == "send_failed"
+    assert (survey["recipient_count"], survey["sent_count"], survey["failed_count"]) == (3, 0, 3)
+
+    orchestrator.send_route = "CommunicationAgent"
+    result = orchestrator.retry_failed_invitations("s1", wait=True)
+    assert (result["status"], result["failed"]) == ("sent", 0)
+    assert transport.recipients == ["a@example.com", "b@example.com", "c@example.com"]
+
+
+def test_throttle_share_divides_the_configured_rates(monkeypatch):
+    monkeypatch.setenv("PULSE_SEND_RATE", "100")
+    monkeypatch.setenv("PULSE_DOMAIN_RATES", "example.com=8")
+    monkeypatch.setenv("PULSE_SEND_BURST", "2")
+    throttle = DomainThrottle.from_env(share=0.25)
+    assert throttle._overall.rate == 25
+    assert throttle.domain_rates == {"example.com": 2}
+    assert throttle.burst == 1.0 # Never below one message
+
+
+def test_send_workers_sign_links_with_this_process_secret(monkeypatch):
+    monkeypatch.delenv("PULSE_LINK_SECRET", raising=False) # Each process would otherwise pick a random key
+    bus = MessageBus()
+    bus.register_process_pool("TokenProbe", functools.partial(_send_worker_probe, agent_module._communication_worker_factory(1)),
+                              processes=1)
+    bus.start()
+    try:
+        worker_token = bus.call("TokenProbe", "token_for", {"survey_id": "s1", "email": "a@example.com"}, timeout=60)
+    finally:
+        bus.close()
+    assert worker_token == InvitationTemplate({"survey_id": "s1"}).token_for("a@example.com")
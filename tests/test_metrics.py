@@ -0,0 +1,181 @@
+# tests/test_metrics.py
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from employee_pulse_agent.agents import MetricsExporter, MetricsRegistry
+from employee_pulse_agent.agents.metrics import Histogram, instrument_class
+
+
+def test_observations_are_folded_into_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(seconds)
+    assert histogram.count == 0 and len(histogram._pending) == 4 # Not folded until read
+    counts, count, total, errors = histogram.values()
+    assert counts == [2, 1, 1] # <= 0.1, <= 1.0, +Inf
+    assert (count, errors) == (4, 0)
+    assert total == pytest.approx(2.65)
+    assert not histogram._pending
+
+
+def test_folds_every_fold_at_observations():
+    histogram = Histogram()
+    for _ in range(Histogram.FOLD_AT):
+        histogram.observe(0.001)
+    assert histogram.count == Histogram.FOLD_AT
+    assert not histogram._pending
+
+
+def test_quantiles():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    assert histogram.quantile(0.5) is None # No calls yet
+    assert histogram.summary()["p50_ms"] is None and histogram.summary()["mean_ms"] is None
+    for seconds in [0.05] * 90 + [0.5] * 9 + [5.0]:
+        histogram.observe(seconds)
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.95) == 1.0
+    assert histogram.quantile(1.0) == float("inf") # The slowest call is past the last bound
+    summary = histogram.summary()
+    assert (summary["calls"], summary["p50_ms"], summary["p95_ms"]) == (100, 100.0, 1000.0)
+
+
+def test_only_slow_calls_report_infinity():
+    histogram = Histogram(buckets=(0.1,))
+    histogram.observe(3.0)
+    assert histogram.summary()["p99_ms"] == "+Inf"
+
+
+def test_errors_are_counted_together_with_their_latency():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5, error=True)
+    assert (histogram.count, histogram.errors) == (1, 1) # The failed call is already in the buckets
+    assert histogram.counts == [0, 1, 0]
+    counts, count, total, errors = histogram.values()
+    assert (counts, count, errors) == ([1, 1, 0], 2, 1)
+    assert total == pytest.approx(0.55)
+
+
+def test_reset():
+    histogram = Histogram()
+    histogram.observe(0.1, error=True)
+    histogram.reset()
+    assert histogram.values()[1:] == (0, 0.0, 0)
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+
+    @registry.timed("pulse_tool", tool="echo")
+    def echo(value):
+        return value
+
+    assert echo(3) == 3
+    histogram = registry.histogram("pulse_tool", tool="echo")
+    assert histogram.values()[1] == 0
+    assert registry.snapshot()["timings"] == {}
+
+    registry.enabled = True
+    echo(4)
+    assert histogram.values()[1] == 1
+    assert list(registry.snapshot()["timings"]["pulse_tool"]) == ["echo"]
+
+
+def test_exceptions_count_as_errors():
+    registry = MetricsRegistry(enabled=True)
+
+    @registry.timed("pulse_tool", tool="fail")
+    def fail():
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        fail()
+    summary = registry.snapshot()["timings"]["pulse_tool"]["fail"]
+    assert (summary["calls"], summary["errors"]) == (1, 1)
+
+
+def test_instrument_class_times_public_methods():
+    registry = MetricsRegistry(enabled=True)
+
+    class Agent:
+        def work(self):
+            return "done"
+
+        def _helper(self):
+            return "private"
+
+    instrument_class(Agent, registry)
+    assert Agent().work() == "done" and Agent()._helper() == "private"
+    assert list(registry.snapshot()["timings"]["pulse_agent_method"]) == ["Agent.work"]
+
+
+def _registry_with_data():
+    registry = MetricsRegistry(enabled=True)
+    histogram = registry.histogram("pulse_tool", tool='say "hi"')
+    histogram.buckets = (0.1, 1.0)
+    histogram.counts = [0, 0, 0]
+    histogram.observe(0.05)
+    histogram.observe(0.5, error=True)
+    registry.register("pulse_queue", "gauge", "Jobs by state.", lambda: {"queued": 2, "sending": 1, "note": "x"}, label="state")
+    registry.register("pulse_size", "gauge", "Entries.", lambda: 7)
+    registry.register("pulse_unknown", "gauge", "Not available.", lambda: None)
+    return registry
+
+
+def test_prometheus_text_format():
+    assert _registry_with_data().render_prometheus().splitlines() == [
+        "# HELP pulse_tool_seconds Call latency.",
+        "# TYPE pulse_tool_seconds histogram",
+        'pulse_tool_seconds_bucket{tool="say \\"hi\\"",le="0.1"} 1',
+        'pulse_tool_seconds_bucket{tool="say \\"hi\\"",le="1.0"} 2',
+        'pulse_tool_seconds_bucket{tool="say \\"hi\\"",le="+Inf"} 2',
+        'pulse_tool_seconds_sum{tool="say \\"hi\\""} 0.55',
+        'pulse_tool_seconds_count{tool="say \\"hi\\""} 2',
+        "# HELP pulse_tool_errors_total Calls that raised.",
+        "# TYPE pulse_tool_errors_total counter",
+        'pulse_tool_errors_total{tool="say \\"hi\\""} 1',
+        "# HELP pulse_queue Jobs by state.",
+        "# TYPE pulse_queue gauge",
+        'pulse_queue{state="queued"} 2',
+        'pulse_queue{state="sending"} 1',
+        "# HELP pulse_size Entries.",
+        "# TYPE pulse_size gauge",
+        "pulse_size 7",
+    ]
+
+
+def test_prometheus_text_for_an_unlabeled_histogram():
+    registry = MetricsRegistry(enabled=True)
+    histogram = registry.histogram("pulse_flush")
+    histogram.buckets, histogram.counts = (0.1,), [0, 0]
+    histogram.observe(0.05, error=True)
+    assert registry.render_prometheus().splitlines() == [
+        "# HELP pulse_flush_seconds Call latency.",
+        "# TYPE pulse_flush_seconds histogram",
+        'pulse_flush_seconds_bucket{le="0.1"} 1',
+        'pulse_flush_seconds_bucket{le="+Inf"} 1',
+        "pulse_flush_seconds_sum 0.05",
+        "pulse_flush_seconds_count 1",
+        "# HELP pulse_flush_errors_total Calls that raised.",
+        "# TYPE pulse_flush_errors_total counter",
+        "pulse_flush_errors_total 1",
+    ]
+
+
+def test_exporter_writes_a_file_and_serves_http(tmp_path):
+    registry = _registry_with_data()
+    path = str(tmp_path / "pulse.prom")
+    exporter = MetricsExporter(registry, path=path, interval=60, port=0).start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert response.read().decode("utf-8") == registry.render_prometheus()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/other", timeout=5)
+    finally:
+        exporter.stop()
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == registry.render_prometheus()
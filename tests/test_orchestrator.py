@@ -0,0 +1,159 @@
+# tests/test_orchestrator.py
+
+from conftest import build_orchestrator, send_survey, stop_orchestrator, survey_params
+from employee_pulse_agent.agents import SQLiteBackend
+from employee_pulse_agent.agents.orchestrator_agent import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+def _initiate(orchestrator, count, **extra):
+    return [orchestrator.initiate_pulse_survey(survey_params(f"s{i}", **extra)) for i in range(count)]
+
+
+def test_list_pages_with_default_limit_and_cursor(orchestrator):
+    _initiate(orchestrator, DEFAULT_PAGE_SIZE + 5)
+    first = orchestrator.list_active_surveys()
+    assert len(first["surveys"]) == DEFAULT_PAGE_SIZE
+    assert first["total"] == DEFAULT_PAGE_SIZE + 5
+    second = orchestrator.list_active_surveys(cursor=first["next_cursor"])
+    assert [s["survey_id"] for s in second["surveys"]] == [f"s{i}" for i in range(DEFAULT_PAGE_SIZE, DEFAULT_PAGE_SIZE + 5)]
+    assert second["next_cursor"] is None
+
+
+def test_list_rejects_non_positive_limit_and_caps_large_ones(orchestrator):
+    _initiate(orchestrator, 3)
+    assert orchestrator.list_active_surveys(limit=0)["status"] == "error"
+    assert orchestrator.list_active_surveys(limit=-5)["status"] == "error"
+    assert len(orchestrator.list_active_surveys(limit=MAX_PAGE_SIZE * 10)["surveys"]) == 3
+
+
+def test_list_total_with_both_filters(orchestrator):
+    _initiate(orchestrator, 4)
+    page = orchestrator.list_active_surveys(status="pending_approval", approver="hr@example.com", limit=2)
+    assert page["total"] == 4
+    assert orchestrator.list_active_surveys(status="sent", approver="hr@example.com")["total"] == 0
+
+
+def test_get_survey_results(orchestrator):
+    survey = send_survey(orchestrator, "s1")
+    answers = {question["id"]: 4 for question in survey["questions"]}
+    orchestrator.record_survey_responses("s1", [("a@example.com", answers, None)])
+    results = orchestrator.get_survey_results("s1")
+    assert results["status"] == "ok"
+    assert results["respondents"] == 1
+    assert orchestrator.get_survey_results("missing")["status"] == "error"
+
+
+def test_restart_resumes_interrupted_dispatches(tmp_path):
+    path = str(tmp_path / "state.db")
+    backend = SQLiteBackend(path)
+    before = build_orchestrator(backend=backend)
+    for survey_id, status in (("approved", "approved_ready_to_send"), ("queued", "queued"), ("sending", "sending")):
+        before.initiate_pulse_survey(survey_params(survey_id))
+        before.survey_store.update(survey_id, status=status)
+    stop_orchestrator(before)
+    backend.close()
+
+    backend = SQLiteBackend(path)
+    after = build_orchestrator(backend=backend)
+    try:
+        resumed = after.resume_dispatches()
+        assert sorted(resumed["requeued"]) == ["approved", "queued"]
+        assert resumed["interrupted"] == ["sending"]
+        after.dispatch_queue.wait_all()
+        assert after.survey_store.get("approved")["status"] == "sent"
+        assert after.survey_store.get("queued")["status"] == "sent"
+        assert after.survey_store.get("sending")["status"] == "send_failed"
+
+        retry = after.retry_failed_invitations("sending", wait=True)
+        assert retry["status"] == "sent"
+        assert after.delivery_ledger("sending").sent_count == 2
+    finally:
+        stop_orchestrator(after)
+        backend.close()
+
+
+def test_repeated_decision_after_a_restart_changes_nothing(tmp_path):
+    path = str(tmp_path / "state.db")
+    backend = SQLiteBackend(path)
+    before = build_orchestrator(backend=backend)
+    sent = before.initiate_pulse_survey(survey_params("sent"))["approval_request_id"]
+    rejected = before.initiate_pulse_survey(survey_params("rejected"))["approval_request_id"]
+    before.handle_approval_response(sent, "approved", wait=True)
+    before.handle_approval_response(rejected, "rejected")
+    stop_orchestrator(before)
+    backend.close()
+
+    backend = SQLiteBackend(path)
+    after = build_orchestrator(backend=backend)
+    try:
+        assert list(after.survey_store.surveys) == [] # Finished surveys aren't loaded at startup
+        result = after.handle_approval_response(rejected, "approved")
+        assert (result["status"], result["duplicate"]) == ("rejected", True)
+        batch = after.handle_approval_responses([(sent, "rejected")])
+        assert batch["results"][0]["status"] == "sent"
+        assert after.approval_agent.get_approval_status(rejected) == "rejected"
+        assert after.approval_agent.get_approval_status(sent) == "approved"
+        assert after.dispatch_queue.get("sent") is None # Not queued again
+    finally:
+        stop_orchestrator(after)
+        backend.close()
+
+
+def test_approval_agent_does_not_re_record_a_decision(orchestrator):
+    approvals = orchestrator.approval_agent
+    request_id, _ = approvals.request_approval({"survey_id": "s1", "title": "Pulse"}, "hr@example.com")
+    assert approvals.record_approval_response(request_id, "rejected")
+    assert not approvals.record_approval_response(request_id, "approved")
+    assert approvals.record_approval_responses([(request_id, "approved"), ("approval_999", "approved")]) == [False, False]
+    assert approvals.get_approval_status(request_id) == "rejected"
+
+
+def test_single_and_batch_approval_requests_are_stored_alike(orchestrator):
+    approvals = orchestrator.approval_agent
+    single = approvals.request_approval({"survey_id": "s1", "title": "One"}, "hr@example.com")
+    batch = approvals.request_approvals([({"survey_id": "s2", "title": "Two"}, "hr@example.com"),
+                                         ({"survey_id": "s3"}, "lead@example.com")])
+    assert [single] + batch == [("approval_001", "pending"), ("approval_002", "pending"), ("approval_003", "pending")]
+    assert approvals.approval_requests["approval_001"] == {"survey_title": "One", "approver": "hr@example.com", "status": "pending",
+                                                           "survey_details": {"survey_id": "s1", "title": "One"}}
+    assert approvals.approval_requests["approval_003"]["survey_title"] == "N/A"
+    assert approvals.approval_requests["approval_003"]["approver"] == "lead@example.com"
+
+
+def test_survey_that_cannot_be_stored_is_reported(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "state.db"))
+    orchestrator = build_orchestrator(backend=backend)
+    try:
+        result = orchestrator.initiate_pulse_survey(survey_params("bad", owner=object()))
+        assert result["status"] == "error"
+        assert "bad" not in orchestrator.survey_store
+
+        batch = orchestrator.initiate_pulse_surveys([survey_params("good"), survey_params("bad", owner=object())])
+        assert [r["status"] for r in batch["results"]] == ["pending_approval", "error"]
+        assert "bad" not in orchestrator.survey_store
+        assert orchestrator.approval_agent.approval_requests["approval_002"]["status"] == "withdrawn"
+    finally:
+        stop_orchestrator(orchestrator)
+        backend.close()
+
+
+def test_batch_approval_reports_malformed_items_without_stopping(orchestrator):
+    first, second = [orchestrator.initiate_pulse_survey(survey_params(f"s{i}"))["approval_request_id"] for i in range(2)]
+    outcome = orchestrator.handle_approval_responses([
+        {"approval_request_id": first},
+        {"approval_request_id": first, "decision": "approved"},
+        "approved",
+        (second, "rejected"),
+    ], wait=True)
+    statuses = [result["status"] for result in outcome["results"]]
+    assert statuses == ["error", "sent", "error", "rejected"]
+    assert outcome["counts"] == {"error": 2, "sent": 1, "rejected": 1}
+
+
+def test_batch_initiation_gives_each_survey_its_own_questions(orchestrator):
+    defaults = {key: value for key, value in survey_params("template").items() if key != "survey_id"}
+    orchestrator.initiate_pulse_surveys([{"survey_id": "s1"}, {"survey_id": "s2"}], defaults=defaults)
+    first, second = (orchestrator.survey_store.get(survey_id)["questions"] for survey_id in ("s1", "s2"))
+    assert first == second
+    first[0]["text"] = "changed"
+    assert second[0]["text"] != "changed"
@@ -0,0 +1,169 @@
+# tests/test_persistence.py
+
+import sqlite3
+
+import pytest
+
+from employee_pulse_agent.agents import ApprovalAgent, SQLiteBackend, SurveyStore
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "state.db"), flush_interval=None)
+    yield backend
+    backend.close()
+
+
+def _survey(survey_id, status="pending_approval", **extra):
+    return {"survey_id": survey_id, "status": status, "title": "Pulse", **extra}
+
+
+def _rows(backend, table):
+    with sqlite3.connect(backend.path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_repeated_saves_collapse_into_one_write(backend):
+    for status in ("pending_approval", "approved_ready_to_send", "sent"):
+        backend.save_survey(_survey("s1", status=status))
+    assert _rows(backend, "surveys") == 0 # Still buffered
+    backend.flush()
+    assert _rows(backend, "surveys") == 1
+    assert backend.load_survey("s1")["status"] == "sent"
+
+
+def test_batch_size_triggers_a_write(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "state.db"), batch_size=2, flush_interval=None)
+    try:
+        backend.save_survey(_survey("s1"))
+        assert _rows(backend, "surveys") == 0
+        backend.save_survey(_survey("s2"))
+        assert _rows(backend, "surveys") == 2
+    finally:
+        backend.close()
+
+
+def test_audience_is_kept_when_later_saves_leave_it_out(backend):
+    backend.save_survey(_survey("s1", target_audience_emails=["a@example.com"]), include_audience=True)
+    backend.flush()
+    backend.save_survey(_survey("s1", status="sent"))
+    backend.flush()
+    survey = backend.load_survey("s1")
+    assert survey["status"] == "sent"
+    assert survey["target_audience_emails"] == ["a@example.com"]
+
+
+def test_restart_loads_open_surveys_and_finished_ones_on_demand(tmp_path):
+    path = str(tmp_path / "state.db")
+    backend = SQLiteBackend(path)
+    store = SurveyStore(backend=backend)
+    store.put(_survey("open"))
+    store.put(_survey("done"))
+    store.update("done", status="sent")
+    backend.close()
+
+    backend = SQLiteBackend(path)
+    try:
+        store = SurveyStore(backend=backend)
+        assert list(store.surveys) == ["open"]
+        assert store.get("done")["status"] == "sent"
+        assert "done" in store
+    finally:
+        backend.close()
+
+
+def test_approval_ids_continue_after_a_restart(tmp_path):
+    path = str(tmp_path / "state.db")
+    backend = SQLiteBackend(path)
+    approvals = ApprovalAgent(backend=backend)
+    first, _ = approvals.request_approval({"survey_id": "s1", "title": "One"}, "hr@example.com")
+    second, _ = approvals.request_approval({"survey_id": "s2", "title": "Two"}, "hr@example.com")
+    approvals.record_approval_response(first, "approved")
+    backend.close()
+
+    backend = SQLiteBackend(path)
+    try:
+        approvals = ApprovalAgent(backend=backend)
+        assert list(approvals.approval_requests) == [second] # Only pending requests are loaded
+        assert approvals.get_approval_status(first) == "approved"
+        third, _ = approvals.request_approval({"survey_id": "s3", "title": "Three"}, "hr@example.com")
+        assert (first, second, third) == ("approval_001", "approval_002", "approval_003")
+    finally:
+        backend.close()
+
+
+class FailingConnection:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, *args):
+        return self.conn.execute(sql, *args)
+
+    def executemany(self, sql, rows):
+        raise sqlite3.OperationalError("disk I/O error")
+
+
+def test_buffered_writes_survive_a_failed_commit(backend):
+    backend.save_survey(_survey("s1"), include_audience=True)
+    backend.save_approval("approval_001", {"status": "pending", "survey_details": {"survey_id": "s1"}})
+    backend.save_delivery_ledger("s1", b"\x01\x02")
+    real_conn = backend._conn
+    backend._conn = FailingConnection(real_conn)
+    with pytest.raises(sqlite3.OperationalError):
+        backend.flush()
+    backend._conn = real_conn
+    backend.flush()
+    assert backend.load_survey("s1")["title"] == "Pulse"
+    assert backend.load_approval("approval_001")["status"] == "pending"
+    assert backend.load_delivery_ledger("s1") == b"\x01\x02"
+
+
+def test_generators_are_stored_as_null(backend):
+    backend.save_survey(_survey("s1", recipients=(email for email in ["a@example.com"])))
+    backend.flush()
+    assert backend.load_survey("s1")["recipients"] is None
+
+
+def test_failed_batch_size_write_is_logged_and_retried(tmp_path, caplog):
+    backend = SQLiteBackend(str(tmp_path / "state.db"), batch_size=1, flush_interval=None)
+    try:
+        real_conn = backend._conn
+        backend._conn = FailingConnection(real_conn)
+        backend.save_survey(_survey("s1")) # Reaches batch_size, but the caller isn't the one to fail
+        assert "disk I/O error" in caplog.text
+        backend._conn = real_conn
+        backend.flush()
+        assert backend.load_survey("s1") is not None
+    finally:
+        backend.close()
+
+
+def test_unencodable_record_is_rejected_when_saved(backend):
+    with pytest.raises(TypeError, match="survey bad"):
+        backend.save_survey(_survey("bad", owner=object()))
+    with pytest.raises(TypeError, match="approval approval_001"):
+        backend.save_approval("approval_001", {"status": "pending", "owner": object()})
+    backend.save_survey(_survey("good"))
+    backend.flush()
+    assert backend.load_survey("good") is not None
+    assert backend.load_survey("bad") is None
+    assert backend.load_approval("approval_001") is None
+
+
+def test_store_is_unchanged_when_a_change_cannot_be_persisted(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "state.db"), batch_size=1, flush_interval=None)
+    try:
+        store = SurveyStore(backend=backend)
+        store.put(_survey("s1", approver_contact="hr@example.com"))
+        with pytest.raises(TypeError):
+            store.update("s1", status="sent", owner=object())
+        assert store.get("s1") == _survey("s1", approver_contact="hr@example.com")
+        assert [s["survey_id"] for s in store.query(status="pending_approval")] == ["s1"]
+        assert store.query(status="sent") == []
+        with pytest.raises(TypeError):
+            store.put(_survey("s2", owner=object()))
+        assert "s2" not in store
+        assert store.count() == 1
+        assert backend.load_survey("s1")["status"] == "pending_approval"
+    finally:
+        backend.close()
@@ -0,0 +1,28 @@
+# tests/test_question_bank.py
+
+from employee_pulse_agent.agents import QuestionBank
+from employee_pulse_agent.agents.question_bank import DEFAULT_QUESTIONS
+
+
+def test_returned_questions_are_copies():
+    bank = QuestionBank(DEFAULT_QUESTIONS)
+    first = bank.select(topic="wellness", num_questions=2)
+    first[0]["text"] = "changed"
+    first[0]["tags"].append("changed")
+    again = bank.select(topic="wellness", num_questions=2)
+    assert again[0]["text"] == "How would you rate your current work-life balance?"
+    assert again[0]["tags"] == []
+    assert bank.cache_info().hits == 1
+
+
+def test_negative_num_questions_selects_nothing():
+    bank = QuestionBank(DEFAULT_QUESTIONS)
+    assert bank.select(topic="wellness", num_questions=-1) == []
+    assert bank.select(topic="wellness", num_questions=-1, seed=7) == []
+
+
+def test_seeded_selection_is_reproducible():
+    bank = QuestionBank(DEFAULT_QUESTIONS)
+    first = [q["id"] for q in bank.select(num_questions=3, seed=11)]
+    bank.clear_cache()
+    assert [q["id"] for q in bank.select(num_questions=3, seed=11)] == first
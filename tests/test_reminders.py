@@ -0,0 +1,129 @@
+# tests/test_reminders.py
+
+from conftest import build_orchestrator, send_survey, stop_orchestrator
+from employee_pulse_agent.agents import ReminderScheduler, SimulatedClock, SQLiteBackend
+
+
+def _scheduler():
+    return ReminderScheduler(SimulatedClock(1000))
+
+
+def test_reminders_fire_in_due_order_as_time_advances():
+    scheduler = _scheduler()
+    fired = []
+    scheduler.schedule("b", 1020, lambda: fired.append("b"))
+    scheduler.schedule("a", 1010, lambda: fired.append("a"))
+    assert scheduler.advance(5) == 0
+    assert scheduler.advance(10) == 1
+    assert fired == ["a"]
+    assert scheduler.advance(100) == 1
+    assert fired == ["a", "b"]
+    assert len(scheduler) == 0
+    assert scheduler.clock() == 1115
+
+
+def test_cancel():
+    scheduler = _scheduler()
+    fired = []
+    scheduler.schedule("a", 1010, lambda: fired.append("a"))
+    assert scheduler.cancel("a")
+    assert not scheduler.cancel("a")
+    scheduler.advance(100)
+    assert fired == []
+
+
+def test_reschedule_replaces_the_earlier_reminder():
+    scheduler = _scheduler()
+    fired = []
+    scheduler.schedule("a", 1010, lambda: fired.append("first"))
+    scheduler.schedule("a", 1050, lambda: fired.append("second"))
+    assert scheduler.due_time("a") == 1050
+    scheduler.advance(20)
+    assert fired == []
+    scheduler.advance(40)
+    assert fired == ["second"]
+
+
+def test_callbacks_can_schedule_within_the_window():
+    scheduler = _scheduler()
+    fired = []
+
+    def first():
+        fired.append(scheduler.clock())
+        scheduler.schedule("a", scheduler.clock() + 10, lambda: fired.append(scheduler.clock()))
+
+    scheduler.schedule("a", 1010, first)
+    assert scheduler.advance(30) == 2
+    assert fired == [1010, 1020]
+
+
+def _advance(orchestrator, seconds):
+    orchestrator.reminder_scheduler.advance(seconds)
+    orchestrator.dispatch_queue.wait_all()
+
+
+def test_reminders_skip_respondents_and_stop_after_the_last_offset():
+    orchestrator = build_orchestrator(reminder_scheduler=_scheduler(), reminder_offsets=(10, 20))
+    try:
+        audience = ["a@example.com", "b@example.com", "c@example.com"]
+        survey = send_survey(orchestrator, "s1", audience=audience)
+        assert survey["next_reminder_at"] == 1010
+        answers = {question["id"]: 5 for question in survey["questions"]}
+        orchestrator.record_survey_responses("s1", [("a@example.com", answers, None)])
+
+        _advance(orchestrator, 10)
+        reminders = orchestrator.survey_store.get("s1")["reminders"]
+        assert [(r["number"], r["sent"], r["skipped_responded"]) for r in reminders] == [(1, 2, 1)]
+        assert orchestrator.survey_store.get("s1")["next_reminder_at"] == 1020
+
+        orchestrator.record_survey_responses("s1", [("b@example.com", answers, None)])
+        _advance(orchestrator, 10)
+        reminders = orchestrator.survey_store.get("s1")["reminders"]
+        assert [(r["number"], r["sent"], r["skipped_responded"]) for r in reminders] == [(1, 2, 1), (2, 1, 2)]
+        assert orchestrator.survey_store.get("s1")["next_reminder_at"] is None
+        assert len(orchestrator.reminder_scheduler) == 0
+    finally:
+        stop_orchestrator(orchestrator)
+
+
+def test_no_reminder_once_everyone_has_responded():
+    orchestrator = build_orchestrator(reminder_scheduler=_scheduler(), reminder_offsets=(10,))
+    try:
+        survey = send_survey(orchestrator, "s1", audience=["a@example.com"])
+        answers = {question["id"]: 5 for question in survey["questions"]}
+        orchestrator.record_survey_responses("s1", [("a@example.com", answers, None)])
+        _advance(orchestrator, 10)
+        assert not orchestrator.survey_store.get("s1").get("reminders")
+        assert orchestrator.survey_store.get("s1")["next_reminder_at"] is None
+    finally:
+        stop_orchestrator(orchestrator)
+
+
+def test_pending_reminders_survive_a_restart(tmp_path):
+    path = str(tmp_path / "state.db")
+    backend = SQLiteBackend(path)
+    before = build_orchestrator(backend=backend, reminder_scheduler=_scheduler(), reminder_offsets=(10, 20))
+    send_survey(before, "s1")
+    send_survey(before, "s2")
+    before.reminder_scheduler.advance(10) # s1 and s2 get their first reminder
+    before.dispatch_queue.wait_all()
+    stop_orchestrator(before)
+    backend.close()
+
+    backend = SQLiteBackend(path)
+    after = build_orchestrator(backend=backend, reminder_scheduler=_scheduler(), reminder_offsets=(10, 20))
+    try:
+        assert after.resume_reminders() == 2
+        assert after.reminder_scheduler.due_time("s1") == 1020
+        _advance(after, 20)
+        assert [r["number"] for r in after.survey_store.get("s1")["reminders"]] == [1, 2]
+        assert after.survey_store.get("s1")["next_reminder_at"] is None
+    finally:
+        stop_orchestrator(after)
+        backend.close()
+
+    backend = SQLiteBackend(path)
+    try:
+        assert backend.load_open_surveys() == [] # Nothing left to remind, so nothing is loaded
+    finally:
+        backend.close()
@@ -0,0 +1,90 @@
+# tests/test_response_store.py
+
+import pytest
+
+from employee_pulse_agent.agents import SurveyResponses, response_store
+
+QUESTIONS = [{"id": "q1", "topic": "wellness"}, {"id": "q2", "topic": "wellness"}, {"id": "q3", "topic": "growth"}]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def aggregation(request, monkeypatch):
+    """Runs each test with NumPy and with the pure-Python fallback."""
+    if request.param == "python":
+        monkeypatch.setattr(response_store, "np", None)
+    elif response_store.np is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+
+def _responses(rows):
+    responses = SurveyResponses("s1", QUESTIONS)
+    for respondent, answers, segment in rows:
+        responses.add(respondent, answers, segment)
+    return responses
+
+
+def test_per_question_statistics(aggregation):
+    scores = [10, 9, 8, 7, 6, 0, 10, 9, 5, 3]
+    responses = _responses([(f"user{i}@example.com", {"q1": score}, None) for i, score in enumerate(scores)])
+    stats = responses.statistics("question")
+    q1 = stats["q1"]
+    assert q1["count"] == 10
+    assert q1["mean"] == 6.7
+    assert q1["distribution"] == {"0": 1, "3": 1, "5": 1, "6": 1, "7": 1, "8": 1, "9": 2, "10": 2}
+    assert q1["percentiles"] == {"p25": 5, "p50": 7, "p75": 9, "p90": 10}
+    assert q1["enps"] == 0.0 # 4 promoters, 4 detractors
+    assert stats["q2"] == {"count": 0, "mean": None, "distribution": {}}
+
+
+def test_empty_survey(aggregation):
+    responses = _responses([])
+    assert responses.histograms("overall") == {"overall": [0] * 11}
+    assert responses.statistics("overall") == {"overall": {"count": 0, "mean": None, "distribution": {}}}
+    assert responses.statistics("topic") == {"wellness": {"count": 0, "mean": None, "distribution": {}},
+                                             "growth": {"count": 0, "mean": None, "distribution": {}}}
+
+
+def test_single_response(aggregation):
+    responses = _responses([("a@example.com", {"q1": 9, "q3": 4}, "sales")])
+    q1 = responses.statistics("question")["q1"]
+    assert q1["percentiles"] == {"p25": 9, "p50": 9, "p75": 9, "p90": 9}
+    assert q1["enps"] == 100.0
+    assert responses.statistics("question")["q3"]["enps"] == -100.0
+    assert responses.statistics("overall")["overall"]["mean"] == 6.5
+
+
+def test_grouping_by_topic_and_segment(aggregation):
+    responses = _responses([
+        ("a@example.com", {"q1": 10, "q2": 8, "q3": 2}, "sales"),
+        ("b@example.com", {"q1": 6, "q3": 4}, "support"),
+        ("c@example.com", {"q2": 7}, None),
+    ])
+    topics = responses.statistics("topic")
+    assert (topics["wellness"]["count"], topics["wellness"]["mean"]) == (4, 7.75)
+    assert (topics["growth"]["count"], topics["growth"]["mean"]) == (2, 3.0)
+    segments = responses.histograms("segment")
+    assert list(segments) == ["sales", "support", "unspecified"]
+    assert sum(segments["sales"]) == 3 and segments["unspecified"][7] == 1
+    assert responses.statistics("overall")["overall"]["count"] == 6
+
+
+def test_invalid_answers_and_repeat_respondents_are_skipped():
+    responses = SurveyResponses("s1", QUESTIONS)
+    assert responses.add("A@example.com", {"q1": 5, "q2": 11, "q3": -1, "q9": 3, "x": True}) == 1
+    assert responses.add("a@example.com", {"q1": 7}) is None
+    assert (len(responses), responses.respondent_count) == (1, 1)
+    assert responses.has_responded("a@EXAMPLE.com")
+
+
+def test_smaller_scales_have_no_enps(aggregation):
+    responses = SurveyResponses("s1", QUESTIONS, scale_max=5)
+    responses.add("a@example.com", {"q1": 5})
+    stats = responses.statistics("question")["q1"]
+    assert "enps" not in stats and stats["distribution"] == {"5": 1}
+    assert len(responses.histograms("question")["q1"]) == 6
+
+
+def test_unknown_grouping():
+    with pytest.raises(ValueError):
+        SurveyResponses("s1", QUESTIONS).statistics("department")
@@ -0,0 +1,74 @@
+# tests/test_streaming_stats.py
+
+import random
+import statistics
+
+from employee_pulse_agent.agents import RunningStats, SurveyAggregate, SurveyResponses
+
+QUESTIONS = ["q1", "q2", "q3"]
+
+
+def _answers(seed, n):
+    rng = random.Random(seed)
+    return [(rng.choice(QUESTIONS), rng.randint(0, 10)) for _ in range(n)]
+
+
+def _aggregate(answers, respondents=0):
+    aggregate = SurveyAggregate(QUESTIONS)
+    aggregate.respondents = respondents
+    for question_id, score in answers:
+        aggregate.add_answer(question_id, score)
+    return aggregate
+
+
+def test_running_stats_match_the_statistics_module():
+    scores = [random.Random(1).randint(0, 10) for _ in range(500)]
+    stats = RunningStats()
+    stats.add_many(scores)
+    assert stats.count == 500
+    assert abs(stats.mean - statistics.mean(scores)) < 1e-9
+    assert abs(stats.variance - statistics.variance(scores)) < 1e-9
+
+
+def test_small_streams():
+    stats = RunningStats()
+    assert (stats.mean, stats.variance) == (None, None)
+    assert stats.summary()["stddev"] is None
+    stats.add(7)
+    assert (stats.mean, stats.variance) == (7, None)
+
+
+def test_merging_partials_equals_aggregating_everything():
+    first, second, third = _answers(1, 300), _answers(2, 250), _answers(3, 1)
+    merged = _aggregate(first, 40).merge(_aggregate(second, 30)).merge(_aggregate(third, 1))
+    combined = _aggregate(first + second + third, 71)
+    assert merged.snapshot(100) == combined.snapshot(100)
+    for question_id in QUESTIONS:
+        assert merged.questions[question_id].histogram == combined.questions[question_id].histogram
+
+
+def test_merging_an_empty_partial_changes_nothing():
+    answers = _answers(4, 100)
+    aggregate = _aggregate(answers, 10)
+    before = aggregate.snapshot(20)
+    assert aggregate.merge(SurveyAggregate(QUESTIONS)).snapshot(20) == before
+    assert SurveyAggregate(QUESTIONS).merge(_aggregate(answers, 10)).snapshot(20) == before
+    empty = SurveyAggregate(QUESTIONS).merge(SurveyAggregate(QUESTIONS)).snapshot()
+    assert empty["respondents"] == 0 and empty["overall"]["count"] == 0 and empty["response_rate"] is None
+
+
+def test_merge_adds_questions_only_one_side_has():
+    aggregate = SurveyAggregate(["q1"]).merge(_aggregate([("q3", 4)], 1))
+    assert aggregate.snapshot()["questions"]["q3"] == {"count": 1, "mean": 4.0}
+
+
+def test_live_statistics_match_the_columnar_results():
+    questions = [{"id": question_id} for question_id in QUESTIONS]
+    responses = SurveyResponses("s1", questions)
+    rng = random.Random(5)
+    for i in range(200):
+        responses.add(f"user{i}@example.com", {question_id: rng.randint(0, 10) for question_id in QUESTIONS})
+    snapshot = responses.live.snapshot(400)
+    assert snapshot["respondents"] == 200 and snapshot["response_rate"] == 0.5
+    overall = responses.statistics("overall")["overall"]
+    assert {key: snapshot["overall"][key] for key in overall} == overall
@@ -0,0 +1,125 @@
+# tests/test_survey_store.py
+
+import threading
+
+from employee_pulse_agent.agents import SequentialIdAllocator, SurveyStore
+
+
+def _survey(survey_id, status="pending_approval", approver="hr@example.com", request_id=None):
+    return {"survey_id": survey_id, "title": survey_id, "status": status, "approver_contact": approver,
+            "approval_request_id": request_id}
+
+
+def _ids(records):
+    return [record["survey_id"] for record in records]
+
+
+def test_status_change_moves_the_survey_between_index_buckets():
+    store = SurveyStore()
+    store.put(_survey("s1"))
+    store.put(_survey("s2"))
+    store.update("s1", status="sent")
+    assert _ids(store.query(status="pending_approval")) == ["s2"]
+    assert _ids(store.query(status="sent")) == ["s1"]
+    store.update("s1", status="pending_approval")
+    assert _ids(store.query(status="pending_approval")) == ["s1", "s2"] # Creation order, not update order
+    assert store.query(status="sent") == []
+
+
+def test_filters_intersect():
+    store = SurveyStore()
+    store.put(_survey("s1", approver="a@example.com"))
+    store.put(_survey("s2", approver="b@example.com"))
+    store.put(_survey("s3", status="sent", approver="a@example.com"))
+    assert _ids(store.query(status="pending_approval", approver="a@example.com")) == ["s1"]
+    assert _ids(store.query(approver="a@example.com")) == ["s1", "s3"]
+    assert store.query(status="sent", approver="b@example.com") == []
+    assert _ids(store.query()) == ["s1", "s2", "s3"]
+
+
+def test_approval_request_index_follows_changes():
+    store = SurveyStore()
+    store.put(_survey("s1", request_id="approval_001"))
+    assert store.find_by_approval_request("approval_001")["survey_id"] == "s1"
+    store.update("s1", approval_request_id="approval_002")
+    assert store.find_by_approval_request("approval_001") is None
+    assert store.find_by_approval_request("approval_002")["survey_id"] == "s1"
+
+
+def test_put_replaces_a_record_and_its_index_entries():
+    store = SurveyStore()
+    store.put(_survey("s1", approver="a@example.com"))
+    store.put(_survey("s1", status="sent", approver="b@example.com"))
+    assert len(store) == 1
+    assert store.query(approver="a@example.com") == []
+    assert _ids(store.query(status="sent", approver="b@example.com")) == ["s1"]
+
+
+def test_pages_follow_the_cursor_across_inserts_and_updates():
+    store = SurveyStore()
+    for i in range(1, 6):
+        store.put(_survey(f"s{i}"))
+    first, cursor = store.page(limit=2)
+    assert _ids(first) == ["s1", "s2"]
+    store.put(_survey("s6")) # Created after the first page was read
+    store.update("s1", status="sent") # Doesn't move anything between pages
+    second, cursor = store.page(after=cursor, limit=2)
+    assert _ids(second) == ["s3", "s4"]
+    third, cursor = store.page(after=cursor, limit=2)
+    assert _ids(third) == ["s5", "s6"]
+    assert cursor is None
+
+
+def test_last_page_has_no_cursor():
+    store = SurveyStore()
+    for i in range(1, 4):
+        store.put(_survey(f"s{i}"))
+    records, cursor = store.page(limit=3)
+    assert _ids(records) == ["s1", "s2", "s3"] and cursor is None
+    assert store.page(limit=10)[1] is None
+
+
+def test_filtered_pages_and_counts():
+    store = SurveyStore()
+    for i in range(1, 9):
+        store.put(_survey(f"s{i}", status="sent" if i % 2 else "pending_approval",
+                          approver="a@example.com" if i <= 4 else "b@example.com"))
+    records, cursor = store.page(status="sent", limit=2)
+    assert _ids(records) == ["s1", "s3"]
+    assert _ids(store.page(status="sent", after=cursor, limit=2)[0]) == ["s5", "s7"]
+    records, cursor = store.page(status="sent", approver="b@example.com", limit=1)
+    assert _ids(records) == ["s5"]
+    assert store.page(status="sent", approver="b@example.com", after=cursor, limit=1) == ([store.get("s7")], None)
+    assert store.count() == 8
+    assert store.count(status="sent") == 4
+    assert store.count(approver="a@example.com") == 4
+    assert store.count(status="sent", approver="a@example.com") == 2
+
+
+def test_update_of_an_unknown_survey_returns_none():
+    assert SurveyStore().update("missing", status="sent") is None
+
+
+def test_id_allocator_never_repeats_across_threads():
+    allocator = SequentialIdAllocator("approval_")
+    ids = []
+
+    def take():
+        for _ in range(200):
+            ids.append(allocator.next_id())
+
+    threads = [threading.Thread(target=take) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(ids)) == 800
+    assert allocator.next_id() == "approval_801"
+
+
+def test_advance_past_skips_existing_ids():
+    allocator = SequentialIdAllocator("approval_")
+    allocator.advance_past("approval_041")
+    allocator.advance_past("approval_007") # Never moves backwards
+    allocator.advance_past("survey_900") # Other prefixes are ignored
+    assert allocator.next_id() == "approval_042"